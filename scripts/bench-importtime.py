@@ -0,0 +1,96 @@
+"""
+检查启动阶段的模块导入耗时。
+
+对每个入口模块在全新的解释器中运行 `python -X importtime`，取多次运行的中位数，
+超出预算或导入了不应在启动时加载的重量级依赖时以非零状态码退出。
+
+用法:
+    python scripts/bench-importtime.py
+    python scripts/bench-importtime.py --runs 7 --scale 1.5
+    BLU_IMPORT_BUDGET_SCALE=2 python scripts/bench-importtime.py
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parent.parent / "src"
+
+# 入口模块: 预算 (毫秒)
+BUDGETS = {
+    "bililive_utility.__main__": 150,
+    "bililive_utility.cli": 120,
+    "bililive_utility.app": 450,
+}
+
+# 这些依赖只应在真正用到时才导入
+FORBIDDEN = ("webview", "PIL", "qrcode", "Crypto", "git", "uvicorn")
+
+_LINE = re.compile(r"^import time:\s+\d+\s+\|\s+(\d+)\s+\|\s*(\S+)$")
+
+
+def measure(module: str) -> tuple[float, list[str]]:
+    """返回 (累计导入耗时毫秒, 被导入的重量级依赖)"""
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {FORBIDDEN!r} if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=str(SRC_PATH))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{result.stderr}")
+
+    total = None
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match and match.group(2) == module:
+            total = int(match.group(1)) / 1000
+    if total is None:
+        raise RuntimeError(f"未能从 -X importtime 输出中找到 {module}")
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return total, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="检查启动导入耗时预算")
+    parser.add_argument("--runs", type=int, default=5, help="每个模块运行次数，取中位数")
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=float(os.environ.get("BLU_IMPORT_BUDGET_SCALE", "1")),
+        help="预算倍率，用于较慢的 CI 机器",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for module, budget in BUDGETS.items():
+        budget *= args.scale
+        samples = []
+        loaded: list[str] = []
+        for _ in range(args.runs):
+            elapsed, loaded = measure(module)
+            samples.append(elapsed)
+        median = statistics.median(samples)
+        status = "OK"
+        if median > budget:
+            status = "OVER BUDGET"
+            failed = True
+        if loaded:
+            status = f"HEAVY IMPORTS: {', '.join(loaded)}"
+            failed = True
+        print(f"{module:<32} {median:8.1f} ms / {budget:6.0f} ms  {status}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
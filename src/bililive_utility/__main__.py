@@ -1,53 +1,19 @@
-import uvicorn
-import os
-import webview
 import threading
 import socket
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
-from fastapi.exceptions import HTTPException
 
-from .api import auth, room, live, app_info
 from .utils.version import VERSION
-from .context.path import get_resource_path
 
-app = FastAPI(
-    title="BiliLive Utility",
-    version=VERSION.version,
-)
-
-
-@app.exception_handler(HTTPException)
-async def http_exception_handler(request, exc):
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={"success": False, "data": {"error": exc.detail}},
-    )
-
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(auth.router)
-app.include_router(room.router)
-app.include_router(live.router)
-app.include_router(app_info.router)
-
-static_path = os.path.join(get_resource_path(), "static")
-print(f"Static files path: {static_path}")
-app.mount("/", StaticFiles(directory=static_path, html=True), name="static")
 
 def main(debug: bool = False):
     """
     包含了所有的设置和启动逻辑的启动入口函数
     """
+    # 重量级依赖在真正启动时才导入，导入本模块本身几乎没有开销
+    import uvicorn
+    import webview
+
+    from .app import create_app
+
     print(f"Running BiliLive-Utility Version: {VERSION}")
     # 临时绑定端口获取可用端口号
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
@@ -57,7 +23,7 @@ def main(debug: bool = False):
     url = f"http://127.0.0.1:{port}"
     print(url)
 
-    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_config=None)
+    config = uvicorn.Config(create_app(), host="127.0.0.1", port=port, log_config=None)
     server = uvicorn.Server(config=config)
 
     server_thread = threading.Thread(target=server.run, daemon=True)
@@ -2,17 +2,28 @@ import os
 import re
 import webbrowser
 import httpx
-from fastapi import APIRouter, Header, Query
-from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query
+from typing import Optional, Union
 from ..bilibili import api as bilibili_api
+from ..bilibili.resilience import resilience
+from ..bilibili.scheduler import scheduler
+from ..bilibili.singleflight import singleflight
+from ..bilibili.warmup import last_warmup
 from ..context.path import CACHE_PATH
+from ..context.store import store
 from ..utils.version import VERSION
+from .deps import account_key
+from .metrics import TimedRoute
+from .models import AppInfo, ApplicationInfo, Envelope, ErrorData, ReleaseInfo
 
 GITHUB_REPO = "GamerNoTitle/BiliLive-Utility"
 RELEASES_URL = f"https://github.com/{GITHUB_REPO}/releases/latest"
 GITHUB_API = f"https://api.github.com/repos/{GITHUB_REPO}/releases"
 
-router = APIRouter(prefix="/api/application", tags=["Application"])
+APP_NS = "app"
+ACCESS_KEY = "access"
+
+router = APIRouter(prefix="/api/application", tags=["Application"], route_class=TimedRoute)
 
 
 def _parse_version(v: str) -> tuple[int, ...] | None:
@@ -34,19 +45,36 @@ def _has_update(current: str, remote: str) -> bool:
     return rem > cur
 
 
-@router.get("/info", summary="获取应用及账户状态")
-async def get_application_info():
-    app_info = {
-        "first_access": os.path.exists(CACHE_PATH / "access"),
-        "version": VERSION.version,
-        "build": VERSION.build,
-    }
+def _has_accepted_disclaimer() -> bool:
+    """是否已同意过免责声明，旧版本使用 access 文件标记"""
+    if store.get(APP_NS, ACCESS_KEY) is not None:
+        return True
+    legacy = CACHE_PATH / "access"
+    if legacy.exists():
+        store.set(APP_NS, ACCESS_KEY, "1")
+        legacy.unlink(missing_ok=True)
+        return True
+    return False
+
+
+def get_application_info_data() -> ApplicationInfo:
+    """应用版本与免责声明状态，只读取本地数据"""
+    return ApplicationInfo(
+        first_access=_has_accepted_disclaimer(),
+        version=VERSION.version,
+        build=VERSION.build,
+    )
+
+
+@router.get("/info", summary="获取应用及账户状态", response_model=Envelope[AppInfo])
+async def get_application_info(account: str = Depends(account_key)):
+    app_info = get_application_info_data()
 
     try:
-        room_info = await bilibili_api.get_room_info()
+        room_info = await bilibili_api.get_room_info(account)
         account_info = {
-            "is_live": room_info.get("live_status") == 1,
-            "room_id": room_info.get("room_id"),
+            "is_live": room_info.live_status == 1,
+            "room_id": bilibili_api.get_cached_room_id(account),
         }
         return {
             "success": True,
@@ -64,10 +92,9 @@ async def get_application_info():
 
 @router.get("/first_access", summary="更改首次访问状态")
 async def set_first_access():
-    app_info = {"first_access": os.path.exists(CACHE_PATH / "access")}
+    app_info = {"first_access": _has_accepted_disclaimer()}
     if not app_info["first_access"]:
-        with open(CACHE_PATH / "access", "w") as f:
-            pass
+        store.set(APP_NS, ACCESS_KEY, "1")
         return {"success": True, "data": {"first_access": True}}
 
 
@@ -81,66 +108,97 @@ async def exit_application():
     os._exit(0)
 
 
-@router.get("/releases", summary="检查更新")
+_github_client: Optional[httpx.AsyncClient] = None
+
+
+def get_github_client() -> httpx.AsyncClient:
+    """检查更新共用的 GitHub 客户端，避免每次检查都重新握手"""
+    global _github_client
+    if _github_client is None:
+        _github_client = httpx.AsyncClient(
+            timeout=10,
+            headers={"Accept": "application/vnd.github.v3+json"},
+            http2=True,
+        )
+    return _github_client
+
+
+async def close_github_client():
+    global _github_client
+    if _github_client is not None:
+        await _github_client.aclose()
+        _github_client = None
+
+
+@router.get("/releases", summary="检查更新", response_model=Envelope[Union[ReleaseInfo, ErrorData]])
 async def check_releases(prerelease: bool = Query(False)):
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            if prerelease:
-                resp = await client.get(
-                    GITHUB_API,
-                    headers={"Accept": "application/vnd.github.v3+json"},
-                    params={"per_page": 10},
-                )
-                if resp.status_code != 200:
-                    return {
-                        "success": False,
-                        "data": {"error": f"GitHub API 返回 {resp.status_code}"},
-                    }
-                releases = resp.json()
-                release = next((r for r in releases if r.get("prerelease")), None)
-            else:
-                resp = await client.get(
-                    f"{GITHUB_API}/latest",
-                    headers={"Accept": "application/vnd.github.v3+json"},
-                )
-                if resp.status_code == 404:
-                    return {
-                        "success": True,
-                        "data": {
-                            "has_update": False,
-                            "current_version": VERSION.version,
-                        },
-                    }
-                if resp.status_code != 200:
-                    return {
-                        "success": False,
-                        "data": {"error": f"GitHub API 返回 {resp.status_code}"},
-                    }
-                release = resp.json()
-
-            if not release:
+        client = get_github_client()
+        if prerelease:
+            resp = await client.get(
+                GITHUB_API,
+                params={"per_page": 10},
+            )
+            if resp.status_code != 200:
+                return {
+                    "success": False,
+                    "data": {"error": f"GitHub API 返回 {resp.status_code}"},
+                }
+            releases = resp.json()
+            release = next((r for r in releases if r.get("prerelease")), None)
+        else:
+            resp = await client.get(f"{GITHUB_API}/latest")
+            if resp.status_code == 404:
                 return {
                     "success": True,
-                    "data": {"has_update": False, "current_version": VERSION.version},
+                    "data": {
+                        "has_update": False,
+                        "current_version": VERSION.version,
+                    },
+                }
+            if resp.status_code != 200:
+                return {
+                    "success": False,
+                    "data": {"error": f"GitHub API 返回 {resp.status_code}"},
                 }
+            release = resp.json()
 
-            tag = release.get("tag_name", "")
+        if not release:
             return {
                 "success": True,
-                "data": {
-                    "has_update": _has_update(VERSION.version, tag),
-                    "current_version": VERSION.version,
-                    "version": tag,
-                    "url": release.get("html_url", ""),
-                    "body": release.get("body", ""),
-                    "published_at": release.get("published_at", ""),
-                    "prerelease": release.get("prerelease", False),
-                },
+                "data": {"has_update": False, "current_version": VERSION.version},
             }
+
+        tag = release.get("tag_name", "")
+        return {
+            "success": True,
+            "data": {
+                "has_update": _has_update(VERSION.version, tag),
+                "current_version": VERSION.version,
+                "version": tag,
+                "url": release.get("html_url", ""),
+                "body": release.get("body", ""),
+                "published_at": release.get("published_at", ""),
+                "prerelease": release.get("prerelease", False),
+            },
+        }
     except Exception as e:
         return {"success": False, "data": {"error": str(e)}}
 
 
+@router.get("/stats", summary="获取上游请求调度、合并与熔断统计")
+async def get_upstream_stats():
+    return {
+        "success": True,
+        "data": {
+            "scheduler": scheduler.stats(),
+            "singleflight": singleflight.stats(),
+            "resilience": resilience.stats(),
+            "warmup": last_warmup,
+        },
+    }
+
+
 @router.get("/update", summary="打开浏览器前往更新页面")
 async def open_update_page():
     try:
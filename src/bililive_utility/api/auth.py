@@ -1,60 +1,85 @@
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException
 from ..bilibili import api as bilibili_api
+from ..bilibili.login import watch_qr_login
+from ..bilibili.records import QrCode
+from ..bilibili.session import list_accounts
+from .deps import account_key
+from .metrics import TimedRoute
+from .models import AccountList, Credentials, Envelope, MessageData, QrPollResult
+from .stream import KEEPALIVE_INTERVAL, event_stream_response
 from ..utils.qr import generate_qr_code_image
 
-router = APIRouter(prefix="/api/auth", tags=["Authentication"])
+router = APIRouter(prefix="/api/auth", tags=["Authentication"], route_class=TimedRoute)
 
 
-@router.get("/getcode", summary="获取登录二维码")
-async def get_login_qr_code():
+@router.get("/getcode", summary="获取登录二维码", response_model=Envelope[QrCode])
+async def get_login_qr_code(account: str = Depends(account_key)):
     try:
-        qr_data = await bilibili_api.generate_qr_code()
-        return {"success": True, "data": qr_data}
+        qr_data = await bilibili_api.generate_qr_code(account)
+        return Envelope(data=qr_data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/poll", summary="轮询登录状态")
-async def poll_login_status(qrcode_key: str = Query(...)):
+@router.get("/poll", summary="轮询登录状态", response_model=Envelope[QrPollResult])
+async def poll_login_status(
+    qrcode_key: str = Query(...), account: str = Depends(account_key)
+):
     if not qrcode_key:
         raise HTTPException(status_code=400, detail="qrcode_key 不能为空")
     try:
-        poll_data = await bilibili_api.poll_qr_status(qrcode_key)
-        return {"success": True, "data": poll_data}
+        poll_data = await bilibili_api.poll_qr_status(qrcode_key, account)
+        return Envelope(data=poll_data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/getqr", summary="获取二维码图片")
+@router.get("/stream", summary="以 SSE 推送登录状态变化")
+async def stream_login_status(
+    qrcode_key: str = Query(...), account: str = Depends(account_key)
+):
+    if not qrcode_key:
+        raise HTTPException(status_code=400, detail="qrcode_key 不能为空")
+    return event_stream_response(
+        watch_qr_login(qrcode_key, account, keepalive=KEEPALIVE_INTERVAL)
+    )
+
+
+@router.get("/getqr", summary="获取二维码图片", response_model=Envelope[str])
 async def get_qr_code_image(link: str = Query(...)):
     try:
         qr_image = generate_qr_code_image(link)
-        return {"success": True, "data": qr_image}
+        return Envelope(data=qr_image)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/check_login", summary="检查登录状态")
-async def check_login_status():
-    is_logged_in = await bilibili_api.check_login_status()
-    if is_logged_in:
-        return {"success": True}
-    return {"success": False}
+@router.get("/check_login", summary="检查登录状态", response_model=Envelope[None])
+async def check_login_status(account: str = Depends(account_key)):
+    is_logged_in = await bilibili_api.check_login_status(account)
+    return Envelope(success=is_logged_in)
 
 
-@router.get("/credentials", summary="获取凭据信息，包括房间号和 Cookies")
-async def get_credentials():
+@router.get(
+    "/credentials", summary="获取凭据信息，包括房间号和 Cookies", response_model=Envelope[Credentials]
+)
+async def get_credentials(account: str = Depends(account_key)):
     try:
-        cookies = await bilibili_api.get_cookies()
-        room_id = await bilibili_api.get_room_id()
-        return {"success": True, "data": {"cookies": cookies, "room_id": room_id}}
+        cookies = await bilibili_api.get_cookies(account)
+        room_id = await bilibili_api.get_room_id(account)
+        return Envelope(data=Credentials(cookies=cookies, room_id=room_id))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
-@router.get("/logout", summary="退出登录")
-async def logout():
+@router.get("/logout", summary="退出登录", response_model=Envelope[MessageData])
+async def logout(account: str = Depends(account_key)):
     try:
-        await bilibili_api.logout()
-        return {"success": True, "data": {"message": "已退出登录"}}
+        await bilibili_api.logout(account)
+        return Envelope(data=MessageData(message="已退出登录"))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/accounts", summary="列出本地已保存的账户", response_model=Envelope[AccountList])
+async def get_accounts():
+    return Envelope(data=AccountList(accounts=list_accounts()))
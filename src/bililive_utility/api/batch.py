@@ -0,0 +1,56 @@
+from typing import Any, Dict, List, Literal
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field, ValidationError
+
+from ..bilibili.batch import DEFAULT_CONCURRENCY, MAX_CONCURRENCY, BatchItem, run_batch
+from ..bilibili.session import DEFAULT_ACCOUNT, is_valid_account_key
+from .metrics import TimedRoute
+from .room import RoomInfoUpdate
+from .stream import event_stream_response
+
+MAX_BATCH_ITEMS = 100
+
+router = APIRouter(prefix="/api", tags=["Batch"], route_class=TimedRoute)
+
+
+class BatchStartArgs(BaseModel):
+    area: int | str | None = Field(None, description="直播分区ID，不传则沿用直播间当前分区")
+
+
+class BatchOperation(BaseModel):
+    account: str = Field(DEFAULT_ACCOUNT, description="账户标识")
+    op: Literal["start", "stop", "update"] = Field(..., description="操作类型")
+    payload: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="操作参数：start 与 /api/live/start 相同，update 与 POST /api/room/info 相同",
+    )
+
+
+class BatchRequest(BaseModel):
+    items: List[BatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+    concurrency: int = Field(DEFAULT_CONCURRENCY, ge=1, le=MAX_CONCURRENCY, description="同时操作的账户数")
+
+
+def _to_item(index: int, operation: BatchOperation) -> BatchItem:
+    prefix = f"第 {index + 1} 项"
+    if not is_valid_account_key(operation.account):
+        raise HTTPException(status_code=400, detail=f"{prefix}: 无效的账户标识")
+    try:
+        if operation.op == "start":
+            args = BatchStartArgs(**operation.payload).model_dump(exclude_none=True)
+        elif operation.op == "update":
+            args = RoomInfoUpdate(**operation.payload).to_updates()
+            if not args:
+                raise HTTPException(status_code=400, detail=f"{prefix}: 没有提供任何需要更新的信息")
+        else:
+            args = {}
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"{prefix}: 参数错误: {e.errors()[0]['msg']}")
+    return BatchItem(operation.account, operation.op, args)
+
+
+@router.post("/batch", summary="批量开播、停播、更新直播间信息，以 SSE 逐项推送结果")
+async def run_batch_endpoint(body: BatchRequest):
+    items = [_to_item(index, operation) for index, operation in enumerate(body.items)]
+    return event_stream_response(run_batch(items, body.concurrency))
@@ -0,0 +1,79 @@
+import asyncio
+from typing import Any, Awaitable, List
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+
+from ..bilibili import api as bilibili_api
+from ..bilibili.records import AreaGroup, RoomInfo
+from ..bilibili.session import get_account
+from .app_info import get_application_info_data
+from .deps import account_key
+from .metrics import TimedRoute
+from .models import ApplicationInfo, Credentials, Envelope, Section
+
+router = APIRouter(prefix="/api", tags=["Bootstrap"], route_class=TimedRoute)
+
+
+class BootstrapData(BaseModel):
+    application: ApplicationInfo
+    logged_in: bool
+    credentials: Section[Credentials]
+    room: Section[RoomInfo]
+    areas: Section[List[AreaGroup]]
+
+
+async def _section(awaitable: Awaitable[Any]) -> Section:
+    try:
+        return Section(data=await awaitable)
+    except Exception as e:
+        return Section(error=str(e))
+
+
+async def _credentials(account: str) -> Credentials:
+    return Credentials(
+        cookies=await bilibili_api.get_cookies(account),
+        room_id=await bilibili_api.get_room_id(account),
+    )
+
+
+async def _area_list(account: str) -> List[AreaGroup]:
+    return (await bilibili_api.get_area_list_entry(account)).value
+
+
+@router.get("/bootstrap", summary="一次获取界面初始化所需的全部状态", response_model=Envelope[BootstrapData])
+async def bootstrap(account: str = Depends(account_key)):
+    """
+    同时检查登录状态、获取凭据、直播间快照与分区列表，耗时取决于最慢的一项。
+
+    各部分互不影响，失败的部分只在自己的 error 中给出原因；
+    本地没有会话时不会请求上游的直播间信息。
+    """
+    application = get_application_info_data()
+    if not get_account(account).client.cookies:
+        no_session = Section(error="未登录")
+        return Envelope(
+            data=BootstrapData(
+                application=application,
+                logged_in=False,
+                credentials=no_session,
+                room=no_session,
+                areas=await _section(_area_list(account)),
+            )
+        )
+
+    logged_in, credentials, room, areas = await asyncio.gather(
+        bilibili_api.check_login_status(account),
+        _section(_credentials(account)),
+        _section(bilibili_api.get_room_info(account)),
+        _section(_area_list(account)),
+    )
+    return Envelope(
+        data=BootstrapData(
+            application=application,
+            logged_in=logged_in,
+            credentials=credentials,
+            room=room,
+            areas=areas,
+        )
+    )
@@ -0,0 +1,39 @@
+from contextlib import aclosing
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
+
+from ..bilibili.danmaku import watch_danmaku
+from ..utils import fastjson
+from .deps import account_key
+from .stream import KEEPALIVE_INTERVAL
+
+router = APIRouter(prefix="/api/danmaku", tags=["Danmaku"])
+
+HEARTBEAT = '{"type":"heartbeat"}'
+
+
+@router.websocket("/ws")
+async def danmaku_websocket(
+    websocket: WebSocket,
+    account: str = Depends(account_key),
+    types: Optional[str] = Query(None, description="只接收指定类型的事件，多个类型以逗号分隔"),
+):
+    """
+    推送当前账户直播间的弹幕、礼物等事件，每条 WebSocket 消息为一个 JSON 事件。
+
+    同一账户的所有连接共享一条到 B 站的长连接；客户端处理不及时时只丢弃它自己最旧的事件。
+    """
+    wanted = {t.strip() for t in types.split(",") if t.strip()} if types else None
+    await websocket.accept()
+    # 显式关闭订阅，最后一个客户端断开时立即断开上游连接
+    async with aclosing(watch_danmaku(account, keepalive=KEEPALIVE_INTERVAL)) as events:
+        try:
+            async for event in events:
+                if event is None:
+                    # 定期发送心跳，以便及时发现客户端断开
+                    await websocket.send_text(HEARTBEAT)
+                elif wanted is None or event.type in wanted:
+                    await websocket.send_text(fastjson.dumps(event).decode("utf-8"))
+        except WebSocketDisconnect:
+            pass
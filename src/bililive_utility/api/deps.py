@@ -0,0 +1,12 @@
+from fastapi import HTTPException, Query
+
+from ..bilibili.session import DEFAULT_ACCOUNT, is_valid_account_key
+
+
+def account_key(
+    account: str = Query(DEFAULT_ACCOUNT, description="账户标识，不传则使用默认账户"),
+) -> str:
+    """从请求中解析账户标识"""
+    if not is_valid_account_key(account):
+        raise HTTPException(status_code=400, detail="无效的账户标识")
+    return account
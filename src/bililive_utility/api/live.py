@@ -1,23 +1,38 @@
-from fastapi import APIRouter, Header, HTTPException
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, Header, HTTPException
 from ..bilibili import api as bilibili_api
-from .models import startLiveBody
+from ..bilibili.live_status import watch_live_status
+from .deps import account_key
+from .metrics import TimedRoute
+from .stream import KEEPALIVE_INTERVAL, event_stream_response
+from .models import Envelope, MessageData, startLiveBody
 
-router = APIRouter(prefix="/api/live", tags=["Live Control"])
+router = APIRouter(prefix="/api/live", tags=["Live Control"], route_class=TimedRoute)
 
 
-@router.post("/start", summary="开播")
-async def start_live_endpoint(body: startLiveBody):
+@router.post("/start", summary="开播", response_model=Envelope[Dict[str, Any]])
+async def start_live_endpoint(
+    body: startLiveBody, account: str = Depends(account_key)
+):
     try:
-        live_data = await bilibili_api.start_live(body.area)
-        return {"success": True, "data": live_data}
+        live_data = await bilibili_api.start_live(body.area, account)
+        return Envelope(data=live_data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"开播失败: {e}")
 
 
-@router.post("/stop", summary="停播")
-async def stop_live_endpoint():
+@router.post("/stop", summary="停播", response_model=Envelope[MessageData])
+async def stop_live_endpoint(account: str = Depends(account_key)):
     try:
-        await bilibili_api.stop_live()
-        return {"success": True, "data": {"message": "停播成功"}}
+        await bilibili_api.stop_live(account)
+        return Envelope(data=MessageData(message="停播成功"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"停播失败: {e}")
+
+
+@router.get("/events", summary="以 SSE 推送开播状态变化")
+async def live_status_events(account: str = Depends(account_key)):
+    return event_stream_response(
+        watch_live_status(account, keepalive=KEEPALIVE_INTERVAL)
+    )
@@ -0,0 +1,71 @@
+import time
+from typing import Callable
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRoute
+
+from ..bilibili.resilience import resilience
+from ..bilibili.scheduler import scheduler
+from ..bilibili.singleflight import singleflight
+from ..utils.metrics import REGISTRY, ROUTE_LATENCY
+
+
+class TimedRoute(APIRoute):
+    """记录路由处理耗时的 APIRoute，流式响应只统计到响应头返回为止"""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def timed_handler(request: Request) -> Response:
+            start = time.perf_counter()
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            finally:
+                ROUTE_LATENCY.observe(
+                    time.perf_counter() - start,
+                    route=route,
+                    method=request.method,
+                    status=str(status),
+                )
+
+        return timed_handler
+
+
+def _collect_upstream_stats():
+    for host, stats in scheduler.stats().items():
+        yield ("bililive_scheduler_rate", "gauge", "调度器当前放行速率 (次/秒)", {"host": host}, stats["rate"])
+    for host, stats in scheduler.stats().items():
+        yield ("bililive_scheduler_waiting", "gauge", "调度器排队中的请求数", {"host": host}, stats["waiting"])
+    for host, stats in scheduler.stats().items():
+        yield ("bililive_scheduler_throttled_total", "counter", "触发上游限流的次数", {"host": host}, stats["throttled"])
+
+    sf = singleflight.stats()
+    yield ("bililive_singleflight_hits_total", "counter", "被合并到在途请求的次数", {}, sf["hits"])
+    yield ("bililive_singleflight_misses_total", "counter", "实际发往上游的 GET 次数", {}, sf["misses"])
+
+    rs = resilience.stats()
+    yield ("bililive_upstream_retries_total", "counter", "上游请求重试次数", {}, rs["retries"])
+    yield ("bililive_upstream_timeouts_total", "counter", "上游请求超时次数", {}, rs["timeouts"])
+    states = {"closed": 0, "half_open": 1, "open": 2}
+    for host, breaker in rs["breakers"].items():
+        yield ("bililive_circuit_state", "gauge", "熔断器状态 (0=closed, 1=half_open, 2=open)", {"host": host}, states[breaker["state"]])
+
+
+REGISTRY.add_collector(_collect_upstream_stats)
+
+router = APIRouter(prefix="/api", tags=["Metrics"])
+
+
+@router.get("/metrics", summary="Prometheus 指标", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,52 @@
+import secrets
+import urllib.parse
+from typing import Iterable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+from starlette.responses import JSONResponse
+
+
+class BearerTokenMiddleware:
+    """
+    远程访问时的令牌校验。
+
+    支持 Authorization: Bearer <token> 请求头，浏览器中的 EventSource
+    等无法自定义请求头的场景也可以使用 ?token=<token> 查询参数。
+    exempt_paths 中的路径 (精确匹配) 不需要令牌，用于界面的静态资源。
+    """
+
+    def __init__(self, app: ASGIApp, token: str, exempt_paths: Iterable[str] = ()):
+        self.app = app
+        # 按字节比较，请求头中出现非 ASCII 字符时也只是校验失败
+        self.token = token.encode("utf-8")
+        self.exempt_paths = frozenset(exempt_paths)
+
+    def _authorized(self, scope: Scope) -> bool:
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                scheme, _, credential = value.partition(b" ")
+                if scheme.lower() == b"bearer" and secrets.compare_digest(credential.strip(), self.token):
+                    return True
+        for pair in scope.get("query_string", b"").split(b"&"):
+            key, _, value = pair.partition(b"=")
+            if key == b"token" and secrets.compare_digest(urllib.parse.unquote_to_bytes(value), self.token):
+                return True
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        path = scope.get("path", "")
+        if path in self.exempt_paths or self._authorized(scope):
+            await self.app(scope, receive, send)
+            return
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1008})
+            return
+        response = JSONResponse(
+            status_code=401,
+            content={"success": False, "data": {"error": "未授权，请提供有效的访问令牌"}},
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        await response(scope, receive, send)
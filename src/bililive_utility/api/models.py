@@ -1,4 +1,89 @@
+from typing import Any, Dict, Generic, List, Optional, TypeVar
+
 from pydantic import BaseModel, Field
 
+T = TypeVar("T")
+
+
 class startLiveBody(BaseModel):
-    area: int | str = Field(..., description="直播分区ID")
\ No newline at end of file
+    area: int | str = Field(..., description="直播分区ID")
+
+
+class Envelope(BaseModel, Generic[T]):
+    """所有接口统一的 {success, data} 响应"""
+
+    success: bool = True
+    data: Optional[T] = None
+
+
+class ErrorData(BaseModel):
+    error: str
+
+
+class MessageData(BaseModel):
+    message: str
+
+
+class Credentials(BaseModel):
+    cookies: str
+    room_id: str
+
+
+class QrPollResult(BaseModel):
+    code: int
+    message: Optional[str] = None
+    data: Optional[Credentials] = None
+
+
+class RoomUpdateResult(BaseModel):
+    message: Optional[str] = None
+    error: Optional[str] = None
+    results: Dict[str, Dict[str, Any]]
+
+
+class ApplicationInfo(BaseModel):
+    first_access: bool
+    version: str
+    build: str
+
+
+class AccountInfo(BaseModel):
+    is_live: bool
+    room_id: Optional[str] = None
+
+
+class AppInfo(BaseModel):
+    application: ApplicationInfo
+    account: AccountInfo
+
+
+class ReleaseInfo(BaseModel):
+    has_update: bool
+    current_version: str
+    version: Optional[str] = None
+    url: Optional[str] = None
+    body: Optional[str] = None
+    published_at: Optional[str] = None
+    prerelease: Optional[bool] = None
+
+
+class Section(BaseModel, Generic[T]):
+    """聚合接口中的一个部分，获取失败时 data 为空并给出 error"""
+
+    data: Optional[T] = None
+    error: Optional[str] = None
+
+
+class AccountList(BaseModel):
+    accounts: List[str]
+
+
+class StatsSeries(BaseModel):
+    room_id: str
+    resolution: str
+    step: Optional[int] = Field(None, description="降采样粒度 (秒)，原始采样为空")
+    columns: Dict[str, List[float]] = Field(..., description="按列返回的数据，t 为时间戳")
+
+
+class StatsSettings(BaseModel):
+    interval: float = Field(..., ge=10, le=3600, description="直播中的采样间隔 (秒)")
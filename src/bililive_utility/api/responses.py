@@ -0,0 +1,12 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from ..utils import fastjson
+
+
+class FastJSONResponse(JSONResponse):
+    """使用 orjson (未安装时退回标准库) 编码的 JSON 响应"""
+
+    def render(self, content: Any) -> bytes:
+        return fastjson.dumps(content)
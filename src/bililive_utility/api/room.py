@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Header, HTTPException
-from typing import Optional, List
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from typing import Any, Dict, Optional, List, Tuple
 from pydantic import BaseModel, Field
 
 from ..bilibili import api as bilibili_api
+from ..bilibili.records import AreaGroup, RoomInfo
+from ..utils import fastjson
+from .deps import account_key
+from .metrics import TimedRoute
+from .models import Envelope, RoomUpdateResult
+from .responses import FastJSONResponse
 
-router = APIRouter(prefix="/api/room", tags=["Room Management"])
+router = APIRouter(prefix="/api/room", tags=["Room Management"], route_class=TimedRoute)
 
 
 class AreaUpdate(BaseModel):
@@ -17,42 +23,85 @@ class RoomInfoUpdate(BaseModel):
     tags: Optional[List[str]] = None
     area: Optional[AreaUpdate] = None
 
+    def to_updates(self) -> Dict[str, Any]:
+        """转换为 update_room_info 接受的字段字典"""
+        updates: Dict[str, Any] = {}
+        if self.title is not None:
+            updates["title"] = self.title
+        if self.tags is not None:
+            updates["tags"] = self.tags
+        if self.area is not None:
+            updates["area"] = self.area.id
+            updates["parent_area"] = self.area.parent_id
+        return updates
 
-@router.get("/areas", summary="获取所有直播分区")
-async def get_areas():
+
+# 分区列表较大且很少变化，按 ETag 缓存编码后的响应体，内容不变时不再重复校验与编码
+_areas_body: Optional[Tuple[str, bytes]] = None
+
+
+def _encode_areas(etag: str, areas: List[AreaGroup]) -> bytes:
+    global _areas_body
+    if _areas_body is None or _areas_body[0] != etag:
+        _areas_body = (etag, fastjson.dumps({"success": True, "data": areas}))
+    return _areas_body[1]
+
+
+@router.get("/areas", summary="获取所有直播分区", response_model=Envelope[List[AreaGroup]])
+async def get_areas(request: Request, account: str = Depends(account_key)):
     try:
-        area_data = await bilibili_api.get_area_list()
-        return {"success": True, "data": area_data}
+        entry = await bilibili_api.get_area_list_entry(account)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取分区列表失败: {e}")
 
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == entry.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(
+        _encode_areas(entry.etag, entry.value), media_type="application/json", headers=headers
+    )
+
 
-@router.get("/info", summary="获取直播间信息")
-async def get_room_info_endpoint():
+@router.get("/info", summary="获取直播间信息", response_model=Envelope[RoomInfo])
+async def get_room_info_endpoint(account: str = Depends(account_key)):
     try:
-        info = await bilibili_api.get_room_info()
-        return {"success": True, "data": info}
+        info = await bilibili_api.get_room_info(account)
+        return Envelope(data=info)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取直播间信息失败: {e}")
 
 
-@router.post("/info", summary="更新直播间信息")
+@router.post(
+    "/info",
+    summary="更新直播间信息",
+    response_model=Envelope[RoomUpdateResult],
+    response_model_exclude_none=True,
+    responses={207: {"model": Envelope[RoomUpdateResult], "description": "部分字段更新失败"}},
+)
 async def update_room_info_endpoint(
     update_data: RoomInfoUpdate,
+    account: str = Depends(account_key),
 ):
-    updates = {}
-    if update_data.title is not None:
-        updates["title"] = update_data.title
-    if update_data.tags is not None:
-        updates["tags"] = update_data.tags
-    if update_data.area is not None:
-        updates["area"] = update_data.area.id
-
+    updates = update_data.to_updates()
     if not updates:
         raise HTTPException(status_code=400, detail="没有提供任何需要更新的信息")
 
     try:
-        await bilibili_api.update_room_info(updates)
-        return {"success": True, "data": {"message": "直播间信息更新成功"}}
+        results = await bilibili_api.update_room_info(updates, account)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"更新失败: {e}")
+
+    failed = [name for name, result in results.items() if result["status"] == "failed"]
+    if failed:
+        # 部分字段失败时返回逐字段结果，前端只需重试失败的字段
+        return FastJSONResponse(
+            status_code=207,
+            content={
+                "success": False,
+                "data": {
+                    "error": f"部分字段更新失败: {', '.join(failed)}",
+                    "results": results,
+                },
+            },
+        )
+    return Envelope(data=RoomUpdateResult(message="直播间信息更新成功", results=results))
@@ -0,0 +1,73 @@
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+
+from ..bilibili.schedule import ScheduleEntry, live_scheduler, new_entry_id
+from .deps import account_key
+from .metrics import TimedRoute
+from .room import AreaUpdate
+
+router = APIRouter(prefix="/api/schedule", tags=["Schedule"], route_class=TimedRoute)
+
+
+class ScheduleCreate(BaseModel):
+    action: Literal["start", "stop"] = Field(..., description="开播或停播")
+    run_at: datetime = Field(..., description="执行时间，不带时区时按本地时间处理")
+    repeat: Literal["once", "daily", "weekly"] = Field("once", description="重复方式")
+    title: Optional[str] = Field(None, description="开播前设置的标题")
+    tags: Optional[List[str]] = Field(None, description="开播前设置的标签")
+    area: Optional[AreaUpdate] = Field(None, description="开播使用的分区，不传则沿用直播间当前分区")
+
+
+class ScheduleToggle(BaseModel):
+    enabled: bool
+
+
+@router.get("", summary="列出定时计划")
+async def list_schedules():
+    return {"success": True, "data": [asdict(e) for e in live_scheduler.list_entries()]}
+
+
+@router.post("", summary="添加定时开播 / 停播计划")
+async def create_schedule(body: ScheduleCreate, account: str = Depends(account_key)):
+    run_at = body.run_at.timestamp()
+    if body.repeat == "once" and run_at <= time.time():
+        raise HTTPException(status_code=400, detail="执行时间必须晚于当前时间")
+    if body.action == "stop" and (body.title or body.tags or body.area):
+        raise HTTPException(status_code=400, detail="停播计划不支持直播间信息预设")
+
+    entry = ScheduleEntry(
+        id=new_entry_id(),
+        account=account,
+        action=body.action,
+        run_at=run_at,
+        repeat=body.repeat,
+        title=body.title,
+        tags=body.tags,
+        area=body.area.id if body.area else None,
+        parent_area=body.area.parent_id if body.area else None,
+    )
+    # 重复计划的首次时间已经过去时，从下一次开始
+    if run_at <= time.time():
+        entry.run_at = entry.next_after(time.time())
+    live_scheduler.add(entry)
+    return {"success": True, "data": asdict(entry)}
+
+
+@router.patch("/{entry_id}", summary="启用或停用定时计划")
+async def toggle_schedule(entry_id: str, body: ScheduleToggle):
+    entry = live_scheduler.set_enabled(entry_id, body.enabled)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="定时计划不存在")
+    return {"success": True, "data": asdict(entry)}
+
+
+@router.delete("/{entry_id}", summary="删除定时计划")
+async def delete_schedule(entry_id: str):
+    if not live_scheduler.remove(entry_id):
+        raise HTTPException(status_code=404, detail="定时计划不存在")
+    return {"success": True}
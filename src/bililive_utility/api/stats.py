@@ -0,0 +1,58 @@
+import asyncio
+import time
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ..bilibili import api as bilibili_api
+from ..bilibili.stats import MAX_POINTS, ROLLUPS, stats_sampler
+from .deps import account_key
+from .metrics import TimedRoute
+from .models import Envelope, StatsSeries, StatsSettings
+from .responses import FastJSONResponse
+
+router = APIRouter(prefix="/api/stats", tags=["Statistics"], route_class=TimedRoute)
+
+
+@router.get("", summary="查询直播间人气与关注数的时间序列", response_model=Envelope[StatsSeries])
+async def query_stats(
+    account: str = Depends(account_key),
+    resolution: Literal["raw", "1m", "5m", "1h"] = Query("1m", description="数据粒度，raw 为内存中的原始采样"),
+    start: Optional[float] = Query(None, description="起始时间戳，默认为结束时间前 24 小时"),
+    end: Optional[float] = Query(None, description="结束时间戳 (不含)，默认为当前时间"),
+    limit: int = Query(MAX_POINTS, ge=1, le=MAX_POINTS, description="最多返回的点数，超出时保留最新的数据"),
+):
+    room_id = bilibili_api.get_cached_room_id(account)
+    if not room_id:
+        raise HTTPException(status_code=404, detail="未找到直播间")
+    end = time.time() if end is None else end
+    start = end - 24 * 60 * 60 if start is None else start
+    # 正在查看统计数据的直播间即使没有开播也保持检查，开播后立即开始采样
+    stats_sampler.watch(account)
+    stats = stats_sampler.room(room_id)
+    if resolution == "raw":
+        columns = stats.query(resolution, start, end, limit)
+    else:
+        columns = await asyncio.to_thread(stats.query, resolution, start, end, limit)
+    # 数据量可能较大，跳过响应模型校验直接编码
+    return FastJSONResponse(
+        {
+            "success": True,
+            "data": {
+                "room_id": room_id,
+                "resolution": resolution,
+                "step": ROLLUPS.get(resolution),
+                "columns": columns,
+            },
+        }
+    )
+
+
+@router.get("/settings", summary="获取采样设置", response_model=Envelope[StatsSettings])
+async def get_stats_settings():
+    return Envelope(data=StatsSettings(interval=stats_sampler.interval))
+
+
+@router.put("/settings", summary="修改采样间隔", response_model=Envelope[StatsSettings])
+async def update_stats_settings(body: StatsSettings):
+    return Envelope(data=StatsSettings(interval=stats_sampler.set_interval(body.interval)))
@@ -0,0 +1,25 @@
+from typing import Any, AsyncIterator, Dict, Optional
+
+from fastapi.responses import StreamingResponse
+
+from ..utils import fastjson
+
+KEEPALIVE_INTERVAL = 15
+
+
+async def _encode_events(events: AsyncIterator[Optional[Dict[str, Any]]]):
+    async for event in events:
+        if event is None:
+            # SSE 注释行，用于保持连接并及时发现客户端断开
+            yield b": keepalive\n\n"
+            continue
+        yield b"data: " + fastjson.dumps(event) + b"\n\n"
+
+
+def event_stream_response(events: AsyncIterator[Optional[Dict[str, Any]]]) -> StreamingResponse:
+    """将事件异步迭代器包装为 Server-Sent Events 响应"""
+    return StreamingResponse(
+        _encode_events(events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,79 @@
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.exceptions import HTTPException
+
+from .api import auth, room, live, app_info, metrics, batch, schedule, bootstrap, danmaku, stats
+from .api.middleware import BearerTokenMiddleware
+from .api.responses import FastJSONResponse
+from .bilibili.schedule import live_scheduler
+from .bilibili.stats import stats_sampler
+from .bilibili.warmup import startup_warmup
+from .utils.assets import StaticAssets
+from .utils.version import VERSION
+from .context.path import get_resource_path
+
+
+async def http_exception_handler(request, exc):
+    return FastJSONResponse(
+        status_code=exc.status_code,
+        content={"success": False, "data": {"error": exc.detail}},
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 在窗口打开的同时与上游完成握手并预取账户数据
+    warmup_task = asyncio.create_task(startup_warmup())
+    await live_scheduler.start()
+    await stats_sampler.start()
+    try:
+        yield
+    finally:
+        warmup_task.cancel()
+        await stats_sampler.stop()
+        await live_scheduler.stop()
+        await app_info.close_github_client()
+
+
+def create_app(token: Optional[str] = None) -> FastAPI:
+    """
+    创建 FastAPI 应用。
+
+    Args:
+        token (Optional[str]): 访问令牌，设置后所有请求都需要携带该令牌。
+    """
+    app = FastAPI(
+        title="BiliLive Utility",
+        version=VERSION.version,
+        lifespan=lifespan,
+        default_response_class=FastJSONResponse,
+    )
+    app.add_exception_handler(HTTPException, http_exception_handler)
+
+
+    app.include_router(bootstrap.router)
+    app.include_router(auth.router)
+    app.include_router(room.router)
+    app.include_router(live.router)
+    app.include_router(danmaku.router)
+    app.include_router(batch.router)
+    app.include_router(schedule.router)
+    app.include_router(stats.router)
+    app.include_router(app_info.router)
+    app.include_router(metrics.router)
+
+    static_path = os.path.join(get_resource_path(), "static")
+    # 静态资源在创建应用时一次性读入内存并压缩，修改后需要重启
+    assets = StaticAssets(static_path)
+    app.mount("/", assets, name="static")
+
+    # 界面与接口同源，不再需要 CORS；远程访问时改用令牌校验。
+    # 界面本身的静态资源不需要令牌，页面中的请求会带上通过 ?token= 传入的令牌
+    if token:
+        exempt = {"/"} | {f"/{name}" for name in assets.assets}
+        app.add_middleware(BearerTokenMiddleware, token=token, exempt_paths=exempt)
+    return app
@@ -1,76 +1,220 @@
 import time
 import asyncio
+import logging
+import httpx
+from dataclasses import replace
 from typing import Dict, Any, List, Tuple, Optional
 
-from .session import bili_client, save_cookies
+from pydantic import TypeAdapter
+
+from .area import AREA_LIST_URL, area_cache, get_area_index
+from .cache import CacheEntry, SWRCache
+from .planner import FieldPatch, plan_room_update
+from .records import (
+    AREA_LIST_REPLY,
+    DANMU_INFO_REPLY,
+    LINK_BUILD,
+    LINK_BUILD_REPLY,
+    NAV_REPLY,
+    QR_CODE_REPLY,
+    QR_POLL_REPLY,
+    ROOM_INFO_REPLY,
+    AreaGroup,
+    DanmuInfo,
+    LinkBuild,
+    QrCode,
+    RoomArea,
+    RoomInfo,
+)
+from .resilience import resilience
+from .scheduler import Priority, scheduler
+from .session import Account, DEFAULT_ACCOUNT, get_account
+from .singleflight import singleflight
+from ..context.path import CACHE_PATH
+from ..utils import fastjson
+from ..utils.metrics import UPSTREAM_INFLIGHT, UPSTREAM_LATENCY, UPSTREAM_RESPONSES
 from .core import (
+    get_mixin_key,
     get_sign,
+    wbi_sign,
     cookie_dict_to_string,
     QR_CODE_GENERATE_URL,
     QR_CODE_POLL_URL,
     APPKEY,
     APPSEC,
 )
-from ..context.path import CACHE_PATH
 
-_cached_room_id: Optional[str] = None
 
+log = logging.getLogger(__name__)
+
+# 直播间信息快照：10 秒内视为新鲜，1 分钟内先返回旧值再后台刷新
+ROOM_INFO_TTL = 10
+ROOM_INFO_MAX_STALE = 60
+
+_room_info_caches: Dict[Tuple[str, str], SWRCache] = {}
+
+# 登录状态：1 分钟内不重复向上游确认，登录、登出时直接更新
+LOGIN_STATUS_TTL = 60
+
+_login_status_caches: Dict[str, SWRCache] = {}
+
+# WBI 签名密钥每天轮换，缓存 1 小时
+WBI_KEY_TTL = 60 * 60
+
+_wbi_key_cache = SWRCache(ttl=WBI_KEY_TTL, max_stale=0, name="wbi_key")
+
+# PC 直播姬的构建号：12 小时内视为新鲜，7 天内先返回旧值再后台刷新
+LINK_BUILD_TTL = 12 * 60 * 60
+LINK_BUILD_MAX_STALE = 7 * 24 * 60 * 60
+LIVE_VERSION_URL = "https://api.live.bilibili.com/xlive/app-blink/v1/liveVersionInfo/getHomePageLiveVersion"
+# 从未成功获取过构建号时使用 Mac v1.9.0 的构建号
+FALLBACK_LINK_BUILD = LinkBuild(curr_version="1.9.0", build=1001017006)
 
-def get_cached_room_id() -> str:
+_link_build_cache = SWRCache(
+    ttl=LINK_BUILD_TTL,
+    max_stale=LINK_BUILD_MAX_STALE,
+    path=CACHE_PATH / "link_build.json",
+    name="link_build",
+    decode=LINK_BUILD.validate_python,
+)
+
+DANMU_INFO_URL = "https://api.live.bilibili.com/xlive/web-room/v1/index/getDanmuInfo"
+
+
+async def _request(
+    acc: Account,
+    method: str,
+    url: str,
+    *,
+    priority: int = Priority.INTERACTIVE,
+    record_status: bool = True,
+    **kwargs,
+) -> httpx.Response:
+    """经由全局调度器向上游发送请求，按接口策略处理超时、重试与熔断"""
+    parsed = httpx.URL(url)
+    host, endpoint = parsed.host, parsed.path
+    policy = resilience.policy_for(method, url)
+    kwargs.setdefault("timeout", policy.timeout)
+
+    async def send() -> httpx.Response:
+        await scheduler.acquire(host, priority)
+        UPSTREAM_INFLIGHT.inc(host=host)
+        start = time.perf_counter()
+        try:
+            return await acc.client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            UPSTREAM_RESPONSES.inc(endpoint=endpoint, status="error", code="")
+            raise
+        finally:
+            UPSTREAM_INFLIGHT.dec(host=host)
+            UPSTREAM_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint, method=method)
+
+    response = await resilience.call(host, policy, send)
+    if record_status:
+        UPSTREAM_RESPONSES.inc(endpoint=endpoint, status=str(response.status_code), code="")
+    return response
+
+
+async def _send_json(
+    acc: Account,
+    method: str,
+    url: str,
+    *,
+    priority: int = Priority.INTERACTIVE,
+    reply: Optional[TypeAdapter] = None,
+    **kwargs,
+) -> Any:
+    parsed = httpx.URL(url)
+    resp = await _request(
+        acc, method, url, priority=priority, record_status=False, **kwargs
+    )
+    if resp.status_code >= 400:
+        UPSTREAM_RESPONSES.inc(endpoint=parsed.path, status=str(resp.status_code), code="")
+        scheduler.report(parsed.host, resp.status_code)
+        resp.raise_for_status()
+    if reply is not None:
+        # 直接从响应字节解析为精简记录，不构造完整的字典
+        data = reply.validate_json(resp.content)
+        code = data.code
+    else:
+        data = fastjson.loads(resp.content)
+        code = data.get("code")
+    UPSTREAM_RESPONSES.inc(
+        endpoint=parsed.path, status=str(resp.status_code), code="" if code is None else str(code)
+    )
+    scheduler.report(parsed.host, resp.status_code, code)
+    return data
+
+
+async def _request_json(
+    acc: Account,
+    method: str,
+    url: str,
+    *,
+    priority: int = Priority.INTERACTIVE,
+    reply: Optional[TypeAdapter] = None,
+    **kwargs,
+) -> Any:
+    """
+    发送请求并解析 JSON，同时将限流情况反馈给调度器。
+
+    指定 reply 时响应被解析为对应的 Reply 记录，否则返回字典。
+    并发的相同 GET 请求会合并为一次上游请求，调用方共享同一份解析结果，不应修改返回值。
+    """
+    if method != "GET":
+        return await _send_json(acc, method, url, priority=priority, reply=reply, **kwargs)
+    params = kwargs.get("params") or {}
+    key = (method, url, tuple(sorted((k, str(v)) for k, v in params.items())), acc.key)
+    return await singleflight.do(
+        key, lambda: _send_json(acc, method, url, priority=priority, reply=reply, **kwargs)
+    )
+
+
+def get_cached_room_id(account: str = DEFAULT_ACCOUNT) -> str:
     """获取 room_id"""
-    global _cached_room_id
-    if _cached_room_id is not None:
-        return _cached_room_id
-    room_id_path = CACHE_PATH / "room_id"
-    if room_id_path.exists():
-        _cached_room_id = room_id_path.read_text().strip()
-        return _cached_room_id
-    return ""
+    return get_account(account).room_id
 
 
-def _persist_room_id(room_id: str):
+def _persist_room_id(room_id: str, account: str = DEFAULT_ACCOUNT):
     """写入 room_id 到文件并同步更新内存缓存"""
-    global _cached_room_id
-    _cached_room_id = room_id
-    with open(CACHE_PATH / "room_id", "w") as f:
-        f.write(room_id)
+    get_account(account).set_room_id(room_id)
 
 
-def invalidate_room_id_cache():
+def invalidate_room_id_cache(account: str = DEFAULT_ACCOUNT):
     """清除 room_id 内存缓存"""
-    global _cached_room_id
-    _cached_room_id = None
+    get_account(account).invalidate_room_id()
 
 
-async def generate_qr_code() -> Dict[str, Any]:
+async def generate_qr_code(account: str = DEFAULT_ACCOUNT) -> QrCode:
     """生成登录二维码"""
-    response = await bili_client.get(QR_CODE_GENERATE_URL)
-    response.raise_for_status()
-    data = response.json()
-    if data.get("code") == 0:
-        return data["data"]
-    raise Exception(f"生成二维码失败: {data.get('message', '未知错误')}")
+    data = await _request_json(
+        get_account(account), "GET", QR_CODE_GENERATE_URL, priority=Priority.AUTH, reply=QR_CODE_REPLY
+    )
+    if data.code == 0 and data.data is not None:
+        return data.data
+    raise Exception(f"生成二维码失败: {data.message or '未知错误'}")
 
 
-async def poll_qr_status(qrcode_key: str) -> Dict[str, Any]:
+async def poll_qr_status(qrcode_key: str, account: str = DEFAULT_ACCOUNT) -> Dict[str, Any]:
     """轮询二维码扫描状态"""
+    acc = get_account(account)
     params = {"qrcode_key": qrcode_key}
-    response = await bili_client.get(QR_CODE_POLL_URL, params=params)
-    response.raise_for_status()
-    data = response.json()
+    data = await _request_json(
+        acc, "GET", QR_CODE_POLL_URL, params=params, priority=Priority.AUTH, reply=QR_POLL_REPLY
+    )
 
-    status_data = data.get("data", {})
-    status_code = status_data.get("code", -1)
-    result = {"code": status_code, "message": status_data.get("message")}
+    status = data.data
+    status_code = status.code if status is not None else -1
+    result = {"code": status_code, "message": status.message if status is not None else None}
 
     if status_code == 0:  # 登录成功
         # 会话中的 cookie 已经自动更新
-        cookies_dict = dict(bili_client.cookies)
+        cookies_dict = dict(acc.client.cookies)
         dede_user_id = cookies_dict.get("DedeUserID")
         if not dede_user_id:
             raise Exception("登录成功，但无法从 Cookie 中提取 DedeUserID")
 
-        room_id = await get_user_room_id(dede_user_id)
+        room_id = await get_user_room_id(dede_user_id, account)
 
         result["data"] = {
             "cookies": cookie_dict_to_string(cookies_dict),
@@ -78,20 +222,22 @@ async def poll_qr_status(qrcode_key: str) -> Dict[str, Any]:
         }
 
         # 保存 room_id 到本地存储
-        _persist_room_id(room_id)
-        # 保存一次 session 到本地存储
-        save_cookies(bili_client)
+        acc.set_room_id(room_id)
+        _login_status_cache(account).set(True)
+        # 保存一次 session 到本地存储，首次加密需要派生密钥，放到线程中执行
+        await asyncio.to_thread(acc.save)
     return result
 
 
-async def get_user_room_id(mid: str) -> str:
+async def get_user_room_id(mid: str, account: str = DEFAULT_ACCOUNT) -> str:
     """通过用户 ID 获取直播间 ID"""
-    resp = await bili_client.get(
+    data = await _request_json(
+        get_account(account),
+        "GET",
         "https://api.live.bilibili.com/room/v1/Room/getRoomInfoOld",
         params={"mid": mid},
+        priority=Priority.AUTH,
     )
-    resp.raise_for_status()
-    data = resp.json()
     if data.get("code") == 0:
         room_id = data.get("data", {}).get("roomid")
         if room_id:
@@ -99,105 +245,215 @@ async def get_user_room_id(mid: str) -> str:
     raise Exception(f"获取直播间ID失败: {data.get('message', '未能找到直播间')}")
 
 
-async def get_area_list() -> List[Dict[str, Any]]:
-    """获取直播分区列表"""
-    response = await bili_client.get(
-        "https://api.live.bilibili.com/room/v1/Area/getList"
-    )
-    response.raise_for_status()
-    data = response.json()
-    if data.get("code") == 0:
-        return data.get("data", [])
+async def _fetch_area_list(account: str = DEFAULT_ACCOUNT) -> List[AreaGroup]:
+    data = await _request_json(get_account(account), "GET", AREA_LIST_URL, reply=AREA_LIST_REPLY)
+    if data.code == 0:
+        return data.data or []
     raise Exception("获取分区列表失败")
 
 
-async def get_room_info() -> Dict[str, Any]:
-    """获取直播间详细信息"""
-    room_id = get_cached_room_id()
-    resp = await bili_client.get(
+async def get_area_list_entry(account: str = DEFAULT_ACCOUNT) -> CacheEntry:
+    """获取直播分区列表的缓存条目 (包含 ETag)"""
+    return await area_cache.get(lambda: _fetch_area_list(account))
+
+
+async def get_area_list(account: str = DEFAULT_ACCOUNT) -> List[AreaGroup]:
+    """获取直播分区列表"""
+    return (await get_area_list_entry(account)).value
+
+
+async def validate_area(area_id, parent_id=None, account: str = DEFAULT_ACCOUNT):
+    """在本地校验分区是否存在，分区列表不可用时跳过校验"""
+    try:
+        await get_area_list_entry(account)
+    except Exception:
+        return
+    index = get_area_index()
+    if index is not None and len(index) and not index.contains(area_id, parent_id):
+        raise ValueError(f"无效的直播分区: {area_id}")
+
+
+async def _fetch_room_info(account: str = DEFAULT_ACCOUNT) -> RoomInfo:
+    acc = get_account(account)
+    data = await _request_json(
+        acc,
+        "GET",
         "https://api.live.bilibili.com/room/v1/Room/get_info",
-        params={"room_id": room_id},
+        params={"room_id": acc.room_id},
+        reply=ROOM_INFO_REPLY,
     )
-    resp.raise_for_status()
-    data = resp.json()
-    if data.get("code") == 0:
-        rd = data.get("data", {})
-        return {
-            "title": rd.get("title", ""),
-            "tags": rd.get("tags", "").split(","),
-            "live_status": rd.get("live_status", 0),
-            "area": {"parent_id": rd.get("parent_area_id"), "id": rd.get("area_id")},
-        }
-    raise Exception(f"获取直播间信息失败: {data.get('message', '未知错误')}")
+    if data.code == 0 and data.data is not None:
+        return data.data.to_room_info()
+    raise Exception(f"获取直播间信息失败: {data.message or '未知错误'}")
 
 
-async def update_room_info(updates: Dict[str, Any]):
-    """更新直播间信息 (标题, 标签, 分区)"""
-    cookies = bili_client.cookies
-    room_id = get_cached_room_id()
-    csrf = cookies.get("bili_jct")
+def _room_info_cache(account: str = DEFAULT_ACCOUNT) -> SWRCache:
+    """按 (账户, 房间号) 获取直播间信息快照缓存"""
+    key = (account, get_cached_room_id(account))
+    cache = _room_info_caches.get(key)
+    if cache is None:
+        cache = SWRCache(ttl=ROOM_INFO_TTL, max_stale=ROOM_INFO_MAX_STALE, name="room_info")
+        _room_info_caches[key] = cache
+    return cache
+
+
+def patch_room_info(account: str = DEFAULT_ACCOUNT, **fields):
+    """写操作成功后直接修补快照，避免再向上游查询"""
+    cache = _room_info_cache(account)
+    if cache.entry is not None:
+        cache.set(replace(cache.entry.value, **fields))
+
+
+def invalidate_room_info(account: str = DEFAULT_ACCOUNT):
+    """使直播间信息快照失效"""
+    _room_info_cache(account).invalidate()
+
+
+async def get_room_info(
+    account: str = DEFAULT_ACCOUNT, max_age: Optional[float] = None
+) -> RoomInfo:
+    """获取直播间详细信息，max_age 限制可接受的快照时长；返回的快照与缓存共享，不应修改"""
+    entry = await _room_info_cache(account).get(
+        lambda: _fetch_room_info(account), max_age=max_age
+    )
+    return entry.value
+
+
+def peek_room_info(account: str = DEFAULT_ACCOUNT) -> Optional[RoomInfo]:
+    """返回内存中的直播间快照 (可能已过期)，不会请求上游"""
+    entry = _room_info_cache(account).entry
+    return entry.value if entry is not None else None
+
+
+def _notify_live_control(account: str):
+    # 延迟导入，live_status 与 stats 模块依赖本模块
+    from .live_status import notify_live_control
+    from .stats import stats_sampler
+
+    notify_live_control(account)
+    stats_sampler.watch(account)
+
+
+async def update_room_info(
+    updates: Dict[str, Any], account: str = DEFAULT_ACCOUNT
+) -> Dict[str, Dict[str, Any]]:
+    """
+    更新直播间信息 (标题, 标签, 分区)
+
+    与当前快照对比后只提交有变化的字段，标题与分区并发更新，
+    返回每个字段的执行结果：updated / unchanged / failed。
+    """
+    acc = get_account(account)
+    csrf = acc.client.cookies.get("bili_jct")
     if not csrf:
         raise ValueError("Cookies 中缺少 'bili_jct'，无法执行操作")
 
-    base_data = {"room_id": room_id, "csrf": csrf, "csrf_token": csrf}
+    if "area" in updates:
+        await validate_area(updates["area"], updates.get("parent_area"), account)
+
+    try:
+        current = await _room_info_cache(account).get(
+            lambda: _fetch_room_info(account), max_age=ROOM_INFO_TTL
+        )
+        snapshot = current.value
+    except Exception:
+        snapshot = None
+    patches, unchanged = plan_room_update(snapshot, updates)
+    report: Dict[str, Dict[str, Any]] = {name: {"status": "unchanged"} for name in unchanged}
+
+    base_data = {"room_id": acc.room_id, "csrf": csrf, "csrf_token": csrf}
 
     async def post_update(payload):
-        resp = await bili_client.post(
+        json_resp = await _request_json(
+            acc,
+            "POST",
             "https://api.live.bilibili.com/room/v1/Room/update",
-            data=payload,
-            cookies=cookies,
+            data={**base_data, **payload},
+            priority=Priority.METADATA,
         )
-        resp.raise_for_status()
-        json_resp = resp.json()
         if json_resp.get("code") != 0:
             raise Exception(f"更新操作失败: {json_resp.get('message')}")
 
-    if "title" in updates:
-        await post_update({**base_data, "title": updates["title"]})
-    if "area" in updates:
-        await post_update({**base_data, "area_id": updates["area"]})
-    if "tags" in updates:
-        new_tags = set(tag for tag in updates["tags"] if tag)
-        current_info = await get_room_info()
-        current_tags = set(tag for tag in current_info.get("tags", []) if tag)
+    async def apply_patch(patch: FieldPatch) -> Dict[str, Any]:
+        if patch.field != "tags":
+            try:
+                await post_update(patch.payloads[0])
+            except Exception as e:
+                return {"status": "failed", "error": str(e)}
+            patch_room_info(account, **{patch.field: patch.target})
+            return {"status": "updated"}
+
+        # 标签逐个增删，单个失败不影响其余标签
+        tags = [tag for tag in (snapshot.tags if snapshot else []) if tag]
+        failed = []
+        for payload in patch.payloads:
+            tag = payload.get("del_tag") or payload.get("add_tag")
+            try:
+                await post_update(payload)
+            except Exception as e:
+                failed.append({"tag": tag, "error": str(e)})
+                continue
+            if "del_tag" in payload:
+                if tag in tags:
+                    tags.remove(tag)
+            elif tag not in tags:
+                tags.append(tag)
+        patch_room_info(account, tags=tags)
+        failed_tags = {item["tag"] for item in failed}
+        result = {
+            "status": "failed" if failed else "updated",
+            "added": [tag for tag in patch.added if tag not in failed_tags],
+            "removed": [tag for tag in patch.removed if tag not in failed_tags],
+        }
+        if failed:
+            result["failed"] = failed
+        return result
 
-        for tag in current_tags - new_tags:
-            await post_update({**base_data, "del_tag": tag})
-            await asyncio.sleep(2)
-        for tag in new_tags - current_tags:
-            await post_update({**base_data, "add_tag": tag})
-            await asyncio.sleep(2)
+    results = await asyncio.gather(*(apply_patch(patch) for patch in patches))
+    for patch, result in zip(patches, results):
+        report[patch.field] = result
+    if any(result["status"] == "failed" for result in results):
+        invalidate_room_info(account)
+    return report
 
 
-async def start_live(area) -> Dict[str, Any]:
+async def start_live(area, account: str = DEFAULT_ACCOUNT) -> Dict[str, Any]:
     """开始直播"""
-    cookies = bili_client.cookies
-    room_id = get_cached_room_id()
+    acc = get_account(account)
+    cookies = acc.client.cookies
     csrf = cookies.get("bili_jct")
     if not csrf:
         raise ValueError("Cookies 中缺少 'bili_jct'")
-
-    pc_link_build = "1001017006"    # Mac v1.9.0 版本的构建号，暂时没找到合适的接口来获取构建号，所以先写死
+    await validate_area(area, account=account)
 
     data = {
-        "room_id": room_id,
+        "room_id": acc.room_id,
         "platform": "web_electron_link",
         "area_v2": area,
         "csrf": csrf,
         "ts": int(time.time()),
-        "build": pc_link_build,
+        "build": current_link_build(account),
         "appkey": APPKEY,
     }
     data["sign"] = get_sign(data.copy(), appkey=APPKEY, appsec=APPSEC)
 
-    resp = await bili_client.post(
+    start_resp = await _request_json(
+        acc,
+        "POST",
         "https://api.live.bilibili.com/room/v1/Room/startLive",
         data=data,
+        priority=Priority.LIVE_CONTROL,
     )
-    resp.raise_for_status()
-    start_resp = resp.json()
-    print(start_resp)
+    log.info(f"开播响应: code={start_resp.get('code')} message={start_resp.get('message')}")
     if start_resp.get("code") == 0:
+        index = get_area_index()
+        sub_area = index.find(area) if index is not None else None
+        patch_room_info(
+            account,
+            live_status=1,
+            area=RoomArea(parent_id=sub_area.parent_id if sub_area else None, id=int(area)),
+        )
+        _notify_live_control(account)
         return start_resp.get("data", {})
     elif start_resp.get("code") in (60024, 60043):
         qr = start_resp.get("data", {}).get("qr", "")
@@ -208,71 +464,139 @@ async def start_live(area) -> Dict[str, Any]:
     raise Exception(f"{start_resp.get('message', '未知错误')}")
 
 
-async def stop_live():
+async def stop_live(account: str = DEFAULT_ACCOUNT):
     """停止直播"""
-    room_id = get_cached_room_id()
-    cookies = bili_client.cookies
-    csrf = cookies.get("bili_jct")
+    acc = get_account(account)
+    csrf = acc.client.cookies.get("bili_jct")
     if not csrf:
         raise ValueError("Cookies 中缺少 'bili_jct'")
 
-    data = {"room_id": room_id, "platform": "web_electron_link", "csrf_token": csrf, "csrf": csrf, "visit_id": ""}
+    data = {"room_id": acc.room_id, "platform": "web_electron_link", "csrf_token": csrf, "csrf": csrf, "visit_id": ""}
 
-    resp = await bili_client.post(
+    stop_resp = await _request_json(
+        acc,
+        "POST",
         "https://api.live.bilibili.com/room/v1/Room/stopLive",
         data=data,
+        priority=Priority.LIVE_CONTROL,
     )
-    resp.raise_for_status()
-    stop_resp = resp.json()
 
     if stop_resp.get("code") != 0:
+        invalidate_room_info(account)
         raise Exception(f"停播失败: {stop_resp.get('message', '未知错误')}")
+    patch_room_info(account, live_status=0)
+    _notify_live_control(account)
 
 
-async def check_login_status():
+async def _fetch_login_status(account: str = DEFAULT_ACCOUNT) -> bool:
     # 通过读取 session 后 GET 请求到 https://api.bilibili.com/x/web-interface/nav 查看是否登录
+    data = await _request_json(
+        get_account(account), "GET", "https://api.bilibili.com/x/web-interface/nav", reply=NAV_REPLY
+    )
+    return data.data is not None and data.data.isLogin
+
+
+def _login_status_cache(account: str = DEFAULT_ACCOUNT) -> SWRCache:
+    cache = _login_status_caches.get(account)
+    if cache is None:
+        cache = SWRCache(ttl=LOGIN_STATUS_TTL, max_stale=0, name="login_status")
+        _login_status_caches[account] = cache
+    return cache
+
+
+async def check_login_status(account: str = DEFAULT_ACCOUNT, max_age: Optional[float] = None) -> bool:
+    """检查是否已登录，结果缓存 LOGIN_STATUS_TTL 秒；请求失败时视为未登录且不缓存"""
     try:
-        response = await bili_client.get("https://api.bilibili.com/x/web-interface/nav")
-        response.raise_for_status()
-        data = response.json()
-        if data.get("data", {}).get("isLogin"):
-            return True
-        return False
+        entry = await _login_status_cache(account).get(
+            lambda: _fetch_login_status(account), max_age=max_age
+        )
+        return entry.value
     except Exception as e:
         return False
 
 
-async def get_cookies():
+async def _fetch_wbi_key(account: str = DEFAULT_ACCOUNT) -> str:
+    # 未登录时 nav 接口同样会返回 wbi_img
+    data = await _request_json(
+        get_account(account), "GET", "https://api.bilibili.com/x/web-interface/nav", reply=NAV_REPLY
+    )
+    if data.data is None or data.data.wbi_img is None:
+        raise Exception("获取 WBI 签名密钥失败")
+    img, sub = data.data.wbi_img.img_url, data.data.wbi_img.sub_url
+    return get_mixin_key(img.rsplit("/", 1)[-1].split(".")[0], sub.rsplit("/", 1)[-1].split(".")[0])
+
+
+async def get_danmu_info(account: str = DEFAULT_ACCOUNT) -> DanmuInfo:
+    """获取当前直播间弹幕长连接的令牌与服务器列表"""
+    acc = get_account(account)
+    if not acc.room_id:
+        raise ValueError("未找到直播间号，请先登录")
+    mixin_key = (await _wbi_key_cache.get(lambda: _fetch_wbi_key(account))).value
+    data = await _request_json(
+        acc,
+        "GET",
+        DANMU_INFO_URL,
+        params=wbi_sign({"id": acc.room_id, "type": 0}, mixin_key),
+        reply=DANMU_INFO_REPLY,
+    )
+    if data.code == 0 and data.data is not None:
+        return data.data
+    if data.code == -352:
+        # 签名校验失败，密钥可能已经轮换
+        _wbi_key_cache.invalidate()
+    raise Exception(f"获取弹幕服务器信息失败: {data.message or '未知错误'}")
+
+
+async def get_cookies(account: str = DEFAULT_ACCOUNT):
     """获取当前登录的 Cookies"""
-    cookies = bili_client.cookies
+    cookies = get_account(account).client.cookies
     if not cookies:
         raise ValueError("未找到有效的 Cookies")
     return cookie_dict_to_string(dict(cookies))
 
 
-async def get_room_id():
+async def get_room_id(account: str = DEFAULT_ACCOUNT):
     """获取当前登录的房间 ID"""
-    return get_cached_room_id()
+    return get_cached_room_id(account)
+
+
+async def _fetch_link_build(account: str = DEFAULT_ACCOUNT) -> LinkBuild:
+    params = {"system_version": "2", "ts": int(time.time())}
+    params["sign"] = get_sign(params, appkey=APPKEY, appsec=APPSEC)
+    data = await _request_json(
+        get_account(account),
+        "GET",
+        LIVE_VERSION_URL,
+        params=params,
+        priority=Priority.POLLING,
+        reply=LINK_BUILD_REPLY,
+    )
+    if data.code == 0 and data.data is not None and data.data.build > 0:
+        return data.data
+    raise Exception(f"获取直播姬构建号失败: {data.message or '未知错误'}")
 
 
-async def get_pc_link_build() -> Tuple[str, str]:
-    """获取当前 PC 端直播链接的版本和构建号"""
-    body = {"appkey": APPKEY, "ts": int(time.time()), "system_version": "2"}
-    resp = await bili_client.get(
-        f"https://api.live.bilibili.com/xlive/app-blink/v1/liveVersionInfo/getHomePageLiveVersion?system_version=2&appkey={APPKEY}&ts={body['ts']}&sign={get_sign(body, appkey=APPKEY, appsec=APPSEC)}"
-    )
-    if resp.status_code == 200:
-        data = resp.json()
-        if data.get("code") == 0:
-            version = data.get("data", {}).get("curr_version", "7.19.0.1000")
-            build = data.get("data", {}).get("build", "1000")
-        else:
-            version = "7.19.0.1000"
-            build = "1000"
-    return version, build
-
-async def logout() -> bool:
+async def get_pc_link_build(account: str = DEFAULT_ACCOUNT) -> Tuple[str, str]:
+    """获取当前 PC 直播姬的版本和构建号，获取失败时返回内置的构建号"""
+    try:
+        entry = await _link_build_cache.get(lambda: _fetch_link_build(account))
+        link_build = entry.value
+    except Exception as e:
+        log.warning(f"{e}，使用内置的构建号")
+        link_build = FALLBACK_LINK_BUILD
+    return link_build.curr_version, str(link_build.build)
+
+
+def current_link_build(account: str = DEFAULT_ACCOUNT) -> str:
+    """开播签名使用的构建号：立即返回缓存值而不等待网络，缓存过期或缺失时在后台刷新"""
+    entry = _link_build_cache.get_nowait(lambda: _fetch_link_build(account))
+    return str((entry.value if entry is not None else FALLBACK_LINK_BUILD).build)
+
+
+async def logout(account: str = DEFAULT_ACCOUNT) -> bool:
     """退出登录，清除本地存储的 Cookies 和房间 ID 信息"""
+    acc = get_account(account)
+    bili_client = acc.client
     LOGOUT_URL = "https://passport.bilibili.com/login/exit/v2"
     CSRF = bili_client.cookies.get("bili_jct")
     if not CSRF:
@@ -283,16 +607,16 @@ async def logout() -> bool:
         "Referer": "https://www.bilibili.com/",
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/144.0.0.0 Safari/537.36 Edg/144.0.0.0"
     }
-    resp = await bili_client.post(
+    resp = await _request(
+        acc,
+        "POST",
         LOGOUT_URL,
         headers=_headers,
-        data={"biliCSRF": CSRF, "gourl": "https://www.bilibili.com/"}
+        data={"biliCSRF": CSRF, "gourl": "https://www.bilibili.com/"},
+        priority=Priority.AUTH,
     )
-    if not await check_login_status():
-        invalidate_room_id_cache()
-        session_path = CACHE_PATH / "session"
-        if session_path.exists():
-            session_path.unlink()
-        bili_client.cookies.clear()
+    if not await check_login_status(account, max_age=0):
+        invalidate_room_info(account)
+        acc.clear()
         return True
     return False
\ No newline at end of file
@@ -0,0 +1,72 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import SWRCache
+from .records import AREA_LIST, AreaGroup, SubArea
+from ..context.path import CACHE_PATH
+
+AREA_LIST_URL = "https://api.live.bilibili.com/room/v1/Area/getList"
+
+# 分区列表很少变动：6 小时内视为新鲜，7 天内可先返回旧值再后台刷新
+AREA_CACHE_TTL = 6 * 60 * 60
+AREA_CACHE_MAX_STALE = 7 * 24 * 60 * 60
+
+area_cache = SWRCache(
+    ttl=AREA_CACHE_TTL,
+    max_stale=AREA_CACHE_MAX_STALE,
+    path=CACHE_PATH / "area_list.json",
+    name="area_list",
+    decode=AREA_LIST.validate_python,
+)
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class AreaIndex:
+    """
+    分区索引，可通过 (parent_id, id) 或子分区 id 快速查找分区。
+    """
+
+    def __init__(self, areas: List[AreaGroup]):
+        self._by_key: Dict[Tuple[int, int], SubArea] = {}
+        self._by_id: Dict[int, SubArea] = {}
+        for parent in areas:
+            for sub in parent.list:
+                self._by_key[(parent.id, sub.id)] = sub
+                self._by_id[sub.id] = sub
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, parent_id: Any, area_id: Any) -> Optional[SubArea]:
+        """按 (parent_id, id) 查找子分区"""
+        return self._by_key.get((_to_int(parent_id), _to_int(area_id)))
+
+    def find(self, area_id: Any) -> Optional[SubArea]:
+        """仅按子分区 id 查找"""
+        return self._by_id.get(_to_int(area_id))
+
+    def contains(self, area_id: Any, parent_id: Any = None) -> bool:
+        if parent_id is None:
+            return self.find(area_id) is not None
+        return self.get(parent_id, area_id) is not None
+
+
+_index: Optional[AreaIndex] = None
+_index_etag: Optional[str] = None
+
+
+def get_area_index() -> Optional[AreaIndex]:
+    """返回当前缓存对应的分区索引，缓存为空时返回 None"""
+    global _index, _index_etag
+    entry = area_cache.entry
+    if entry is None:
+        return None
+    if _index is None or _index_etag != entry.etag:
+        _index = AreaIndex(entry.value)
+        _index_etag = entry.etag
+    return _index
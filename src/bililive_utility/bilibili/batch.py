@@ -0,0 +1,119 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List
+
+from . import api
+
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 16
+
+OP_START = "start"
+OP_STOP = "stop"
+OP_UPDATE = "update"
+OPERATIONS = (OP_START, OP_STOP, OP_UPDATE)
+
+
+@dataclass
+class BatchItem:
+    """
+    批量操作中的一项。
+
+    args 为对应操作的参数：start 可带 area (不传则沿用直播间当前分区)，
+    update 为 update_room_info 接受的字段字典，stop 无参数。
+    """
+
+    account: str
+    op: str
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+async def _run_item(item: BatchItem) -> Dict[str, Any]:
+    """执行单项操作，返回包含 success 以及 data / error 的结果"""
+    if item.op == OP_START:
+        area = item.args.get("area")
+        if area is None:
+            area = (await api.get_room_info(item.account)).area.id
+        data = await api.start_live(area, item.account)
+        if data.get("qr"):
+            # 需要人脸验证，只能由用户在界面上完成
+            return {"success": False, "error": data.get("message") or "需要进行人脸验证", "data": data}
+        return {"success": True, "data": data}
+
+    if item.op == OP_STOP:
+        await api.stop_live(item.account)
+        return {"success": True, "data": {"message": "停播成功"}}
+
+    if item.op == OP_UPDATE:
+        results = await api.update_room_info(item.args, item.account)
+        failed = [name for name, result in results.items() if result["status"] == "failed"]
+        if failed:
+            return {"success": False, "error": f"部分字段更新失败: {', '.join(failed)}", "data": {"results": results}}
+        return {"success": True, "data": {"results": results}}
+
+    raise ValueError(f"未知的操作: {item.op}")
+
+
+async def run_batch(
+    items: List[BatchItem], concurrency: int = DEFAULT_CONCURRENCY
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    以有限并发执行批量操作，每完成一项就产出一条结果，最后产出汇总。
+
+    同一账户的操作按提交顺序依次执行，不同账户之间并发执行；
+    上游请求仍经过全局调度器，因此会遵守各主机的限流。
+    调用方停止迭代时，尚未完成的操作会被取消。
+    """
+    concurrency = max(1, min(concurrency, MAX_CONCURRENCY))
+
+    groups: Dict[str, List[int]] = {}
+    for index, item in enumerate(items):
+        groups.setdefault(item.account, []).append(index)
+    pending: asyncio.Queue = asyncio.Queue()
+    for indices in groups.values():
+        pending.put_nowait(indices)
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def worker():
+        while True:
+            try:
+                indices = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            for index in indices:
+                item = items[index]
+                start = time.perf_counter()
+                try:
+                    result = await _run_item(item)
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+                result.update(
+                    index=index,
+                    account=item.account,
+                    op=item.op,
+                    elapsed_ms=round((time.perf_counter() - start) * 1000, 1),
+                )
+                results.put_nowait(result)
+
+    started = time.perf_counter()
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(groups)))]
+    succeeded = 0
+    try:
+        for _ in range(len(items)):
+            result = await results.get()
+            if result["success"]:
+                succeeded += 1
+            yield {"type": "result", **result}
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    yield {
+        "type": "done",
+        "total": len(items),
+        "succeeded": succeeded,
+        "failed": len(items) - succeeded,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
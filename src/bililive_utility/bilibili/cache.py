@@ -0,0 +1,174 @@
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from ..utils import fastjson
+from ..utils.metrics import CACHE_EVENTS
+
+log = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+def compute_etag(value: Any) -> str:
+    """根据数据内容计算 ETag"""
+    raw = fastjson.dumps(value, sort_keys=True)
+    return 'W/"' + hashlib.sha1(raw).hexdigest() + '"'
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    fetched_at: float
+    etag: str
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class SWRCache:
+    """
+    带 TTL 的 stale-while-revalidate 缓存。
+
+    - 未过期时直接返回缓存；
+    - 过期但仍在 max_stale 内时返回旧值，并在后台刷新；
+    - 超出 max_stale 或没有缓存时等待刷新，刷新失败则退回旧值。
+
+    同一时间只会有一个刷新任务，可选地将结果持久化到磁盘；
+    值为记录类型时通过 decode 将磁盘上的 JSON 还原为记录。
+    set() 与 invalidate() 之前发起的刷新，其结果可能早于这次写入，完成后不会写回缓存。
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_stale: float,
+        path: Optional[Path] = None,
+        name: str = "default",
+        decode: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.path = path
+        self.decode = decode
+        self._entry: Optional[CacheEntry] = None
+        self._disk_loaded = False
+        self._refreshing: Optional[asyncio.Task] = None
+        self._generation = 0  # 每次写入或失效时递增
+
+    @property
+    def entry(self) -> Optional[CacheEntry]:
+        return self._entry
+
+    async def get(self, loader: Loader, max_age: Optional[float] = None) -> CacheEntry:
+        """
+        获取缓存条目，按需刷新。
+
+        max_age 用于调用方需要较新数据的场景，超过该时长的条目不会以旧值返回。
+        """
+        if self._entry is None and not self._disk_loaded:
+            self._entry = self._load_from_disk()
+        entry = self._entry
+        if entry is not None:
+            fresh_for = self.ttl if max_age is None else min(self.ttl, max_age)
+            if entry.age < fresh_for:
+                CACHE_EVENTS.inc(cache=self.name, result="hit")
+                return entry
+            if max_age is None and entry.age < self.max_stale:
+                CACHE_EVENTS.inc(cache=self.name, result="stale")
+                self._start_refresh(loader)
+                return entry
+        CACHE_EVENTS.inc(cache=self.name, result="miss")
+        try:
+            return await asyncio.shield(self._start_refresh(loader))
+        except Exception as e:
+            if entry is None:
+                raise
+            log.warning(f"刷新缓存失败，使用过期数据: {e}")
+            return entry
+
+    def get_nowait(self, loader: Loader) -> Optional[CacheEntry]:
+        """
+        立即返回当前条目，不等待网络，没有缓存时返回 None。
+
+        条目过期或缺失时在后台刷新，刷新结果供之后的调用使用。
+        """
+        if self._entry is None and not self._disk_loaded:
+            self._entry = self._load_from_disk()
+        entry = self._entry
+        if entry is not None and entry.age < self.ttl:
+            CACHE_EVENTS.inc(cache=self.name, result="hit")
+        else:
+            CACHE_EVENTS.inc(cache=self.name, result="stale" if entry is not None else "miss")
+            self._start_refresh(loader)
+        return entry
+
+    def set(self, value: Any) -> CacheEntry:
+        """写入新值并持久化"""
+        self._detach_refresh()
+        self._entry = CacheEntry(value=value, fetched_at=time.time(), etag=compute_etag(value))
+        self._save_to_disk(self._entry)
+        return self._entry
+
+    def invalidate(self):
+        """使缓存立即过期，下一次读取将等待刷新"""
+        self._detach_refresh()
+        self._entry = None
+        self._disk_loaded = True
+        if self.path is not None and self.path.exists():
+            self.path.unlink()
+
+    def _detach_refresh(self):
+        # 进行中的刷新继续完成，已在等待它的调用方仍能拿到结果，但结果不再写入缓存
+        self._generation += 1
+        self._refreshing = None
+
+    def _start_refresh(self, loader: Loader) -> asyncio.Task:
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self._refresh(loader, self._generation))
+            # 后台刷新的异常已记录日志，这里取走以免出现未处理异常的警告
+            self._refreshing.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return self._refreshing
+
+    async def _refresh(self, loader: Loader, generation: int) -> CacheEntry:
+        try:
+            value = await loader()
+        except Exception as e:
+            log.warning(f"后台刷新缓存失败: {e}")
+            raise
+        if generation != self._generation:
+            log.debug(f"缓存 {self.name} 在刷新期间被写入或失效，丢弃本次刷新结果")
+            return CacheEntry(value=value, fetched_at=time.time(), etag=compute_etag(value))
+        return self.set(value)
+
+    def _load_from_disk(self) -> Optional[CacheEntry]:
+        self._disk_loaded = True
+        if self.path is None or not self.path.exists():
+            return None
+        try:
+            raw = fastjson.loads(self.path.read_bytes())
+            value = raw["value"]
+            if self.decode is not None:
+                value = self.decode(value)
+            return CacheEntry(value=value, fetched_at=float(raw["fetched_at"]), etag=compute_etag(value))
+        except Exception as e:
+            log.warning(f"读取缓存文件失败: {e}")
+            return None
+
+    def _save_to_disk(self, entry: CacheEntry):
+        if self.path is None:
+            return
+        try:
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(fastjson.dumps({"fetched_at": entry.fetched_at, "value": entry.value}))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            log.warning(f"写入缓存文件失败: {e}")
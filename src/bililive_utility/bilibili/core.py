@@ -1,6 +1,7 @@
 import hashlib
+import time
 import urllib.parse
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # --- 常量 ---
 APPKEY = "aa1e74ee4874176e"
@@ -21,6 +22,32 @@ def get_sign(params: Dict[str, Any], appkey: str = APPKEY, appsec: str = APPSEC)
     return hashlib.md5((query + appsec).encode()).hexdigest()
 
 
+# WBI 签名使用的密钥重排表
+MIXIN_KEY_ENC_TAB = [
+    46, 47, 18, 2, 53, 8, 23, 32, 15, 50, 10, 31, 58, 3, 45, 35, 27, 43, 5, 49,
+    33, 9, 42, 19, 29, 28, 14, 39, 12, 38, 41, 13, 37, 48, 7, 16, 24, 55, 40,
+    61, 26, 17, 0, 1, 60, 51, 30, 4, 22, 25, 54, 21, 56, 59, 6, 63, 57, 62, 11,
+    36, 20, 34, 44, 52,
+]
+
+
+def get_mixin_key(img_key: str, sub_key: str) -> str:
+    raw = img_key + sub_key
+    return "".join(raw[i] for i in MIXIN_KEY_ENC_TAB)[:32]
+
+
+def wbi_sign(params: Dict[str, Any], mixin_key: str, ts: Optional[int] = None) -> Dict[str, Any]:
+    """为 Web 端接口的请求参数添加 WBI 签名 (wts 与 w_rid)"""
+    params = {**params, "wts": ts if ts is not None else int(time.time())}
+    params = {
+        k: "".join(ch for ch in str(v) if ch not in "!'()*")
+        for k, v in sorted(params.items())
+    }
+    query = urllib.parse.urlencode(params)
+    params["w_rid"] = hashlib.md5((query + mixin_key).encode()).hexdigest()
+    return params
+
+
 def parse_cookie_string(cookie_string: str) -> Dict[str, str]:
     """将 Cookie 字符串解析为字典"""
     cookie_dict = {}
@@ -0,0 +1,321 @@
+"""
+直播间弹幕与事件长连接。
+
+数据包格式见 packet 模块。连接建立后先发送认证包，之后每 30 秒发送一次心跳。
+
+收到的每一帧按 帧 → iter_packets() → decode_events() 的生成器流水线逐个处理，
+不会整批展开；内存占用由以下几处上限共同约束：
+
+- websockets 最多缓冲 RECEIVE_QUEUE 个未处理的帧，处理跟不上时暂停读取套接字，
+  压力经 TCP 流量控制传回服务器；
+- 单帧不超过 MAX_FRAME_SIZE，单批解压后不超过 MAX_DECOMPRESSED_SIZE；
+- 每个订阅者的队列长度固定，处理不及时的订阅者只丢弃自己最旧的事件。
+"""
+
+import asyncio
+import json
+import logging
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional
+
+from . import api
+from .packet import (
+    OP_AUTH,
+    OP_AUTH_REPLY,
+    OP_HEARTBEAT,
+    OP_HEARTBEAT_REPLY,
+    OP_MESSAGE,
+    PROTO_BROTLI,
+    PROTO_ZLIB,
+    Packet,
+    ProtocolError,
+    brotli,
+    encode_packet,
+    iter_packets,
+)
+from .session import DEFAULT_ACCOUNT, HEADERS, get_account, rewrite_websocket_url
+from .watcher import Watcher
+from ..utils import fastjson
+from ..utils.metrics import DANMAKU_DROPPED, DANMAKU_EVENTS
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HOST = "broadcastlv.chat.bilibili.com"
+HEARTBEAT_INTERVAL = 30.0
+AUTH_TIMEOUT = 10.0
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 60.0
+
+MAX_FRAME_SIZE = 1 << 20
+RECEIVE_QUEUE = 16
+SUBSCRIBER_QUEUE = 1024
+
+
+# --- 事件 ---
+
+
+@dataclass(slots=True)
+class Danmaku:
+    type: str = field(default="danmaku", init=False)
+    uid: int
+    uname: str
+    text: str
+    timestamp: float
+
+
+@dataclass(slots=True)
+class Gift:
+    type: str = field(default="gift", init=False)
+    uid: int
+    uname: str
+    gift_name: str
+    num: int
+    coin_type: str
+    total_coin: int
+
+
+@dataclass(slots=True)
+class SuperChat:
+    type: str = field(default="super_chat", init=False)
+    uid: int
+    uname: str
+    message: str
+    price: int
+
+
+@dataclass(slots=True)
+class GuardBuy:
+    type: str = field(default="guard", init=False)
+    uid: int
+    uname: str
+    guard_level: int
+    num: int
+    price: int
+
+
+@dataclass(slots=True)
+class Interact:
+    type: str = field(default="interact", init=False)
+    uid: int
+    uname: str
+    msg_type: int  # 1 进入直播间，2 关注，3 分享
+
+
+@dataclass(slots=True)
+class LiveState:
+    type: str = field(default="live", init=False)
+    live: bool
+
+
+@dataclass(slots=True)
+class Watched:
+    type: str = field(default="watched", init=False)
+    num: int
+
+
+@dataclass(slots=True)
+class Popularity:
+    type: str = field(default="popularity", init=False)
+    value: int
+
+
+@dataclass(slots=True)
+class Connection:
+    type: str = field(default="connection", init=False)
+    state: str  # connected / disconnected
+    room_id: int
+    error: Optional[str] = None
+
+
+def _danmaku(msg: Dict[str, Any]) -> Danmaku:
+    info = msg["info"]
+    return Danmaku(uid=info[2][0], uname=info[2][1], text=info[1], timestamp=info[0][4] / 1000)
+
+
+def _gift(msg: Dict[str, Any]) -> Gift:
+    data = msg["data"]
+    return Gift(
+        uid=data["uid"],
+        uname=data["uname"],
+        gift_name=data["giftName"],
+        num=data["num"],
+        coin_type=data.get("coin_type", ""),
+        total_coin=data.get("total_coin", 0),
+    )
+
+
+def _super_chat(msg: Dict[str, Any]) -> SuperChat:
+    data = msg["data"]
+    return SuperChat(
+        uid=data["uid"],
+        uname=data["user_info"]["uname"],
+        message=data["message"],
+        price=data["price"],
+    )
+
+
+def _guard_buy(msg: Dict[str, Any]) -> GuardBuy:
+    data = msg["data"]
+    return GuardBuy(
+        uid=data["uid"],
+        uname=data["username"],
+        guard_level=data["guard_level"],
+        num=data["num"],
+        price=data["price"],
+    )
+
+
+def _interact(msg: Dict[str, Any]) -> Interact:
+    data = msg["data"]
+    return Interact(uid=data["uid"], uname=data["uname"], msg_type=data["msg_type"])
+
+
+DECODERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "DANMU_MSG": _danmaku,
+    "SEND_GIFT": _gift,
+    "SUPER_CHAT_MESSAGE": _super_chat,
+    "GUARD_BUY": _guard_buy,
+    "INTERACT_WORD": _interact,
+    "LIVE": lambda msg: LiveState(live=True),
+    "PREPARING": lambda msg: LiveState(live=False),
+    "WATCHED_CHANGE": lambda msg: Watched(num=msg["data"]["num"]),
+}
+
+
+def decode_events(packets: Iterable[Packet]) -> Iterator[Any]:
+    """将数据包解码为事件记录，未关注的消息类型与无法解析的消息直接跳过"""
+    for packet in packets:
+        if packet.op == OP_HEARTBEAT_REPLY and len(packet.body) >= 4:
+            yield Popularity(value=int.from_bytes(packet.body[:4], "big"))
+            continue
+        if packet.op != OP_MESSAGE:
+            continue
+        try:
+            msg = fastjson.loads(packet.body)
+            # DANMU_MSG 等消息的 cmd 可能带有 ":4:0:2:2:2:0" 之类的后缀
+            decoder = DECODERS.get(msg.get("cmd", "").split(":", 1)[0])
+            if decoder is None:
+                continue
+            yield decoder(msg)
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            DANMAKU_EVENTS.inc(type="invalid")
+            log.debug(f"无法解析的弹幕消息: {e}")
+
+
+# --- 连接 ---
+
+
+class DanmakuWatcher(Watcher):
+    """
+    单个账户直播间的弹幕长连接，由所有订阅者共享。
+
+    第一个订阅者到来时建立连接，最后一个订阅者离开后断开；
+    连接断开时按指数退避重连，并依次尝试服务器列表中的下一个地址。
+    """
+
+    queue_size = SUBSCRIBER_QUEUE
+
+    def __init__(self, account: str = DEFAULT_ACCOUNT):
+        super().__init__()
+        self.account = account
+        self.failures = 0
+        self._host_index = 0
+        self.room_id = 0
+
+    def publish(self, event: Any):
+        # 弹幕不需要向新订阅者重放，因此不记录 last_event
+        DANMAKU_EVENTS.inc(type=event.type)
+        for queue in self._subscribers:
+            if queue.full():
+                DANMAKU_DROPPED.inc()
+            self._put(queue, event)
+
+    def _url(self, info) -> str:
+        if info.host_list:
+            host = info.host_list[self._host_index % len(info.host_list)]
+            url = f"wss://{host.host}:{host.wss_port}/sub"
+        else:
+            url = f"wss://{DEFAULT_HOST}/sub"
+        return rewrite_websocket_url(url)
+
+    def _auth_body(self, token: str) -> bytes:
+        cookies = get_account(self.account).client.cookies
+        uid = cookies.get("DedeUserID") or "0"
+        return json.dumps(
+            {
+                "uid": int(uid) if uid.isdigit() else 0,
+                "roomid": self.room_id,
+                "protover": PROTO_BROTLI if brotli is not None else PROTO_ZLIB,
+                "buvid": cookies.get("buvid3", ""),
+                "platform": "web",
+                "type": 2,
+                "key": token,
+            }
+        ).encode()
+
+    async def poll_once(self) -> Optional[float]:
+        from websockets.asyncio.client import connect
+
+        info = await api.get_danmu_info(self.account)
+        self.room_id = int(api.get_cached_room_id(self.account))
+        async with connect(
+            self._url(info),
+            max_size=MAX_FRAME_SIZE,
+            max_queue=RECEIVE_QUEUE,
+            ping_interval=None,
+            open_timeout=AUTH_TIMEOUT,
+            user_agent_header=HEADERS["User-Agent"],
+        ) as ws:
+            await ws.send(encode_packet(OP_AUTH, self._auth_body(info.token)))
+            reply = next(iter_packets(await asyncio.wait_for(ws.recv(), AUTH_TIMEOUT)), None)
+            if reply is None or reply.op != OP_AUTH_REPLY or json.loads(reply.body).get("code") != 0:
+                raise ProtocolError("弹幕服务器认证失败")
+
+            log.info(f"已连接到直播间 {self.room_id} 的弹幕服务器")
+            self.failures = 0
+            self.publish(Connection(state="connected", room_id=self.room_id))
+            heartbeat = asyncio.create_task(self._heartbeat(ws))
+            try:
+                async for frame in ws:
+                    if isinstance(frame, str):
+                        continue
+                    for event in decode_events(iter_packets(frame)):
+                        self.publish(event)
+                    # 让订阅者有机会在下一帧之前取走事件
+                    await asyncio.sleep(0)
+            finally:
+                heartbeat.cancel()
+        self.publish(Connection(state="disconnected", room_id=self.room_id))
+        return RECONNECT_DELAY
+
+    async def _heartbeat(self, ws):
+        while True:
+            await ws.send(encode_packet(OP_HEARTBEAT))
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    def on_error(self, error: Exception) -> Optional[float]:
+        self.failures += 1
+        self._host_index += 1
+        self.publish(Connection(state="disconnected", room_id=self.room_id, error=str(error)))
+        return min(MAX_RECONNECT_DELAY, RECONNECT_DELAY * 2 ** self.failures)
+
+
+_watchers: Dict[str, DanmakuWatcher] = {}
+
+
+def _get_watcher(account: str) -> DanmakuWatcher:
+    watcher = _watchers.get(account)
+    if watcher is None:
+        watcher = DanmakuWatcher(account)
+        _watchers[account] = watcher
+    return watcher
+
+
+async def watch_danmaku(
+    account: str = DEFAULT_ACCOUNT, keepalive: Optional[float] = None
+) -> AsyncIterator[Optional[Any]]:
+    """订阅直播间弹幕与事件，同一账户的多个订阅者共享一个连接"""
+    async with aclosing(_get_watcher(account).subscribe(keepalive)) as events:
+        async for event in events:
+            yield event
@@ -0,0 +1,81 @@
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from . import api
+from .session import DEFAULT_ACCOUNT
+from .watcher import Watcher
+
+FAST_INTERVAL = 2.0  # 开播 / 停播后的轮询间隔
+FAST_WINDOW = 30.0  # 开播 / 停播后保持快速轮询的时长
+LIVE_INTERVAL = 15.0  # 直播中的轮询间隔
+IDLE_INTERVAL = 30.0  # 未开播时的轮询间隔
+
+
+class LiveStatusWatcher(Watcher):
+    """
+    监视单个账户直播间的开播状态，状态变化时推送给所有订阅者。
+    """
+
+    def __init__(self, account: str = DEFAULT_ACCOUNT):
+        super().__init__()
+        self.account = account
+        self.fast_until = 0.0
+
+    def boost(self):
+        """进入快速轮询阶段并立即轮询一次"""
+        self.fast_until = time.monotonic() + FAST_WINDOW
+        self.nudge()
+
+    def _interval(self, live_status: int) -> float:
+        if time.monotonic() < self.fast_until:
+            return FAST_INTERVAL
+        return LIVE_INTERVAL if live_status == 1 else IDLE_INTERVAL
+
+    async def poll_once(self) -> Optional[float]:
+        fast = time.monotonic() < self.fast_until
+        # 通过直播间快照读取，与其它接口共享同一份上游数据
+        info = await api.get_room_info(
+            self.account, max_age=FAST_INTERVAL if fast else None
+        )
+        live_status = info.live_status
+        if self.last_event is None or self.last_event.get("live_status") != live_status:
+            self.publish(
+                {
+                    "live_status": live_status,
+                    "is_live": live_status == 1,
+                    "room_id": api.get_cached_room_id(self.account),
+                }
+            )
+        return self._interval(live_status)
+
+
+_watchers: Dict[str, LiveStatusWatcher] = {}
+
+
+def _get_watcher(account: str) -> LiveStatusWatcher:
+    watcher = _watchers.get(account)
+    if watcher is None:
+        watcher = LiveStatusWatcher(account)
+        _watchers[account] = watcher
+    return watcher
+
+
+def subscriber_count(account: str = DEFAULT_ACCOUNT) -> int:
+    """正在订阅该账户直播状态的连接数"""
+    watcher = _watchers.get(account)
+    return watcher.subscriber_count if watcher is not None else 0
+
+
+def notify_live_control(account: str = DEFAULT_ACCOUNT):
+    """开播 / 停播后调用，让正在运行的监视器加快轮询"""
+    watcher = _watchers.get(account)
+    if watcher is not None:
+        watcher.boost()
+
+
+async def watch_live_status(
+    account: str = DEFAULT_ACCOUNT, keepalive: Optional[float] = None
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """订阅直播状态，同一账户的多个订阅者共享一个轮询任务"""
+    async for event in _get_watcher(account).subscribe(keepalive):
+        yield event
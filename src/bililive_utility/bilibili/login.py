@@ -0,0 +1,80 @@
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from . import api
+from .session import DEFAULT_ACCOUNT
+from .watcher import Watcher
+
+# 二维码状态码
+QR_SUCCESS = 0
+QR_EXPIRED = 86038
+QR_SCANNED = 86090
+QR_WAITING = 86101
+
+QR_LIFETIME = 180  # 二维码有效期 (秒)
+IDLE_INTERVAL = 2.5  # 尚未扫码时的轮询间隔
+SCANNED_INTERVAL = 1.0  # 已扫码等待确认时的轮询间隔
+MAX_ERRORS = 5
+
+
+class QRLoginWatcher(Watcher):
+    """
+    在服务端轮询单个二维码的扫描状态，并把状态变化推送给订阅者。
+    """
+
+    def __init__(self, qrcode_key: str, account: str = DEFAULT_ACCOUNT):
+        super().__init__()
+        self.qrcode_key = qrcode_key
+        self.account = account
+        self.created_at = time.monotonic()
+        self.errors = 0
+
+    async def poll_once(self) -> Optional[float]:
+        if time.monotonic() - self.created_at > QR_LIFETIME:
+            self.publish({"code": QR_EXPIRED, "message": "二维码已失效"})
+            return None
+
+        result = await api.poll_qr_status(self.qrcode_key, self.account)
+        self.errors = 0
+        code = result.get("code")
+        if self.last_event is None or self.last_event.get("code") != code:
+            self.publish(result)
+
+        if code in (QR_SUCCESS, QR_EXPIRED):
+            return None
+        if code == QR_SCANNED:
+            return SCANNED_INTERVAL
+        return IDLE_INTERVAL
+
+    def on_error(self, error: Exception) -> Optional[float]:
+        self.errors += 1
+        if self.errors >= MAX_ERRORS:
+            self.publish({"code": -1, "message": f"轮询登录状态失败: {error}"})
+            return None
+        return IDLE_INTERVAL * self.errors
+
+
+_watchers: Dict[Tuple[str, str], QRLoginWatcher] = {}
+
+
+def _get_watcher(qrcode_key: str, account: str) -> QRLoginWatcher:
+    # 顺便清理已过期且无人订阅的轮询器，结束的轮询器会保留到过期，便于断线重连时直接拿到结果
+    now = time.monotonic()
+    for key, watcher in list(_watchers.items()):
+        if not watcher.subscriber_count and now - watcher.created_at > QR_LIFETIME:
+            del _watchers[key]
+
+    key = (account, qrcode_key)
+    watcher = _watchers.get(key)
+    if watcher is None:
+        watcher = QRLoginWatcher(qrcode_key, account)
+        _watchers[key] = watcher
+    return watcher
+
+
+async def watch_qr_login(
+    qrcode_key: str, account: str = DEFAULT_ACCOUNT, keepalive: Optional[float] = None
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """订阅二维码登录状态，同一个二维码的多个订阅者共享一个轮询任务"""
+    async for event in _get_watcher(qrcode_key, account).subscribe(keepalive):
+        yield event
@@ -0,0 +1,85 @@
+"""
+直播间弹幕长连接使用的二进制数据包协议。
+
+每个数据包为 16 字节大端包头 (包长、头长、协议版本、操作码、序号) 加包体，
+一个 WebSocket 帧中可能连续包含多个包；协议版本 2 / 3 的消息包体是
+zlib / brotli 压缩后的一批数据包。
+"""
+
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Iterator
+
+try:
+    import brotli
+except ImportError:  # 可选依赖，未安装时只能使用 zlib 压缩的协议版本
+    brotli = None
+if brotli is not None and not hasattr(brotli.Decompressor, "can_accept_more_data"):
+    brotli = None  # brotli 1.2 之前无法限制解压输出的大小，不使用该协议版本
+
+HEADER = struct.Struct(">IHHII")
+
+PROTO_JSON = 0
+PROTO_INT = 1
+PROTO_ZLIB = 2
+PROTO_BROTLI = 3
+
+OP_HEARTBEAT = 2
+OP_HEARTBEAT_REPLY = 3
+OP_MESSAGE = 5
+OP_AUTH = 7
+OP_AUTH_REPLY = 8
+
+MAX_DECOMPRESSED_SIZE = 8 << 20  # 单批压缩数据解压后的上限
+
+
+class ProtocolError(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class Packet:
+    op: int
+    protover: int
+    body: bytes
+
+
+def encode_packet(op: int, body: bytes = b"", protover: int = PROTO_INT, seq: int = 1) -> bytes:
+    return HEADER.pack(HEADER.size + len(body), HEADER.size, protover, op, seq) + body
+
+
+def _decompress(protover: int, body: bytes) -> bytes:
+    if protover == PROTO_ZLIB:
+        decompressor = zlib.decompressobj()
+        data = decompressor.decompress(body, MAX_DECOMPRESSED_SIZE)
+        if decompressor.unconsumed_tail:
+            raise ProtocolError("解压后的数据超出上限")
+        return data
+    if brotli is None:
+        raise ProtocolError("收到 brotli 压缩的数据，但未安装 brotli")
+    decompressor = brotli.Decompressor()
+    # 输出达到上限时停止解压，还有剩余输出说明超出上限
+    data = decompressor.process(body, output_buffer_limit=MAX_DECOMPRESSED_SIZE + 1)
+    if len(data) > MAX_DECOMPRESSED_SIZE or not decompressor.can_accept_more_data():
+        raise ProtocolError("解压后的数据超出上限")
+    return data
+
+
+def iter_packets(data: bytes, nested: bool = False) -> Iterator[Packet]:
+    """逐个产出一帧中的数据包，压缩的批次会被展开"""
+    offset = 0
+    while offset < len(data):
+        if len(data) - offset < HEADER.size:
+            raise ProtocolError("数据包头不完整")
+        length, header_len, protover, op, _ = HEADER.unpack_from(data, offset)
+        if header_len < HEADER.size or length < header_len or offset + length > len(data):
+            raise ProtocolError(f"无效的数据包长度: {length}")
+        body = data[offset + header_len : offset + length]
+        offset += length
+        if op == OP_MESSAGE and protover in (PROTO_ZLIB, PROTO_BROTLI):
+            if nested:
+                raise ProtocolError("压缩数据中不应再包含压缩数据")
+            yield from iter_packets(_decompress(protover, body), nested=True)
+        else:
+            yield Packet(op, protover, body)
@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from .records import RoomArea, RoomInfo
+
+
+@dataclass
+class FieldPatch:
+    """
+    单个字段需要执行的上游写操作。
+
+    payloads 是 Room/update 的请求参数片段，同一字段内按顺序执行，
+    不同字段之间相互独立，可以并发执行。
+    """
+
+    field: str
+    payloads: List[Dict[str, Any]]
+    target: Any
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+def _clean_tags(tags: Optional[List[str]]) -> List[str]:
+    """去掉空标签与重复标签，保留原有顺序"""
+    result: List[str] = []
+    for tag in tags or []:
+        tag = tag.strip()
+        if tag and tag not in result:
+            result.append(tag)
+    return result
+
+
+def _same_id(a: Any, b: Any) -> bool:
+    try:
+        return int(a) == int(b)
+    except (TypeError, ValueError):
+        return False
+
+
+def plan_room_update(
+    current: Optional[RoomInfo], updates: Dict[str, Any]
+) -> Tuple[List[FieldPatch], List[str]]:
+    """
+    对比目标状态与当前快照，生成最少的写操作。
+
+    Args:
+        current (Optional[RoomInfo]): 当前直播间快照，为 None 时所有字段都会写入。
+        updates (Dict[str, Any]): 目标状态，可包含 title、area、parent_area、tags。
+
+    Returns:
+        Tuple[List[FieldPatch], List[str]]: 需要执行的写操作，以及无需修改的字段名。
+    """
+    patches: List[FieldPatch] = []
+    unchanged: List[str] = []
+
+    if "title" in updates:
+        title = updates["title"]
+        if current is not None and current.title == title:
+            unchanged.append("title")
+        else:
+            patches.append(FieldPatch("title", [{"title": title}], title))
+
+    if "area" in updates:
+        area_id = updates["area"]
+        target = RoomArea(parent_id=updates.get("parent_area"), id=area_id)
+        if current is not None and _same_id(current.area.id, area_id):
+            unchanged.append("area")
+        else:
+            patches.append(FieldPatch("area", [{"area_id": area_id}], target))
+
+    if "tags" in updates:
+        new_tags = _clean_tags(updates["tags"])
+        if current is None:
+            # 没有快照时无法得知需要删除哪些标签，只能逐个添加
+            patches.append(
+                FieldPatch(
+                    "tags",
+                    [{"add_tag": tag} for tag in new_tags],
+                    new_tags,
+                    added=new_tags,
+                )
+            )
+        else:
+            current_tags = _clean_tags(current.tags)
+            removed = [tag for tag in current_tags if tag not in new_tags]
+            added = [tag for tag in new_tags if tag not in current_tags]
+            if not removed and not added:
+                unchanged.append("tags")
+            else:
+                # 先删后加，避免超出标签数量上限
+                payloads = [{"del_tag": tag} for tag in removed]
+                payloads += [{"add_tag": tag} for tag in added]
+                patches.append(
+                    FieldPatch("tags", payloads, new_tags, added=added, removed=removed)
+                )
+
+    return patches, unchanged
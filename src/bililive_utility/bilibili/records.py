@@ -0,0 +1,154 @@
+"""
+上游接口返回数据的精简记录。
+
+只保留程序与界面用到的字段，响应体由 pydantic 直接从 JSON 字节解析为这些记录，
+不会先构造完整的字典；记录使用 __slots__，大量分区数据常驻内存时占用更小。
+记录在缓存与多个调用方之间共享，不应原地修改，需要修改时使用 dataclasses.replace。
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+# 上游返回的时间字符串均为北京时间
+BEIJING_TZ = timezone(timedelta(hours=8))
+
+
+def parse_beijing_time(value: str) -> int:
+    """将 "2024-01-01 20:00:00" 格式的北京时间转换为时间戳，未开播时的 "0000-00-00 00:00:00" 返回 0"""
+    try:
+        return int(datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=BEIJING_TZ).timestamp())
+    except ValueError:
+        return 0
+
+
+@dataclass(slots=True)
+class Reply(Generic[T]):
+    """上游接口统一的 {code, message, data} 响应"""
+
+    code: int = -1
+    message: str = ""
+    data: Optional[T] = None
+
+
+@dataclass(slots=True)
+class QrCode:
+    url: str = ""
+    qrcode_key: str = ""
+
+
+@dataclass(slots=True)
+class QrPollStatus:
+    code: int = -1
+    message: str = ""
+
+
+@dataclass(slots=True)
+class WbiImg:
+    img_url: str = ""
+    sub_url: str = ""
+
+
+@dataclass(slots=True)
+class NavInfo:
+    isLogin: bool = False
+    wbi_img: Optional[WbiImg] = None
+
+
+@dataclass(slots=True)
+class DanmuHost:
+    host: str
+    port: int = 2243
+    wss_port: int = 443
+    ws_port: int = 2244
+
+
+@dataclass(slots=True)
+class DanmuInfo:
+    """弹幕长连接的令牌与服务器列表"""
+
+    token: str = ""
+    host_list: List[DanmuHost] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class LinkBuild:
+    """PC 直播姬的版本与构建号"""
+
+    curr_version: str = ""
+    build: int = 0
+
+
+@dataclass(slots=True)
+class SubArea:
+    id: int
+    parent_id: int
+    name: str = ""
+    parent_name: str = ""
+    pic: str = ""
+
+
+@dataclass(slots=True)
+class AreaGroup:
+    id: int
+    name: str = ""
+    list: List[SubArea] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class RoomArea:
+    parent_id: Optional[int] = None
+    id: Optional[int] = None
+
+
+@dataclass(slots=True)
+class RoomInfo:
+    """直播间信息快照"""
+
+    title: str = ""
+    tags: List[str] = field(default_factory=list)
+    live_status: int = 0
+    area: RoomArea = field(default_factory=RoomArea)
+    online: int = 0  # 人气值
+    attention: int = 0  # 关注数
+    live_time: int = 0  # 本场开播时间戳，未开播时为 0
+
+
+@dataclass(slots=True)
+class RawRoomInfo:
+    """Room/get_info 返回的原始字段"""
+
+    title: str = ""
+    tags: str = ""
+    live_status: int = 0
+    area_id: Optional[int] = None
+    parent_area_id: Optional[int] = None
+    online: int = 0
+    attention: int = 0
+    live_time: str = ""
+
+    def to_room_info(self) -> RoomInfo:
+        return RoomInfo(
+            title=self.title,
+            tags=self.tags.split(","),
+            live_status=self.live_status,
+            area=RoomArea(parent_id=self.parent_area_id, id=self.area_id),
+            online=self.online,
+            attention=self.attention,
+            live_time=parse_beijing_time(self.live_time),
+        )
+
+
+QR_CODE_REPLY = TypeAdapter(Reply[QrCode])
+QR_POLL_REPLY = TypeAdapter(Reply[QrPollStatus])
+NAV_REPLY = TypeAdapter(Reply[NavInfo])
+DANMU_INFO_REPLY = TypeAdapter(Reply[DanmuInfo])
+LINK_BUILD = TypeAdapter(LinkBuild)
+LINK_BUILD_REPLY = TypeAdapter(Reply[LinkBuild])
+AREA_LIST = TypeAdapter(List[AreaGroup])
+AREA_LIST_REPLY = TypeAdapter(Reply[List[AreaGroup]])
+ROOM_INFO_REPLY = TypeAdapter(Reply[RawRoomInfo])
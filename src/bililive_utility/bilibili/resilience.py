@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """上游主机处于熔断状态，请求被直接拒绝"""
+
+
+@dataclass(frozen=True)
+class EndpointPolicy:
+    """
+    单个上游接口的超时与重试策略。
+
+    idempotent 为 False 的接口只会在连接阶段失败 (请求确定未发出) 时重试。
+    """
+
+    connect_timeout: float = 3.0
+    read_timeout: float = 8.0
+    retries: int = 2
+    idempotent: bool = True
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.read_timeout,
+            pool=self.connect_timeout,
+        )
+
+
+GET_POLICY = EndpointPolicy()
+POST_POLICY = EndpointPolicy(retries=1, idempotent=False)
+
+# 按 URL 路径覆盖的策略
+ENDPOINT_POLICIES: Dict[str, EndpointPolicy] = {
+    "/x/passport-login/web/qrcode/poll": EndpointPolicy(read_timeout=5.0, retries=1),
+    "/room/v1/Area/getList": EndpointPolicy(read_timeout=10.0),
+    "/room/v1/Room/startLive": EndpointPolicy(read_timeout=10.0, retries=1, idempotent=False),
+    "/room/v1/Room/stopLive": EndpointPolicy(read_timeout=10.0, retries=1, idempotent=False),
+}
+
+
+@dataclass
+class ResilienceConfig:
+    backoff_base: float = 0.3  # 重试退避的基准秒数
+    backoff_max: float = 3.0  # 单次退避的上限
+    failure_threshold: int = 5  # 连续失败多少次后熔断
+    recovery_timeout: float = 30.0  # 熔断后多久允许试探请求
+    policies: Dict[str, EndpointPolicy] = field(default_factory=lambda: dict(ENDPOINT_POLICIES))
+
+
+class CircuitBreaker:
+    """
+    单个主机的熔断器：closed → open → half_open → closed。
+    """
+
+    def __init__(self, host: str, config: ResilienceConfig):
+        self.host = host
+        self.config = config
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trips = 0
+        self.rejected = 0
+        self._trial_inflight = False
+
+    def before_call(self):
+        if self.state == "closed":
+            return
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.config.recovery_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(f"{self.host} 暂时不可用，请稍后重试")
+            self.state = "half_open"
+        # half_open 状态只放行一个试探请求
+        if self._trial_inflight:
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.host} 正在恢复中，请稍后重试")
+        self._trial_inflight = True
+
+    def release(self):
+        """请求被取消时释放试探名额"""
+        self._trial_inflight = False
+
+    def record_success(self):
+        self._trial_inflight = False
+        self.failures = 0
+        if self.state != "closed":
+            log.info(f"{self.host} 已恢复")
+        self.state = "closed"
+
+    def record_failure(self):
+        self._trial_inflight = False
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.config.failure_threshold:
+            if self.state != "open":
+                self.trips += 1
+                log.warning(f"{self.host} 连续失败 {self.failures} 次，暂停请求 {self.config.recovery_timeout:.0f}s")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
+
+
+class Resilience:
+    """为上游请求提供分接口超时、带抖动的重试以及按主机熔断"""
+
+    def __init__(self, config: Optional[ResilienceConfig] = None):
+        self.config = config or ResilienceConfig()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.retries = 0
+        self.timeouts = 0
+        self.errors = 0
+
+    def configure(self, **kwargs):
+        """修改配置，例如 configure(failure_threshold=3)"""
+        for key, value in kwargs.items():
+            if not hasattr(self.config, key):
+                raise AttributeError(f"未知的配置项: {key}")
+            setattr(self.config, key, value)
+
+    def policy_for(self, method: str, url: str) -> EndpointPolicy:
+        policy = self.config.policies.get(httpx.URL(url).path)
+        if policy is not None:
+            return policy
+        return GET_POLICY if method in ("GET", "HEAD") else POST_POLICY
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, self.config)
+            self._breakers[host] = breaker
+        return breaker
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter
+        return random.uniform(0, min(self.config.backoff_max, self.config.backoff_base * 2 ** attempt))
+
+    async def call(
+        self,
+        host: str,
+        policy: EndpointPolicy,
+        send: Callable[[], Awaitable[httpx.Response]],
+    ) -> httpx.Response:
+        breaker = self.breaker(host)
+        attempt = 0
+        while True:
+            breaker.before_call()
+            try:
+                response = await send()
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                self.errors += 1
+                if isinstance(e, httpx.TimeoutException):
+                    self.timeouts += 1
+                # 连接阶段的失败说明请求没有发出，非幂等接口也可以安全重试
+                safe = policy.idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if attempt < policy.retries and safe:
+                    await self._retry_sleep(attempt, host, e)
+                    attempt += 1
+                    continue
+                raise
+
+            if response.status_code >= 500:
+                breaker.record_failure()
+                self.errors += 1
+                if attempt < policy.retries and policy.idempotent:
+                    await response.aclose()
+                    await self._retry_sleep(attempt, host, f"HTTP {response.status_code}")
+                    attempt += 1
+                    continue
+                return response
+
+            breaker.record_success()
+            return response
+
+    async def _retry_sleep(self, attempt: int, host: str, reason: Any):
+        self.retries += 1
+        delay = self._backoff(attempt)
+        log.info(f"请求 {host} 失败 ({reason})，{delay:.2f}s 后第 {attempt + 1} 次重试")
+        await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "breakers": {host: b.stats() for host, b in self._breakers.items()},
+        }
+
+
+resilience = Resilience()
@@ -0,0 +1,349 @@
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import secrets
+import time
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import api
+from ..context.path import DATA_PATH
+from ..context.store import store
+
+log = logging.getLogger(__name__)
+
+SCHEDULE_NS = "schedule"
+LEGACY_SCHEDULE_PATH = DATA_PATH / "schedule.json"
+
+ACTION_START = "start"
+ACTION_STOP = "stop"
+ACTIONS = (ACTION_START, ACTION_STOP)
+REPEATS = {"once": None, "daily": timedelta(days=1), "weekly": timedelta(weeks=1)}
+
+PREWARM_LEAD = 60.0  # 提前多少秒预热会话与直播间快照
+START_GRACE = 30 * 60  # 程序未运行而错过的开播，在该时长内补执行，否则跳过
+STOP_GRACE = 60 * 60  # 错过太久的停播不再补执行，此时的直播可能是之后手动开启的
+MAX_SLEEP = 60.0  # 单次休眠上限，避免系统休眠或调整时钟后长时间不醒
+
+_PREWARM = "prewarm"
+_RUN = "run"
+
+
+@dataclass
+class ScheduleEntry:
+    """
+    定时开播 / 停播计划。
+
+    run_at 为下一次执行的时间戳；开播计划可以附带标题、标签与分区预设，
+    会在预热阶段提前提交，到点时只需要发送开播请求。
+    """
+
+    id: str
+    account: str
+    action: str
+    run_at: float
+    repeat: str = "once"
+    title: Optional[str] = None
+    tags: Optional[List[str]] = None
+    area: Optional[int] = None
+    parent_area: Optional[int] = None
+    enabled: bool = True
+    last_run: Optional[float] = None
+    last_result: Optional[Dict[str, Any]] = None
+
+    def preset(self) -> Dict[str, Any]:
+        """需要在开播前应用的直播间信息"""
+        updates: Dict[str, Any] = {}
+        if self.title is not None:
+            updates["title"] = self.title
+        if self.tags is not None:
+            updates["tags"] = self.tags
+        if self.area is not None:
+            updates["area"] = self.area
+            if self.parent_area is not None:
+                updates["parent_area"] = self.parent_area
+        return updates
+
+    def next_after(self, now: float) -> Optional[float]:
+        """晚于 now 的下一次执行时间，一次性计划返回 None"""
+        step = REPEATS.get(self.repeat)
+        if step is None:
+            return None
+        # 按本地墙上时间递增，跨越夏令时也保持同一时刻
+        when = datetime.fromtimestamp(self.run_at)
+        while when.timestamp() <= now:
+            when += step
+        return when.timestamp()
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "ScheduleEntry":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in raw.items() if k in known})
+
+
+def new_entry_id() -> str:
+    return secrets.token_hex(6)
+
+
+class LiveScheduler:
+    """
+    定时开播 / 停播调度器。
+
+    所有计划共用一个按时间排序的堆和一个后台任务；每个计划在堆中有预热与执行两个时间点，
+    每次入堆时计划的版本号递增，计划被修改、删除或重新入堆后，
+    堆中旧的时间点在弹出时按版本号判断为过期并丢弃，同一计划不会重复预热或执行。
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, ScheduleEntry] = {}
+        # (触发时间, 序号, 计划 id, 版本号, run_at, 类型)
+        self._heap: List[Tuple[float, int, str, int, float, str]] = []
+        self._seq = itertools.count()
+        self._versions: Dict[str, int] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._prewarming: Dict[str, asyncio.Task] = {}
+        self._prewarmed: Dict[str, float] = {}  # 计划 id -> 已完成预热的 run_at
+        self._running: Dict[str, asyncio.Task] = {}
+
+    # --- 持久化 ---
+
+    def load(self):
+        self.entries.clear()
+        self._migrate_legacy_file()
+        for entry_id, raw in store.items(SCHEDULE_NS).items():
+            try:
+                self.entries[entry_id] = ScheduleEntry.from_dict(json.loads(raw))
+            except Exception as e:
+                log.warning(f"读取定时计划 {entry_id} 失败: {e}")
+        log.info(f"已加载 {len(self.entries)} 个定时计划")
+
+    def _migrate_legacy_file(self):
+        # 早期版本将全部计划保存在一个 JSON 文件中
+        if not LEGACY_SCHEDULE_PATH.exists():
+            return
+        try:
+            with open(LEGACY_SCHEDULE_PATH, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            with store.transaction():
+                for item in raw.get("entries", []):
+                    store.set(SCHEDULE_NS, item["id"], json.dumps(item, ensure_ascii=False))
+            LEGACY_SCHEDULE_PATH.unlink()
+        except Exception as e:
+            log.warning(f"导入旧版定时计划失败: {e}")
+
+    def save(self, entry: ScheduleEntry):
+        """只写入发生变化的计划"""
+        try:
+            store.set(SCHEDULE_NS, entry.id, json.dumps(asdict(entry), ensure_ascii=False))
+        except Exception as e:
+            log.warning(f"保存定时计划失败: {e}")
+
+    # --- 计划管理 ---
+
+    def list_entries(self) -> List[ScheduleEntry]:
+        return sorted(self.entries.values(), key=lambda e: e.run_at)
+
+    def add(self, entry: ScheduleEntry) -> ScheduleEntry:
+        self.entries[entry.id] = entry
+        self.save(entry)
+        self._push(entry)
+        return entry
+
+    def remove(self, entry_id: str) -> bool:
+        entry = self.entries.pop(entry_id, None)
+        if entry is None:
+            return False
+        self._prewarmed.pop(entry_id, None)
+        self._versions.pop(entry_id, None)
+        store.delete(SCHEDULE_NS, entry_id)
+        self._wakeup.set()
+        return True
+
+    def set_enabled(self, entry_id: str, enabled: bool) -> Optional[ScheduleEntry]:
+        entry = self.entries.get(entry_id)
+        if entry is None:
+            return None
+        if entry.enabled == enabled:
+            return entry
+        entry.enabled = enabled
+        if enabled and entry.run_at <= time.time():
+            # 重新启用已过期的计划时从下一次开始，一次性计划则保持过期状态
+            entry.run_at = entry.next_after(time.time()) or entry.run_at
+            entry.enabled = entry.run_at > time.time()
+        self.save(entry)
+        self._push(entry)
+        return entry
+
+    # --- 调度 ---
+
+    def _push(self, entry: ScheduleEntry):
+        # 版本号递增后，堆中该计划原有的时间点全部过期
+        version = self._versions.get(entry.id, 0) + 1
+        self._versions[entry.id] = version
+        if self.entries.get(entry.id) is not entry or not entry.enabled:
+            self._wakeup.set()
+            return
+        seq = next(self._seq)
+        heapq.heappush(self._heap, (entry.run_at - PREWARM_LEAD, seq, entry.id, version, entry.run_at, _PREWARM))
+        heapq.heappush(self._heap, (entry.run_at, seq, entry.id, version, entry.run_at, _RUN))
+        self._wakeup.set()
+
+    def _is_stale(self, item: Tuple[float, int, str, int, float, str]) -> bool:
+        entry = self.entries.get(item[2])
+        return (
+            entry is None
+            or not entry.enabled
+            or self._versions.get(item[2]) != item[3]
+            or entry.run_at != item[4]
+        )
+
+    def _catch_up(self, now: float):
+        """处理程序未运行期间错过的计划"""
+        for entry in self.entries.values():
+            if not entry.enabled or entry.run_at > now:
+                continue
+            missed_by = now - entry.run_at
+            # 只在宽限期内补执行，避免在意料之外的时间开播，或停掉之后手动开启的直播
+            grace = STOP_GRACE if entry.action == ACTION_STOP else START_GRACE
+            if missed_by <= grace:
+                log.info(f"补执行错过的定时计划 {entry.id} ({entry.action}，已错过 {missed_by:.0f}s)")
+                continue
+            log.warning(f"定时计划 {entry.id} 已错过 {missed_by:.0f}s，跳过本次执行")
+            entry.last_result = {"success": False, "error": "程序未运行，已错过执行时间"}
+            self._advance(entry, now)
+            self.save(entry)
+
+    def _advance(self, entry: ScheduleEntry, now: float):
+        next_run = entry.next_after(now)
+        if next_run is None:
+            entry.enabled = False
+        else:
+            entry.run_at = next_run
+
+    async def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        self.load()
+        self._catch_up(time.time())
+        self._heap.clear()
+        self._versions.clear()
+        for entry in self.entries.values():
+            self._push(entry)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        # 正在执行的开播 / 停播也要在关闭 HTTP 客户端之前结束
+        tasks = list(self._prewarming.values()) + list(self._running.values())
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._prewarming.clear()
+        self._running.clear()
+
+    async def _run(self):
+        while True:
+            while self._heap and self._is_stale(self._heap[0]):
+                heapq.heappop(self._heap)
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(delay, MAX_SLEEP))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, entry_id, _, run_at, kind = heapq.heappop(self._heap)
+            entry = self.entries[entry_id]
+            if kind == _PREWARM:
+                task = asyncio.create_task(self._prewarm(entry, run_at))
+                self._prewarming[entry_id] = task
+                task.add_done_callback(lambda t, key=entry_id: self._prewarm_done(key, t))
+            elif entry_id not in self._running:
+                self._running[entry_id] = asyncio.create_task(self._execute(entry, run_at))
+
+    def _prewarm_done(self, entry_id: str, task: asyncio.Task):
+        if self._prewarming.get(entry_id) is task:
+            del self._prewarming[entry_id]
+        if not task.cancelled():
+            task.exception()
+
+    async def _prewarm(self, entry: ScheduleEntry, run_at: float):
+        """检查登录、刷新直播间快照、分区列表与直播姬构建号，并提前提交开播预设"""
+        try:
+            if not await api.check_login_status(entry.account):
+                log.warning(f"定时计划 {entry.id} 预热失败: 账户 {entry.account} 未登录")
+                return
+            if entry.action == ACTION_START:
+                await asyncio.gather(
+                    api.get_room_info(entry.account),
+                    api.get_area_list_entry(entry.account),
+                    api.get_pc_link_build(entry.account),
+                )
+                preset = entry.preset()
+                if preset:
+                    await self._apply_preset(entry, preset)
+            self._prewarmed[entry.id] = run_at
+            log.info(f"定时计划 {entry.id} 预热完成")
+        except Exception as e:
+            log.warning(f"定时计划 {entry.id} 预热失败: {e}")
+
+    async def _apply_preset(self, entry: ScheduleEntry, preset: Dict[str, Any]):
+        results = await api.update_room_info(preset, entry.account)
+        failed = [name for name, result in results.items() if result["status"] == "failed"]
+        if failed:
+            raise Exception(f"直播间信息预设提交失败: {', '.join(failed)}")
+
+    async def _execute(self, entry: ScheduleEntry, run_at: float):
+        try:
+            prewarm = self._prewarming.get(entry.id)
+            if prewarm is not None:
+                await asyncio.shield(prewarm)
+            if entry.action == ACTION_START:
+                if self._prewarmed.get(entry.id) != run_at:
+                    # 预热没有完成时在这里补交预设
+                    preset = entry.preset()
+                    if preset:
+                        await self._apply_preset(entry, preset)
+                area = entry.area
+                if area is None:
+                    area = (await api.get_room_info(entry.account)).area.id
+                data = await api.start_live(area, entry.account)
+                if data.get("qr"):
+                    result = {"success": False, "error": data.get("message") or "需要进行人脸验证"}
+                else:
+                    result = {"success": True}
+            else:
+                await api.stop_live(entry.account)
+                result = {"success": True}
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+        finally:
+            self._running.pop(entry.id, None)
+
+        if result["success"]:
+            log.info(f"定时计划 {entry.id} 执行成功 ({entry.action})")
+        else:
+            log.warning(f"定时计划 {entry.id} 执行失败: {result['error']}")
+        self._prewarmed.pop(entry.id, None)
+        if self.entries.get(entry.id) is not entry:
+            return
+        now = time.time()
+        entry.last_run = now
+        entry.last_result = result
+        self._advance(entry, now)
+        self.save(entry)
+        self._push(entry)
+
+
+live_scheduler = LiveScheduler()
@@ -0,0 +1,161 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """上游请求的优先级，数值越小越先放行"""
+
+    LIVE_CONTROL = 0  # 开播 / 停播
+    AUTH = 1  # 登录、登出
+    INTERACTIVE = 2  # 用户在界面上直接触发的查询
+    METADATA = 3  # 修改标题、分区、标签
+    POLLING = 4  # 后台轮询与预热
+
+
+# 每个主机的令牌桶参数：(每秒令牌数, 桶容量)
+HOST_LIMITS: Dict[str, Tuple[float, float]] = {
+    "api.live.bilibili.com": (4.0, 4.0),
+    "api.bilibili.com": (4.0, 4.0),
+    "passport.bilibili.com": (2.0, 4.0),
+}
+DEFAULT_LIMIT: Tuple[float, float] = (4.0, 4.0)
+
+# B 站表示请求过于频繁的 HTTP 状态码与业务码
+RATE_LIMIT_STATUS = {412, 429}
+RATE_LIMIT_CODES = {-412, -509, -799}
+
+MAX_BACKOFF = 60.0
+
+
+class HostBucket:
+    """
+    单个主机的令牌桶。
+
+    令牌不足时按优先级排队，由一个调度任务在令牌恢复后依次放行；
+    遇到限流时暂停整个主机并降低速率，之后随成功请求逐步恢复。
+    """
+
+    def __init__(self, host: str, rate: float, burst: float):
+        self.host = host
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.backoff = 0.0
+        self.granted = 0
+        self.throttled = 0
+        self._seq = itertools.count()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, priority: int = Priority.INTERACTIVE):
+        """获取一个令牌，必要时按优先级排队等待"""
+        now = time.monotonic()
+        self._refill(now)
+        if not self._waiters and now >= self.paused_until and self.tokens >= 1:
+            self.tokens -= 1
+            self.granted += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        while self._waiters:
+            if self._waiters[0][2].done():
+                # 等待者已取消
+                heapq.heappop(self._waiters)
+                continue
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self.paused_until - now)
+            if self.tokens < 1:
+                wait = max(wait, (1 - self.tokens) / self.rate)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            self.tokens -= 1
+            self.granted += 1
+            _, _, future = heapq.heappop(self._waiters)
+            future.set_result(None)
+
+    def on_rate_limited(self):
+        """遇到限流：指数退避暂停该主机，并将速率减半"""
+        self.throttled += 1
+        self.backoff = min(MAX_BACKOFF, max(1.0, self.backoff * 2))
+        self.paused_until = time.monotonic() + self.backoff * random.uniform(1.0, 1.5)
+        self.rate = max(self.base_rate / 8, self.rate / 2)
+        self.tokens = min(self.tokens, 0)
+        log.warning(
+            f"{self.host} 触发限流，暂停 {self.backoff:.1f}s，速率降至 {self.rate:.2f}/s"
+        )
+
+    def on_success(self):
+        """请求成功：逐步恢复速率"""
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 10)
+        if self.backoff:
+            self.backoff /= 2
+            if self.backoff < 1:
+                self.backoff = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": round(self.rate, 3),
+            "tokens": round(self.tokens, 3),
+            "waiting": sum(1 for *_, f in self._waiters if not f.done()),
+            "paused_for": round(max(0.0, self.paused_until - time.monotonic()), 3),
+            "granted": self.granted,
+            "throttled": self.throttled,
+        }
+
+
+class Scheduler:
+    """按主机管理令牌桶的全局上游请求调度器"""
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.limits = dict(HOST_LIMITS if limits is None else limits)
+        self._buckets: Dict[str, HostBucket] = {}
+
+    def bucket(self, host: str) -> HostBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, burst = self.limits.get(host, DEFAULT_LIMIT)
+            bucket = HostBucket(host, rate, burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, host: str, priority: int = Priority.INTERACTIVE):
+        await self.bucket(host).acquire(priority)
+
+    def report(self, host: str, status_code: int, code: Any = None) -> bool:
+        """根据响应反馈调整速率，返回是否判定为限流"""
+        bucket = self.bucket(host)
+        if status_code in RATE_LIMIT_STATUS or code in RATE_LIMIT_CODES:
+            bucket.on_rate_limited()
+            return True
+        if status_code < 400:
+            bucket.on_success()
+        return False
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {host: bucket.stats() for host, bucket in self._buckets.items()}
+
+
+scheduler = Scheduler()
@@ -1,11 +1,15 @@
+import os
+import re
 import httpx
-import platformdirs
 import json
 import atexit
+import asyncio
 import logging
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
-from ..context.path import SESSION_PATH
+from ..context.path import SESSION_PATH, CACHE_PATH
+from ..context.store import store
 from ..utils.crypto import encrypt_data, decrypt_data
 
 # --- 日志配置 ---
@@ -20,45 +24,301 @@ HEADERS: Dict[str, str] = {
     "Referer": "https://link.bilibili.com/p/center/index",
 }
 
-def load_cookies() -> Optional[Dict[str, str]]:
-    """从缓存加载 Cookies 字典"""
-    if not SESSION_PATH.exists():
+# --- 多账户 ---
+DEFAULT_ACCOUNT = "default"
+ACCOUNTS_PATH = CACHE_PATH / "accounts"  # 旧版本的账户目录，仅用于迁移
+_ACCOUNT_KEY_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+# --- 本地存储 ---
+SESSION_NS = "session"  # 加密后的 Cookies
+ROOM_ID_NS = "room_id"
+
+
+def load_cookies(account: str = DEFAULT_ACCOUNT) -> Optional[Dict[str, str]]:
+    """从本地存储加载 Cookies 字典"""
+    encrypted = store.get(SESSION_NS, account)
+    if encrypted is None:
         return None
 
-    log.info(f"正在从缓存加载 Cookies: {SESSION_PATH}")
+    log.info(f"正在从本地存储加载账户 {account} 的 Cookies")
     try:
-        with open(SESSION_PATH, "r") as f:
-            encrypted = f.read()
         json_str = decrypt_data(encrypted)
         cookies = json.loads(json_str)
         if isinstance(cookies, dict):
             log.info("Cookies 加载成功。")
             return cookies
         log.warning("缓存文件格式不正确")
-        return None
     except Exception as e:
         log.warning(
             f"加载 Cookies 失败: {e}"
         )
-        SESSION_PATH.unlink()
-        return None
+    store.delete(SESSION_NS, account)
+    return None
 
-def save_cookies(client: httpx.AsyncClient):
-    """在程序退出时，将当前会话的 Cookies 加密后保存到缓存文件。"""
-    log.info(f"正在将会话 Cookies 保存到: {SESSION_PATH}")
+def save_cookies(cookies: Dict[str, str], account: str = DEFAULT_ACCOUNT) -> bool:
+    """将 Cookies 加密后写入本地存储，Cookies 为空时删除记录"""
     try:
-        cookies_dict = dict(client.cookies)
-        encrypted = encrypt_data(json.dumps(cookies_dict))
-        with open(SESSION_PATH, "w") as f:
-            f.write(encrypted)
-        log.info("Cookies 保存成功")
+        if not cookies:
+            store.delete(SESSION_NS, account)
+            return True
+        log.info(f"正在保存账户 {account} 的 Cookies")
+        store.set(SESSION_NS, account, encrypt_data(json.dumps(cookies)))
+        return True
     except Exception as e:
         log.error(f"保存 Cookies 失败: {e}")
+        return False
+
+
+def _legacy_paths(key: str) -> Tuple[Path, Path]:
+    base = CACHE_PATH if key == DEFAULT_ACCOUNT else ACCOUNTS_PATH / key
+    session = SESSION_PATH if key == DEFAULT_ACCOUNT else base / "session"
+    return session, base / "room_id"
+
+
+_legacy_migrated = False
+
+
+def _migrate_legacy_files():
+    """旧版本将会话与房间号分别保存为文件，首次使用时导入本地存储并删除旧文件"""
+    global _legacy_migrated
+    if _legacy_migrated:
+        return
+    _legacy_migrated = True
+
+    keys = [DEFAULT_ACCOUNT]
+    if ACCOUNTS_PATH.exists():
+        keys += [p.name for p in ACCOUNTS_PATH.iterdir() if p.is_dir() and is_valid_account_key(p.name)]
+    for key in keys:
+        session_path, room_id_path = _legacy_paths(key)
+        if not session_path.exists() and not room_id_path.exists():
+            continue
+        try:
+            with store.transaction():
+                # 会话文件本身就是加密后的内容，直接导入即可
+                for ns, path in ((SESSION_NS, session_path), (ROOM_ID_NS, room_id_path)):
+                    if path.exists() and store.get(ns, key) is None:
+                        store.set(ns, key, path.read_text().strip())
+            for path in (session_path, room_id_path):
+                path.unlink(missing_ok=True)
+            if key != DEFAULT_ACCOUNT and not any(session_path.parent.iterdir()):
+                session_path.parent.rmdir()
+            log.info(f"已将账户 {key} 的旧版会话文件导入本地存储")
+        except Exception as e:
+            log.warning(f"导入账户 {key} 的旧版会话文件失败: {e}")
+
+
+# 所有账户共用同一个底层连接池，Cookie 则由各自的 AsyncClient 独立保管
+# 创建传输层需要加载证书，推迟到第一个账户创建时
+_shared_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+# 设置后所有上游请求都会被改写到该地址，例如指向 devtools.mock_upstream 启动的本地模拟服务
+UPSTREAM_OVERRIDE_ENV = "BILILIVE_UPSTREAM"
 
-bili_client = httpx.AsyncClient(
-    headers=HEADERS,
-    cookies=load_cookies(),
-    timeout=15.0
+
+class UpstreamOverrideTransport(httpx.AsyncBaseTransport):
+    """
+    将请求改写到另一个地址的传输层，只替换协议、主机与端口，路径和查询参数保持不变。
+
+    原始主机通过 X-Upstream-Host 请求头传递；响应仍挂在原始请求上，
+    因此 Cookie、调度器与熔断器看到的依旧是 B 站的域名。
+    """
+
+    def __init__(self, base_url: str, transport: httpx.AsyncBaseTransport):
+        self.base_url = httpx.URL(base_url)
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = request.url.copy_with(
+            scheme=self.base_url.scheme, host=self.base_url.host, port=self.base_url.port
+        )
+        headers = request.headers.copy()
+        headers["Host"] = url.netloc.decode("ascii")
+        headers["X-Upstream-Host"] = request.url.host
+        rewritten = httpx.Request(
+            request.method,
+            url,
+            headers=headers,
+            stream=request.stream,
+            extensions=request.extensions,
+        )
+        return await self._transport.handle_async_request(rewritten)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+# B 站的几个接口域名，启动时预先建立连接
+KNOWN_HOSTS = ("api.live.bilibili.com", "api.bilibili.com", "passport.bilibili.com")
+PRECONNECT_TIMEOUT = 5.0  # 预连接的握手与响应超时，直接使用传输层时不会应用客户端的超时
+
+# 启用 HTTP/2 后每个域名只需要一条连接；空闲连接保留得久一些，
+# 预连接建立的连接才能留到用户第一次操作的时候
+UPSTREAM_LIMITS = httpx.Limits(
+    max_connections=20,
+    max_keepalive_connections=10,
+    keepalive_expiry=120.0,
 )
 
-atexit.register(save_cookies, bili_client)
\ No newline at end of file
+
+def get_shared_transport() -> httpx.AsyncBaseTransport:
+    global _shared_transport
+    if _shared_transport is None:
+        transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+            http2=True, limits=UPSTREAM_LIMITS
+        )
+        override = os.environ.get(UPSTREAM_OVERRIDE_ENV)
+        if override:
+            log.warning(f"上游请求将被改写到 {override}")
+            transport = UpstreamOverrideTransport(override, transport)
+        _shared_transport = transport
+    return _shared_transport
+
+
+def rewrite_websocket_url(url: str) -> str:
+    """设置了 BILILIVE_UPSTREAM 时，将长连接地址同样改写到该地址"""
+    override = os.environ.get(UPSTREAM_OVERRIDE_ENV)
+    if not override:
+        return url
+    base = httpx.URL(override)
+    return str(
+        httpx.URL(url).copy_with(
+            scheme="wss" if base.scheme == "https" else "ws", host=base.host, port=base.port
+        )
+    )
+
+
+async def preconnect(hosts=KNOWN_HOSTS):
+    """
+    在后台与各个域名完成 TCP 与 TLS 握手，连接留在共享连接池中供之后的请求复用。
+
+    直接通过传输层发送 HEAD 请求，不经过调度器也不携带 Cookie，失败时忽略。
+    """
+    transport = get_shared_transport()
+
+    async def connect(host: str):
+        request = httpx.Request(
+            "HEAD",
+            f"https://{host}/",
+            headers={"User-Agent": HEADERS["User-Agent"]},
+            extensions={"timeout": httpx.Timeout(PRECONNECT_TIMEOUT).as_dict()},
+        )
+        try:
+            response = await transport.handle_async_request(request)
+            await response.aclose()
+        except httpx.HTTPError as e:
+            log.info(f"预连接 {host} 失败: {e or type(e).__name__}")
+
+    await asyncio.gather(*(connect(host) for host in hosts))
+
+
+def is_valid_account_key(key: str) -> bool:
+    """账户标识只允许字母、数字、下划线和连字符，避免被拼接为任意路径"""
+    return bool(_ACCOUNT_KEY_RE.match(key or ""))
+
+
+class Account:
+    """
+    单个账户的会话上下文，持有独立的 Cookie Jar 与房间号。
+
+    每次收到响应后检查 Cookie Jar 是否变化，只有变化时才加密并写入本地存储。
+    """
+
+    def __init__(self, key: str):
+        if not is_valid_account_key(key):
+            raise ValueError(f"无效的账户标识: {key!r}")
+        self.key = key
+        self.client = httpx.AsyncClient(
+            headers=HEADERS,
+            cookies=load_cookies(key),
+            timeout=15.0,
+            transport=get_shared_transport(),
+            event_hooks={"response": [self._on_response]},
+        )
+        self._room_id: Optional[str] = None
+        self._persisted = self._fingerprint()
+
+    def _fingerprint(self) -> FrozenSet[Tuple[str, str, str, str]]:
+        return frozenset((c.domain, c.path, c.name, c.value or "") for c in self.client.cookies.jar)
+
+    @property
+    def dirty(self) -> bool:
+        """Cookie Jar 是否有尚未保存的变化"""
+        return self._fingerprint() != self._persisted
+
+    async def _on_response(self, response: httpx.Response):
+        # 在事件循环中取快照，加密与写入放到线程中执行
+        fingerprint = self._fingerprint()
+        if fingerprint == self._persisted:
+            return
+        if await asyncio.to_thread(save_cookies, dict(self.client.cookies), self.key):
+            self._persisted = fingerprint
+
+    @property
+    def room_id(self) -> str:
+        """获取 room_id，优先使用内存缓存"""
+        if self._room_id is None:
+            self._room_id = store.get(ROOM_ID_NS, self.key)
+        return self._room_id or ""
+
+    def set_room_id(self, room_id: str):
+        """写入 room_id 到本地存储并同步更新内存缓存"""
+        self._room_id = room_id
+        store.set(ROOM_ID_NS, self.key, room_id)
+
+    def invalidate_room_id(self):
+        """清除 room_id 内存缓存"""
+        self._room_id = None
+
+    def save(self):
+        """Cookies 有变化时保存"""
+        fingerprint = self._fingerprint()
+        if fingerprint == self._persisted:
+            return
+        if save_cookies(dict(self.client.cookies), self.key):
+            self._persisted = fingerprint
+
+    def clear(self):
+        """清除本账户的本地会话与房间号"""
+        self.invalidate_room_id()
+        self.client.cookies.clear()
+        with store.transaction():
+            store.delete(SESSION_NS, self.key)
+            store.delete(ROOM_ID_NS, self.key)
+        self._persisted = self._fingerprint()
+
+
+_accounts: Dict[str, Account] = {}
+
+
+def get_account(key: str = DEFAULT_ACCOUNT) -> Account:
+    """获取账户上下文，首次访问时创建并加载本地会话"""
+    account = _accounts.get(key)
+    if account is None:
+        _migrate_legacy_files()
+        account = Account(key)
+        _accounts[key] = account
+    return account
+
+
+def list_accounts() -> List[str]:
+    """列出本地已保存会话的账户以及当前已加载的账户"""
+    _migrate_legacy_files()
+    keys = set(_accounts) | set(store.keys(SESSION_NS)) | set(store.keys(ROOM_ID_NS))
+    return sorted(keys)
+
+
+def loaded_accounts() -> List[str]:
+    """列出当前已加载到内存中的账户，不读取本地存储"""
+    return list(_accounts)
+
+
+def _save_all_accounts():
+    # Cookies 变化时已经即时写入，这里只是兜底
+    for account in _accounts.values():
+        account.save()
+    store.close()
+
+
+atexit.register(_save_all_accounts)
@@ -0,0 +1,359 @@
+"""
+直播间数据采样。
+
+直播中按固定间隔记录人气、关注数与本场开播时间。原始采样保存在内存中每个房间一个的
+环形缓冲区里，同时降采样为 1 分钟、5 分钟、1 小时三种粒度，按列追加写入
+DATA_PATH/stats/<房间号>/<粒度>/<列名>.bin。
+
+每个列文件都是定长数值的连续数组，时间列有序；区间查询时在时间列上二分查找，
+只读取命中的区间，不需要读入整个文件。
+
+采样器不会一直轮询所有账户，只采样以下直播间：快照显示正在直播的、有界面订阅开播状态的、
+最近查询过统计数据或通过本程序开播的。文件写入在线程中执行，不阻塞事件循环。
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import api, live_status
+from .records import RoomInfo
+from .session import loaded_accounts
+from ..context.path import DATA_PATH
+from ..context.store import store
+
+log = logging.getLogger(__name__)
+
+STATS_PATH = DATA_PATH / "stats"
+STATS_NS = "stats"
+INTERVAL_KEY = "interval"
+
+DEFAULT_INTERVAL = 60.0
+MIN_INTERVAL = 10.0  # 与直播间快照的新鲜期一致，更短的间隔只会读到同一份快照
+MAX_INTERVAL = 3600.0
+IDLE_INTERVAL = 30.0  # 没有需要采样的直播间时，检查快照与订阅情况的间隔 (不请求上游)
+WATCH_WINDOW = 10 * 60  # 查询统计数据或开播后，至少保持采样的时长
+
+RAW_CAPACITY = 8640  # 每个房间在内存中保留的原始采样数，按 10 秒间隔约为一天
+ROLLUPS = {"1m": 60, "5m": 300, "1h": 3600}
+RESOLUTIONS = ("raw",) + tuple(ROLLUPS)
+MAX_POINTS = 50000
+
+# (列名, array 类型码)，第一列为时间；所有类型都是 8 字节
+RAW_COLUMNS = (("t", "d"), ("online", "q"), ("attention", "q"), ("live_time", "q"))
+ROLLUP_COLUMNS = (
+    ("t", "q"),
+    ("samples", "q"),
+    ("online", "d"),  # 时间桶内的平均值
+    ("online_max", "q"),
+    ("attention", "q"),  # 时间桶内最后一次采样的值
+    ("live_time", "q"),
+)
+
+
+class RingBuffer:
+    """定长、按列存放的环形缓冲区，写满后覆盖最旧的数据；时间列必须递增"""
+
+    def __init__(self, columns: Sequence[Tuple[str, str]], capacity: int):
+        self.capacity = capacity
+        self.columns = {name: array(code, [0]) * capacity for name, code in columns}
+        self._time = self.columns[columns[0][0]]
+        self._start = 0
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _physical(self, index: int) -> int:
+        return (self._start + index) % self.capacity
+
+    def last_time(self) -> Optional[float]:
+        return self._time[self._physical(self._len - 1)] if self._len else None
+
+    def append(self, record: Sequence[Any]):
+        if self._len < self.capacity:
+            index = self._physical(self._len)
+            self._len += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+        for column, value in zip(self.columns.values(), record):
+            column[index] = value
+
+    def bisect(self, t: float) -> int:
+        """第一个时间不早于 t 的逻辑下标"""
+        lo, hi = 0, self._len
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._time[self._physical(mid)] < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def slice(self, lo: int, hi: int) -> Dict[str, List[Any]]:
+        """按列取出逻辑下标 [lo, hi) 的数据"""
+        if hi <= lo:
+            return {name: [] for name in self.columns}
+        a = self._physical(lo)
+        b = a + (hi - lo)
+        if b <= self.capacity:
+            return {name: column[a:b].tolist() for name, column in self.columns.items()}
+        b -= self.capacity
+        return {name: column[a:].tolist() + column[:b].tolist() for name, column in self.columns.items()}
+
+
+class SeriesFile:
+    """
+    磁盘上按列保存的时间序列，每列一个文件。
+
+    进程在两列写入之间结束时各列长度可能不一致，打开时截断到最短的一列。
+    """
+
+    ITEM_SIZE = 8
+
+    def __init__(self, directory: Path, columns: Sequence[Tuple[str, str]]):
+        self.directory = directory
+        self.columns = columns
+        self.length = self._repair()
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{name}.bin"
+
+    def _repair(self) -> int:
+        sizes = {}
+        for name, _ in self.columns:
+            path = self._path(name)
+            sizes[name] = path.stat().st_size // self.ITEM_SIZE if path.exists() else 0
+        length = min(sizes.values())
+        for name, size in sizes.items():
+            if size != length:
+                log.warning(f"统计数据 {self._path(name)} 不完整，截断到 {length} 条")
+                with open(self._path(name), "r+b") as f:
+                    f.truncate(length * self.ITEM_SIZE)
+        return length
+
+    def _read(self, name: str, code: str, lo: int, hi: int) -> array:
+        values = array(code)
+        if hi > lo:
+            with open(self._path(name), "rb") as f:
+                f.seek(lo * self.ITEM_SIZE)
+                values.fromfile(f, hi - lo)
+        return values
+
+    def last(self) -> Optional[List[Any]]:
+        if not self.length:
+            return None
+        return [self._read(name, code, self.length - 1, self.length)[0] for name, code in self.columns]
+
+    def write(self, index: int, record: Sequence[Any]):
+        """写入第 index 条记录，index 等于当前长度时追加"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for (name, code), value in zip(self.columns, record):
+            path = self._path(name)
+            with open(path, "r+b" if path.exists() else "wb") as f:
+                f.seek(index * self.ITEM_SIZE)
+                array(code, [value]).tofile(f)
+        self.length = max(self.length, index + 1)
+
+    def bisect(self, t: float) -> int:
+        """第一个时间不早于 t 的下标，每一步只读取一个值"""
+        lo, hi = 0, self.length
+        if not hi:
+            return 0
+        name, code = self.columns[0]
+        value = array(code, [0])
+        with open(self._path(name), "rb") as f:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                f.seek(mid * self.ITEM_SIZE)
+                f.readinto(value)
+                if value[0] < t:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        return lo
+
+    def slice(self, lo: int, hi: int) -> Dict[str, List[Any]]:
+        return {name: self._read(name, code, lo, hi).tolist() for name, code in self.columns}
+
+
+class Rollup:
+    """某一粒度的降采样序列，当前时间桶随每次采样原地更新，重启后继续累加到同一个桶"""
+
+    def __init__(self, directory: Path, step: int):
+        self.step = step
+        self.series = SeriesFile(directory, ROLLUP_COLUMNS)
+        self._bucket: Optional[List[Any]] = self.series.last()
+
+    def add(self, ts: float, online: int, attention: int, live_time: int):
+        start = int(ts // self.step * self.step)
+        bucket = self._bucket
+        if bucket is not None and start < bucket[0]:
+            return  # 系统时间被回拨，丢弃这次采样以保持时间列有序
+        if bucket is not None and start == bucket[0]:
+            _, samples, average, peak, _, _ = bucket
+            bucket = [
+                start,
+                samples + 1,
+                (average * samples + online) / (samples + 1),
+                max(peak, online),
+                attention,
+                live_time,
+            ]
+            self.series.write(self.series.length - 1, bucket)
+        else:
+            bucket = [start, 1, float(online), online, attention, live_time]
+            self.series.write(self.series.length, bucket)
+        self._bucket = bucket
+
+
+class RoomStats:
+    """
+    单个直播间的原始采样与各粒度降采样。
+
+    降采样文件在第一次 persist() 或查询时才打开，打开时需要检查并修复文件，
+    与读写一样在线程中执行。
+    """
+
+    def __init__(self, room_id: str, root: Path = STATS_PATH):
+        self.room_id = room_id
+        self.root = root
+        self.raw = RingBuffer(RAW_COLUMNS, RAW_CAPACITY)
+        self._rollups: Optional[Dict[str, Rollup]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def rollups(self) -> Dict[str, Rollup]:
+        with self._lock:
+            if self._rollups is None:
+                self._rollups = {
+                    name: Rollup(self.root / self.room_id / name, step) for name, step in ROLLUPS.items()
+                }
+            return self._rollups
+
+    def add(self, ts: float, info: RoomInfo) -> bool:
+        """写入内存中的原始采样，返回是否需要再调用 persist() 写入降采样"""
+        last = self.raw.last_time()
+        if last is not None and ts <= last:
+            return False
+        self.raw.append((ts, info.online, info.attention, info.live_time))
+        return True
+
+    def persist(self, ts: float, info: RoomInfo):
+        """更新各粒度的降采样文件，会读写磁盘，应在线程中调用"""
+        for rollup in self.rollups.values():
+            rollup.add(ts, info.online, info.attention, info.live_time)
+
+    def query(self, resolution: str, start: float, end: float, limit: int = MAX_POINTS) -> Dict[str, List[Any]]:
+        """按列返回 [start, end) 内的数据，超过 limit 条时只保留最新的 limit 条；raw 以外的粒度会读取磁盘"""
+        source = self.raw if resolution == "raw" else self.rollups[resolution].series
+        lo, hi = source.bisect(start), source.bisect(end)
+        return source.slice(max(lo, hi - limit), hi)
+
+
+class StatsSampler:
+    """
+    直播间数据采样器。
+
+    所有账户共用一个后台任务，只为需要采样的账户读取直播间快照，与其它接口共享同一份上游数据；
+    有直播间需要采样时按设定间隔运行，否则按 IDLE_INTERVAL 检查内存中的状态，不请求上游。
+    """
+
+    def __init__(self):
+        self._interval: Optional[float] = None
+        self._rooms: Dict[str, RoomStats] = {}
+        self._watched: Dict[str, float] = {}  # 账户 -> 保持采样的截止时间 (monotonic)
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+    @property
+    def interval(self) -> float:
+        if self._interval is None:
+            raw = store.get(STATS_NS, INTERVAL_KEY)
+            self._interval = float(raw) if raw else DEFAULT_INTERVAL
+        return self._interval
+
+    def set_interval(self, seconds: float) -> float:
+        """修改采样间隔并立即生效"""
+        self._interval = min(MAX_INTERVAL, max(MIN_INTERVAL, seconds))
+        store.set(STATS_NS, INTERVAL_KEY, str(self._interval))
+        self._wakeup.set()
+        return self._interval
+
+    def room(self, room_id: str) -> RoomStats:
+        stats = self._rooms.get(room_id)
+        if stats is None:
+            stats = RoomStats(room_id)
+            self._rooms[room_id] = stats
+        return stats
+
+    def watch(self, account: str):
+        """查询统计数据或开播后调用，在 WATCH_WINDOW 内持续采样该账户"""
+        self._watched[account] = time.monotonic() + WATCH_WINDOW
+        self._wakeup.set()
+
+    def _wants_sample(self, account: str) -> bool:
+        if self._watched.get(account, 0.0) > time.monotonic():
+            return True
+        self._watched.pop(account, None)
+        if live_status.subscriber_count(account) > 0:
+            return True
+        info = api.peek_room_info(account)
+        return info is not None and info.live_status == 1
+
+    async def sample_once(self) -> bool:
+        """为需要采样的直播间采样一次，返回是否有这样的直播间"""
+        pending = False
+        sampled = set()
+        # 被查看、被订阅或有快照的账户都已加载到内存中，不需要读取本地存储中的全部账户
+        for account in loaded_accounts():
+            if not self._wants_sample(account):
+                continue
+            room_id = api.get_cached_room_id(account)
+            if not room_id or room_id in sampled:
+                continue
+            pending = True
+            try:
+                info = await api.get_room_info(account, max_age=self.interval)
+            except Exception as e:
+                log.debug(f"账户 {account} 采样失败: {e}")
+                continue
+            if info.live_status != 1:
+                continue
+            sampled.add(room_id)
+            ts = time.time()
+            stats = self.room(room_id)
+            if stats.add(ts, info):
+                await asyncio.to_thread(stats.persist, ts, info)
+        return pending
+
+    async def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                pending = await self.sample_once()
+            except Exception as e:
+                log.warning(f"直播间数据采样失败: {e}")
+                pending = False
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval if pending else IDLE_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+
+stats_sampler = StatsSampler()
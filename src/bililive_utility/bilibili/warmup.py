@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+from . import api
+from .session import DEFAULT_ACCOUNT, PRECONNECT_TIMEOUT, get_account, preconnect
+
+log = logging.getLogger(__name__)
+
+# 最近一次预热的结果，供 /api/application/stats 查看
+last_warmup: Dict[str, Any] = {}
+
+
+async def warm_up(account: str = DEFAULT_ACCOUNT) -> Dict[str, Any]:
+    """
+    启动预热：本地存有会话时，同时检查登录状态、获取直播间快照、分区列表与直播姬构建号。
+
+    结果都写入各自的缓存，界面打开后的第一批请求可以直接从内存返回。
+    """
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"account": account}
+    if not get_account(account).client.cookies:
+        result["skipped"] = "本地没有保存的会话"
+    else:
+        logged_in, room_info, areas, _ = await asyncio.gather(
+            api.check_login_status(account),
+            api.get_room_info(account),
+            api.get_area_list_entry(account),
+            api.get_pc_link_build(account),
+            return_exceptions=True,
+        )
+        result["logged_in"] = logged_in is True
+        for name, value in (("room_info", room_info), ("areas", areas)):
+            result[name] = f"失败: {value}" if isinstance(value, Exception) else "ok"
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    last_warmup.clear()
+    last_warmup.update(result)
+    log.info(f"启动预热完成: {result}")
+    return result
+
+
+async def startup_warmup(account: str = DEFAULT_ACCOUNT):
+    """
+    先与上游握手，再预取账户数据，登录状态检查会复用握手建立的连接。
+
+    握手最多等待 PRECONNECT_TIMEOUT，某个域名迟迟连不上时不再等待，预取与握手同时进行。
+    """
+    handshake = asyncio.create_task(preconnect())
+    try:
+        await asyncio.wait({handshake}, timeout=PRECONNECT_TIMEOUT)
+        try:
+            await warm_up(account)
+        except Exception as e:
+            log.warning(f"启动预热失败: {e}")
+        await handshake
+    finally:
+        handshake.cancel()
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Set
+
+log = logging.getLogger(__name__)
+
+_CLOSED = object()
+
+
+class Watcher:
+    """
+    由单个后台任务驱动、可被多个订阅者共享的轮询器。
+
+    子类实现 poll_once()，返回下一次轮询前的等待秒数，返回 None 表示结束。
+    第一个订阅者到来时启动后台任务，最后一个订阅者离开后停止。
+    """
+
+    queue_size = 32
+
+    def __init__(self):
+        self.last_event: Optional[Dict[str, Any]] = None
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self.finished = False
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    async def poll_once(self) -> Optional[float]:
+        raise NotImplementedError
+
+    def publish(self, event: Dict[str, Any]):
+        """向所有订阅者广播事件，慢订阅者只丢弃最旧的事件"""
+        self.last_event = event
+        for queue in self._subscribers:
+            self._put(queue, event)
+
+    def nudge(self):
+        """提前唤醒后台任务，立即执行下一次轮询"""
+        self._wakeup.set()
+
+    @staticmethod
+    def _put(queue: asyncio.Queue, item: Any):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(item)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self.finished = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def subscribe(self, keepalive: Optional[float] = None) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        订阅事件流。
+
+        订阅时会先收到最近一次事件；设置 keepalive 时，
+        超过该秒数没有事件会产出 None，便于调用方发送心跳。
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.last_event is not None:
+            queue.put_nowait(self.last_event)
+        if self.finished:
+            queue.put_nowait(_CLOSED)
+        self._subscribers.add(queue)
+        if not self.finished:
+            self.start()
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if item is _CLOSED:
+                    return
+                yield item
+        finally:
+            self._subscribers.discard(queue)
+            if not self._subscribers:
+                await self.stop()
+
+    async def _run(self):
+        try:
+            while True:
+                # 先清除再轮询：轮询期间的 nudge() 会让下一次轮询立即开始
+                self._wakeup.clear()
+                try:
+                    interval = await self.poll_once()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    log.warning(f"{type(self).__name__} 轮询失败: {e}")
+                    interval = self.on_error(e)
+                if interval is None:
+                    self.finished = True
+                    break
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self.finished:
+                for queue in self._subscribers:
+                    self._put(queue, _CLOSED)
+
+    def on_error(self, error: Exception) -> Optional[float]:
+        """轮询出错时的处理，返回重试间隔，返回 None 则结束"""
+        return 5.0
@@ -0,0 +1,160 @@
+"""
+命令行入口，无需图形界面即可登录、开播、停播以及运行无界面服务。
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import os
+import secrets
+import sys
+import urllib.parse
+from typing import Optional
+
+from .bilibili.session import DEFAULT_ACCOUNT
+
+TOKEN_ENV = "BILILIVE_TOKEN"
+
+
+def _print_json(data):
+    from .utils.fastjson import to_builtin
+
+    print(json.dumps(data, ensure_ascii=False, indent=2, default=to_builtin))
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+async def _login(account: str) -> int:
+    from .bilibili import api
+    from .bilibili.login import QR_EXPIRED, QR_SCANNED, QR_SUCCESS, watch_qr_login
+    from .utils.qr import print_qr_code_terminal
+
+    if await api.check_login_status(account):
+        print(f"账户 {account} 已登录，房间号: {api.get_cached_room_id(account)}")
+        return 0
+
+    qr_data = await api.generate_qr_code(account)
+    print_qr_code_terminal(qr_data.url)
+    print("请使用 B 站手机客户端扫码登录")
+    async for event in watch_qr_login(qr_data.qrcode_key, account):
+        code = event.get("code")
+        if code == QR_SUCCESS:
+            print(f"登录成功，房间号: {event['data']['room_id']}")
+            return 0
+        if code == QR_SCANNED:
+            print("已扫码，请在手机上确认登录")
+        elif code == QR_EXPIRED:
+            print("二维码已失效，请重新运行 login")
+            return 1
+        elif code == -1:
+            print(event.get("message"))
+            return 1
+    return 1
+
+
+async def _start(account: str, area: Optional[str]) -> int:
+    from .bilibili import api
+
+    if area is None:
+        area = (await api.get_room_info(account)).area.id
+    data = await api.start_live(area, account)
+    if data.get("qr"):
+        from .utils.qr import print_qr_code_terminal
+
+        print(data.get("message") or "需要进行人脸验证")
+        print_qr_code_terminal(data["qr"])
+        return 2
+    _print_json(data)
+    return 0
+
+
+async def _stop(account: str) -> int:
+    from .bilibili import api
+
+    await api.stop_live(account)
+    print("停播成功")
+    return 0
+
+
+async def _status(account: str) -> int:
+    from .bilibili import api
+
+    logged_in = await api.check_login_status(account)
+    status = {"account": account, "logged_in": logged_in, "room_id": api.get_cached_room_id(account)}
+    if logged_in:
+        status["room"] = await api.get_room_info(account)
+    _print_json(status)
+    return 0 if logged_in else 1
+
+
+def serve(host: str = "127.0.0.1", port: int = 8000, token: Optional[str] = None):
+    """
+    无界面模式：在主线程直接运行 uvicorn，不启动 pywebview
+    """
+    import uvicorn
+
+    from .app import create_app
+    from .utils.version import VERSION
+
+    token = token or os.environ.get(TOKEN_ENV)
+    if not token and not _is_loopback(host):
+        # 监听非本机地址时必须启用令牌校验
+        token = secrets.token_urlsafe(24)
+        print(f"未指定访问令牌，已自动生成: {token}")
+    if token:
+        # 界面会把地址中的令牌保存下来，之后的请求都会带上
+        print(f"界面地址: http://{host}:{port}/?token={urllib.parse.quote(token, safe='')}")
+    print(f"Running BiliLive-Utility Version: {VERSION} (headless)")
+    uvicorn.run(create_app(token=token), host=host, port=port, log_config=None)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bililive-cli", description="BiliLive Utility 命令行工具")
+    parser.add_argument("--account", default=DEFAULT_ACCOUNT, help="账户标识，默认为 default")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("login", help="在终端中扫码登录")
+
+    start = sub.add_parser("start", help="开播")
+    start.add_argument("--area", help="子分区 ID，默认沿用直播间当前分区")
+
+    sub.add_parser("stop", help="停播")
+    sub.add_parser("status", help="查看登录与直播状态")
+
+    serve_parser = sub.add_parser("serve", help="以无界面模式运行 HTTP 服务")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="监听地址，默认为 127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000, help="监听端口，默认为 8000")
+    serve_parser.add_argument("--token", help=f"访问令牌，也可以通过环境变量 {TOKEN_ENV} 设置")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.host, args.port, args.token)
+        return 0
+
+    commands = {
+        "login": lambda: _login(args.account),
+        "start": lambda: _start(args.account, args.area),
+        "stop": lambda: _stop(args.account),
+        "status": lambda: _status(args.account),
+    }
+    try:
+        return asyncio.run(commands[args.command]())
+    except Exception as e:
+        print(f"执行失败: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,25 @@
 import os
 import sys
 import platformdirs
+from pathlib import Path
 
-dirs = platformdirs.PlatformDirs(
-    appname="BiliLive-Utility",
-    appauthor="GamerNoTitle",
-    version="v2",
-    ensure_exists=True
-)
-SESSION_PATH = dirs.user_cache_path / "session"
-CACHE_PATH = dirs.user_cache_path
-DATA_PATH = dirs.user_data_path
+# 设置 BILILIVE_HOME 后所有缓存与数据都放在该目录下，便于本地调试、压测时与真实数据隔离
+_home = os.environ.get("BILILIVE_HOME")
+if _home:
+    CACHE_PATH = Path(_home) / "cache"
+    DATA_PATH = Path(_home) / "data"
+    CACHE_PATH.mkdir(parents=True, exist_ok=True)
+    DATA_PATH.mkdir(parents=True, exist_ok=True)
+else:
+    dirs = platformdirs.PlatformDirs(
+        appname="BiliLive-Utility",
+        appauthor="GamerNoTitle",
+        version="v2",
+        ensure_exists=True
+    )
+    CACHE_PATH = dirs.user_cache_path
+    DATA_PATH = dirs.user_data_path
+SESSION_PATH = CACHE_PATH / "session"
 
 def get_resource_path() -> str:
     """
@@ -22,5 +31,4 @@ def get_resource_path() -> str:
     else:
         # 开发环境
         base_path = os.path.abspath(".")
-    print(f"Resource base path: {base_path}")
     return base_path
\ No newline at end of file
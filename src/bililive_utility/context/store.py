@@ -0,0 +1,123 @@
+"""
+统一的本地状态存储。
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .path import DATA_PATH
+
+log = logging.getLogger(__name__)
+
+STATE_DB_PATH = DATA_PATH / "state.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID
+"""
+
+
+class StateStore:
+    """
+    基于 SQLite (WAL 模式) 的键值存储，按 (namespace, key) 保存字符串。
+
+    每次写入都是一个独立事务，进程被 os._exit 或崩溃结束时也不会留下写了一半的数据；
+    数据库在第一次读写时才打开。可以在多个线程中使用。
+    """
+
+    def __init__(self, path: Path = STATE_DB_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _open(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: 自动提交，需要多条语句原子执行时使用 transaction()
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL 模式下 NORMAL 足以保证进程崩溃时已提交的事务不丢失
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(_SCHEMA)
+        return conn
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is None:
+                try:
+                    self._conn = self._open()
+                except sqlite3.DatabaseError as e:
+                    # 数据库文件损坏时保留现场并重新创建，只会丢失登录状态等可恢复的数据
+                    backup = self.path.with_name(f"{self.path.name}.corrupt-{int(time.time())}")
+                    log.error(f"状态数据库已损坏 ({e})，已移动到 {backup}")
+                    self.path.replace(backup)
+                    self._conn = self._open()
+            return self._conn
+
+    def get(self, namespace: str, key: str, default: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+            ).fetchone()
+        return row[0] if row else default
+
+    def set(self, namespace: str, key: str, value: str):
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO kv (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                (namespace, key, value, time.time()),
+            )
+
+    def delete(self, namespace: str, key: str) -> bool:
+        with self._lock:
+            cursor = self.conn.execute(
+                "DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+        return cursor.rowcount > 0
+
+    def keys(self, namespace: str) -> List[str]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT key FROM kv WHERE namespace = ? ORDER BY key", (namespace,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def items(self, namespace: str) -> Dict[str, str]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT key, value FROM kv WHERE namespace = ?", (namespace,)
+            ).fetchall()
+        return dict(rows)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """在一个事务中执行多次写入，全部成功或全部回滚"""
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+store = StateStore()
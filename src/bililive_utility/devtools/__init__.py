@@ -0,0 +1,6 @@
+"""
+开发与性能测试工具，不参与正常运行。
+
+- mock_upstream: 本地模拟的 B 站上游接口，支持注入延迟与错误
+- loadtest: 针对 /api/* 路由的并发压测
+"""
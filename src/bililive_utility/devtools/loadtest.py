@@ -0,0 +1,298 @@
+"""
+针对本地 /api/* 路由的并发压测。
+
+在同一进程的两个线程中分别启动模拟上游 (mock_upstream) 与本程序的 HTTP 服务，
+所有数据写入临时目录，不会影响真实账户。先通过模拟的二维码流程登录，
+再按场景并发请求各个接口，输出 p50 / p99 延迟、吞吐量以及实际发往上游的请求数。
+
+    python -m bililive_utility.devtools.loadtest --concurrency 32 --requests 500
+    python -m bililive_utility.devtools.loadtest --output baseline.json
+    python -m bililive_utility.devtools.loadtest --baseline baseline.json --tolerance 0.25
+
+需要在项目根目录运行，以便找到 static 目录。
+"""
+
+import argparse
+import asyncio
+import atexit
+import json
+import logging
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+from .mock_upstream import add_fault_arguments, config_from_args, create_mock_app
+
+LOGIN_TIMEOUT = 10.0
+
+
+@dataclass
+class Scenario:
+    name: str
+    run: Callable[[httpx.AsyncClient, int], Any]  # (客户端, 序号) -> 协程，返回 httpx.Response 或其列表
+
+
+@dataclass
+class Result:
+    name: str
+    requests: int
+    errors: int
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    throughput: float  # 每秒完成的请求数
+    upstream_calls: int
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class ServerThread(threading.Thread):
+    """在后台线程中运行 uvicorn"""
+
+    def __init__(self, app, port: int):
+        import uvicorn
+
+        super().__init__(daemon=True)
+        self.port = port
+        self.server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def run(self):
+        self.server.run()
+
+    def start_and_wait(self, timeout: float = 10.0):
+        self.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.is_alive():
+                raise RuntimeError(f"服务启动失败 (端口 {self.port})")
+            time.sleep(0.01)
+
+    def stop(self):
+        self.server.should_exit = True
+        self.join(timeout=5)
+
+
+def _ok(response: httpx.Response) -> bool:
+    return response.status_code < 400
+
+
+async def _start_stop(client: httpx.AsyncClient, i: int) -> List[httpx.Response]:
+    start = await client.post("/api/live/start", json={"area": 235})
+    stop = await client.post("/api/live/stop")
+    return [start, stop]
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario("bootstrap", lambda c, i: c.get("/api/bootstrap")),
+        Scenario("auth.check_login", lambda c, i: c.get("/api/auth/check_login")),
+        Scenario("application.info", lambda c, i: c.get("/api/application/info")),
+        Scenario("room.info", lambda c, i: c.get("/api/room/info")),
+        Scenario("room.areas", lambda c, i: c.get("/api/room/areas")),
+        Scenario("room.update", lambda c, i: c.post("/api/room/info", json={"title": f"压测标题 {i}"})),
+        Scenario("live.start_stop", _start_stop),
+    ]
+}
+
+
+async def login(client: httpx.AsyncClient):
+    """走一遍模拟的二维码登录流程"""
+    resp = await client.get("/api/auth/getcode")
+    resp.raise_for_status()
+    key = resp.json()["data"]["qrcode_key"]
+    deadline = time.monotonic() + LOGIN_TIMEOUT
+    while time.monotonic() < deadline:
+        resp = await client.get("/api/auth/poll", params={"qrcode_key": key})
+        resp.raise_for_status()
+        if resp.json()["data"]["code"] == 0:
+            return
+        await asyncio.sleep(0.05)
+    raise RuntimeError("模拟登录超时")
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    mock: httpx.AsyncClient,
+    scenario: Scenario,
+    total: int,
+    concurrency: int,
+) -> Result:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+    await mock.post("/__mock/reset")
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                responses = await scenario.run(client, i)
+                if isinstance(responses, httpx.Response):
+                    responses = [responses]
+                if not all(_ok(r) for r in responses):
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    stats = (await mock.get("/__mock/stats")).json()
+    latencies.sort()
+    return Result(
+        name=scenario.name,
+        requests=len(latencies),
+        errors=errors,
+        p50_ms=round(_percentile(latencies, 0.50), 2),
+        p90_ms=round(_percentile(latencies, 0.90), 2),
+        p99_ms=round(_percentile(latencies, 0.99), 2),
+        max_ms=round(latencies[-1] if latencies else 0.0, 2),
+        throughput=round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        upstream_calls=sum(stats["calls"].values()),
+    )
+
+
+def print_results(results: List[Result]):
+    header = f"{'scenario':<20} {'reqs':>6} {'errors':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'req/s':>9} {'upstream':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.name:<20} {r.requests:>6} {r.errors:>6} {r.p50_ms:>9.2f} {r.p90_ms:>9.2f} "
+            f"{r.p99_ms:>9.2f} {r.max_ms:>9.2f} {r.throughput:>9.1f} {r.upstream_calls:>9}"
+        )
+
+
+def compare_baseline(results: List[Result], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """与基线对比，返回 p99 或吞吐量退化超过容忍度的场景说明"""
+    regressions = []
+    previous = {item["name"]: item for item in baseline.get("results", [])}
+    for r in results:
+        old = previous.get(r.name)
+        if old is None:
+            continue
+        if old["p99_ms"] and r.p99_ms > old["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{r.name}: p99 {old['p99_ms']:.2f} → {r.p99_ms:.2f} ms")
+        if old["throughput"] and r.throughput < old["throughput"] * (1 - tolerance):
+            regressions.append(f"{r.name}: 吞吐量 {old['throughput']:.1f} → {r.throughput:.1f} req/s")
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="针对 /api/* 路由的并发压测")
+    add_fault_arguments(parser)
+    parser.add_argument("--concurrency", type=int, default=16, help="并发数")
+    parser.add_argument("--requests", type=int, default=200, help="每个场景的请求总数")
+    parser.add_argument(
+        "--scenario", action="append", choices=list(SCENARIOS), help="只运行指定场景，可重复指定"
+    )
+    parser.add_argument(
+        "--respect-rate-limits",
+        action="store_true",
+        help="保留调度器的真实限流参数；默认放开限流，只测量本程序自身的开销",
+    )
+    parser.add_argument("--output", help="将结果写入 JSON 文件")
+    parser.add_argument("--baseline", help="与之前保存的结果对比")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="允许的退化比例，默认 0.25")
+    return parser
+
+
+async def _run(args, app_url: str, mock_url: str) -> List[Result]:
+    names = args.scenario or list(SCENARIOS)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=app_url, limits=limits, timeout=30) as client, httpx.AsyncClient(
+        base_url=mock_url
+    ) as mock:
+        await login(client)
+        results = []
+        for name in names:
+            results.append(
+                await run_scenario(client, mock, SCENARIOS[name], args.requests, args.concurrency)
+            )
+        return results
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    mock_server = ServerThread(create_mock_app(config_from_args(args)), _free_port())
+    mock_server.start_and_wait()
+
+    # 必须在导入本程序之前设置，数据目录与上游地址都在导入时确定
+    home = tempfile.mkdtemp(prefix="bililive-loadtest-")
+    # 先于本程序注册，退出时会在保存会话之后才删除
+    atexit.register(shutil.rmtree, home, ignore_errors=True)
+    os.environ["BILILIVE_HOME"] = home
+    os.environ["BILILIVE_UPSTREAM"] = mock_server.url
+
+    from ..app import create_app
+    from ..bilibili.scheduler import scheduler
+
+    # 每个请求一条的访问日志会明显拖慢压测
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if not args.respect_rate_limits:
+        scheduler.limits = {host: (1e6, 1e6) for host in scheduler.limits}
+
+    app_server = ServerThread(create_app(), _free_port())
+    app_server.start_and_wait()
+
+    try:
+        results = asyncio.run(_run(args, app_server.url, mock_server.url))
+    finally:
+        app_server.stop()
+        mock_server.stop()
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"concurrency": args.concurrency, "results": [asdict(r) for r in results]},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_baseline(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\n性能退化:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
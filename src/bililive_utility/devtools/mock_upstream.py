@@ -0,0 +1,597 @@
+"""
+本地模拟的 B 站上游接口。
+
+实现了本程序用到的全部上游接口，返回结构与真实接口一致，并可注入延迟与错误。
+配合环境变量 BILILIVE_UPSTREAM 使用，即可在完全离线的情况下运行本程序：
+
+    python -m bililive_utility.devtools.mock_upstream --port 9000 --latency-ms 50
+    BILILIVE_UPSTREAM=http://127.0.0.1:9000 bililive-cli serve
+
+运行时可以通过 PUT /__mock/faults 修改故障注入配置，GET /__mock/stats 查看各接口的调用次数。
+
+弹幕长连接 (/sub) 会以 --danmaku-rate 指定的速率推送合成的弹幕、礼物等消息，
+也可以用 --danmaku-replay 回放事先录制的消息 (每行一条 JSON 消息，循环回放)。
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import secrets
+import time
+import urllib.parse
+import zlib
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+
+from ..bilibili.core import get_mixin_key, wbi_sign
+from ..bilibili.records import BEIJING_TZ
+from ..bilibili.packet import (
+    OP_AUTH,
+    OP_AUTH_REPLY,
+    OP_HEARTBEAT,
+    OP_HEARTBEAT_REPLY,
+    OP_MESSAGE,
+    PROTO_BROTLI,
+    PROTO_JSON,
+    PROTO_ZLIB,
+    brotli,
+    encode_packet,
+    iter_packets,
+)
+
+COOKIE_DOMAIN = ".bilibili.com"
+MOCK_MID = "10001"
+MOCK_ROOM_ID = 20001
+MOCK_BUILD = 9000
+MOCK_WBI_IMG = "https://i0.hdslb.com/bfs/wbi/7cd084941338484aae1ad9425b84077c.png"
+MOCK_WBI_SUB = "https://i0.hdslb.com/bfs/wbi/4932caff0ff746eab6f01bf08b70ac45.png"
+DANMAKU_BATCH_INTERVAL = 0.1  # 每隔多少秒推送一批弹幕
+DANMAKU_MAX_BATCH = 1000  # 单个帧中最多包含的消息数
+
+
+@dataclass
+class Fault:
+    """单个接口的故障注入配置"""
+
+    latency_ms: float = 0.0  # 固定延迟
+    jitter_ms: float = 0.0  # 在固定延迟基础上增加 [0, jitter] 的随机延迟
+    error_rate: float = 0.0  # 返回错误的概率
+    error_status: int = 500  # 错误时的 HTTP 状态码，为 200 时返回业务码 -509 (请求过于频繁)
+
+
+@dataclass
+class MockConfig:
+    default: Fault = field(default_factory=Fault)
+    endpoints: Dict[str, Fault] = field(default_factory=dict)  # 按路径覆盖
+    scan_after: int = 1  # 轮询多少次后视为已扫码并确认
+    seed: Optional[int] = None
+    danmaku_rate: float = 50.0  # 每秒推送的弹幕消息数
+    danmaku_replay: Optional[str] = None  # 回放的消息文件，每行一条 JSON 消息
+
+    def fault_for(self, path: str) -> Fault:
+        return self.endpoints.get(path, self.default)
+
+
+def _beijing_now() -> str:
+    return datetime.now(BEIJING_TZ).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _area_list() -> List[Dict[str, Any]]:
+    parents = [
+        (2, "网游", [86, 88, 89, 92, 102]),
+        (3, "手游", [35, 36, 37, 40, 163]),
+        (6, "单机游戏", [235, 236, 237, 238, 245]),
+        (9, "虚拟主播", [371, 372, 373]),
+    ]
+    return [
+        {
+            "id": parent_id,
+            "name": name,
+            "list": [
+                {
+                    "id": str(sub_id),
+                    "parent_id": str(parent_id),
+                    "old_area_id": "0",
+                    "name": f"{name}-{sub_id}",
+                    "act_id": "0",
+                    "pk_status": "0",
+                    "hot_status": 0,
+                    "lock_status": "0",
+                    "pic": "",
+                    "parent_name": name,
+                    "area_type": 0,
+                }
+                for sub_id in subs
+            ],
+        }
+        for parent_id, name, subs in parents
+    ]
+
+
+class MockUpstream:
+    """模拟上游的状态：一个用户、一个直播间，以及进行中的二维码登录"""
+
+    def __init__(self, config: Optional[MockConfig] = None):
+        self.config = config or MockConfig()
+        self.random = random.Random(self.config.seed)
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.sessions: Dict[str, str] = {}  # SESSDATA -> bili_jct
+        self.qr_polls: Dict[str, int] = {}
+        self.areas = _area_list()
+        self.danmu_token = secrets.token_urlsafe(16)
+        self.danmaku_sent = 0
+        self.last_start_build: Optional[str] = None  # 最近一次开播请求携带的构建号
+        self.room = {
+            "room_id": MOCK_ROOM_ID,
+            "uid": int(MOCK_MID),
+            "title": "模拟直播间",
+            "tags": "模拟,测试",
+            "live_status": 0,
+            "parent_area_id": 6,
+            "area_id": 235,
+            "online": 0,
+            "attention": 1234,
+            "live_time": "0000-00-00 00:00:00",
+        }
+
+    # --- 工具 ---
+
+    def _ok(self, data: Any = None, message: str = "0") -> Dict[str, Any]:
+        return {"code": 0, "message": message, "ttl": 1, "data": data if data is not None else {}}
+
+    def _error(self, code: int, message: str) -> Dict[str, Any]:
+        return {"code": code, "message": message, "ttl": 1, "data": {}}
+
+    def _csrf_error(self, request: Request, form: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        csrf = self.sessions.get(request.cookies.get("SESSDATA", ""))
+        if csrf is None:
+            return self._error(-101, "账号未登录")
+        if form.get("csrf") != csrf:
+            return self._error(-111, "csrf 校验失败")
+        return None
+
+    async def _form(self, request: Request) -> Dict[str, str]:
+        body = (await request.body()).decode()
+        return {k: v[-1] for k, v in urllib.parse.parse_qs(body).items()}
+
+    async def inject(self, path: str) -> Optional[JSONResponse]:
+        """按配置注入延迟与错误，需要返回错误时返回对应的响应"""
+        fault = self.config.fault_for(path)
+        delay = fault.latency_ms + self.random.uniform(0, fault.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if fault.error_rate and self.random.random() < fault.error_rate:
+            self.errors[path] += 1
+            if fault.error_status == 200:
+                return JSONResponse(self._error(-509, "请求过于频繁，请稍后再试"))
+            return JSONResponse(
+                self._error(-500, "服务器错误"), status_code=fault.error_status
+            )
+        return None
+
+    # --- 登录 ---
+
+    async def qrcode_generate(self, request: Request):
+        key = secrets.token_hex(16)
+        self.qr_polls[key] = 0
+        return self._ok(
+            {
+                "url": f"https://passport.bilibili.com/h5-app/passport/login/scan?qrcode_key={key}",
+                "qrcode_key": key,
+            }
+        )
+
+    async def qrcode_poll(self, request: Request):
+        key = request.query_params.get("qrcode_key", "")
+        if key not in self.qr_polls:
+            return self._ok({"url": "", "refresh_token": "", "timestamp": 0, "code": 86038, "message": "二维码已失效"})
+        self.qr_polls[key] += 1
+        polls = self.qr_polls[key]
+        if polls <= self.config.scan_after:
+            code, message = (86101, "未扫码") if polls < self.config.scan_after else (86090, "二维码已扫码未确认")
+            return self._ok({"url": "", "refresh_token": "", "timestamp": 0, "code": code, "message": message})
+
+        del self.qr_polls[key]
+        sessdata = secrets.token_hex(16)
+        csrf = secrets.token_hex(16)
+        self.sessions[sessdata] = csrf
+        response = JSONResponse(
+            self._ok(
+                {
+                    "url": "https://passport.biligame.com/x/passport-login/web/crossDomain",
+                    "refresh_token": secrets.token_hex(16),
+                    "timestamp": int(time.time() * 1000),
+                    "code": 0,
+                    "message": "",
+                }
+            )
+        )
+        cookies = {
+            "SESSDATA": sessdata,
+            "bili_jct": csrf,
+            "DedeUserID": MOCK_MID,
+            "DedeUserID__ckMd5": secrets.token_hex(8),
+        }
+        for name, value in cookies.items():
+            response.set_cookie(name, value, domain=COOKIE_DOMAIN, path="/")
+        return response
+
+    async def logout(self, request: Request):
+        form = await self._form(request)
+        sessdata = request.cookies.get("SESSDATA", "")
+        if self.sessions.get(sessdata) != form.get("biliCSRF"):
+            return JSONResponse(self._error(2202, "csrf 请求非法"))
+        del self.sessions[sessdata]
+        response = JSONResponse(self._ok({"redirectUrl": form.get("gourl", "")}))
+        for name in ("SESSDATA", "bili_jct", "DedeUserID", "DedeUserID__ckMd5"):
+            response.delete_cookie(name, domain=COOKIE_DOMAIN, path="/")
+        return response
+
+    async def nav(self, request: Request):
+        wbi_img = {"img_url": MOCK_WBI_IMG, "sub_url": MOCK_WBI_SUB}
+        if request.cookies.get("SESSDATA", "") not in self.sessions:
+            return {"code": -101, "message": "账号未登录", "ttl": 1, "data": {"isLogin": False, "wbi_img": wbi_img}}
+        return self._ok({"isLogin": True, "mid": int(MOCK_MID), "uname": "模拟用户", "wbi_img": wbi_img})
+
+    # --- 直播间 ---
+
+    async def room_info_old(self, request: Request):
+        if request.query_params.get("mid") != MOCK_MID:
+            return self._ok({"roomStatus": 0, "roomid": 0})
+        return self._ok(
+            {
+                "roomStatus": 1,
+                "roundStatus": 0,
+                "liveStatus": self.room["live_status"],
+                "url": f"https://live.bilibili.com/{MOCK_ROOM_ID}",
+                "title": self.room["title"],
+                "roomid": MOCK_ROOM_ID,
+            }
+        )
+
+    async def room_get_info(self, request: Request):
+        if request.query_params.get("room_id") != str(MOCK_ROOM_ID):
+            return self._error(1, "未找到该房间")
+        if self.room["live_status"] == 1:
+            # 直播中人气与关注数随机波动
+            self.room["online"] = max(0, self.room["online"] + self.random.randint(-50, 60))
+            self.room["attention"] += self.random.randint(0, 2)
+        return self._ok(dict(self.room))
+
+    async def area_list(self, request: Request):
+        return self._ok(self.areas, message="success")
+
+    async def room_update(self, request: Request):
+        form = await self._form(request)
+        error = self._csrf_error(request, form)
+        if error:
+            return error
+        tags = [tag for tag in self.room["tags"].split(",") if tag]
+        if "title" in form:
+            self.room["title"] = form["title"]
+        if "area_id" in form:
+            self.room["area_id"] = int(form["area_id"])
+        if "add_tag" in form and form["add_tag"] not in tags:
+            tags.append(form["add_tag"])
+        if "del_tag" in form and form["del_tag"] in tags:
+            tags.remove(form["del_tag"])
+        self.room["tags"] = ",".join(tags)
+        return self._ok({"sub_session_key": "", "audit_info": None})
+
+    async def start_live(self, request: Request):
+        form = await self._form(request)
+        error = self._csrf_error(request, form)
+        if error:
+            return error
+        self.last_start_build = form.get("build")
+        area = int(form.get("area_v2", self.room["area_id"]))
+        parent = next(
+            (p["id"] for p in self.areas for sub in p["list"] if int(sub["id"]) == area), None
+        )
+        if parent is None:
+            return self._error(60009, "分区不存在")
+        change = 0 if self.room["live_status"] == 1 else 1
+        self.room.update(live_status=1, area_id=area, parent_area_id=parent)
+        if change:
+            self.room.update(online=self.random.randint(100, 1000), live_time=_beijing_now())
+        return self._ok(
+            {
+                "change": change,
+                "status": "LIVE",
+                "room_type": 0,
+                "rtmp": {
+                    "addr": "rtmp://127.0.0.1/live-bvc/",
+                    "code": f"?streamname=live_{MOCK_MID}_{secrets.token_hex(4)}&key=mock",
+                    "new_link": "",
+                    "provider": "txy",
+                },
+                "protocols": [],
+                "try_time": "0000-00-00 00:00:00",
+                "live_key": secrets.token_hex(8),
+                "sub_session_key": "",
+                "notice": {"type": 1, "status": 0, "title": "", "msg": "", "button_text": "", "button_url": ""},
+                "qr": "",
+                "need_face_auth": False,
+                "service_source": "",
+                "rtmp_backup": None,
+            }
+        )
+
+    async def stop_live(self, request: Request):
+        form = await self._form(request)
+        error = self._csrf_error(request, form)
+        if error:
+            return error
+        change = 1 if self.room["live_status"] == 1 else 0
+        self.room.update(live_status=0, online=0, live_time="0000-00-00 00:00:00")
+        return self._ok({"change": change, "status": "PREPARING"})
+
+    async def live_version(self, request: Request):
+        return self._ok({"curr_version": "7.19.0.9000", "build": MOCK_BUILD, "instruction": "", "file_size": "0", "file_md5": "", "content": "", "download_url": ""})
+
+    # --- 弹幕 ---
+
+    async def danmu_info(self, request: Request):
+        params = dict(request.query_params)
+        w_rid = params.pop("w_rid", None)
+        wts = params.pop("wts", None)
+        mixin_key = get_mixin_key(MOCK_WBI_IMG[-36:-4], MOCK_WBI_SUB[-36:-4])
+        if not wts or wbi_sign(params, mixin_key, ts=int(wts))["w_rid"] != w_rid:
+            return self._error(-352, "风控校验失败")
+        if params.get("id") != str(MOCK_ROOM_ID):
+            return self._error(1, "未找到该房间")
+        return self._ok(
+            {
+                "group": "live",
+                "business_id": 0,
+                "refresh_row_factor": 0.125,
+                "refresh_rate": 100,
+                "max_delay": 5000,
+                "token": self.danmu_token,
+                "host_list": [
+                    {"host": "broadcastlv.chat.bilibili.com", "port": 2243, "wss_port": 443, "ws_port": 2244}
+                ],
+            }
+        )
+
+    def _danmaku_messages(self) -> Iterator[Dict[str, Any]]:
+        if self.config.danmaku_replay:
+            with open(self.config.danmaku_replay, encoding="utf-8") as f:
+                recorded = [json.loads(line) for line in f if line.strip()]
+            yield from itertools.cycle(recorded)
+            return
+        for n in itertools.count(1):
+            uid = self.random.randint(1, 1_000_000)
+            uname = f"观众{uid}"
+            roll = self.random.random()
+            if roll < 0.8:
+                yield {
+                    "cmd": "DANMU_MSG",
+                    "info": [
+                        [0, 1, 25, 16777215, int(time.time() * 1000), 0, 0, "", 0, 0, 0, "", 0, "{}", "{}"],
+                        f"模拟弹幕 {n}",
+                        [uid, uname, 0, 0, 0, 10000, 1, ""],
+                        [],
+                        [0, 0, 9868950, ">50000", 0],
+                        ["", ""],
+                        0,
+                        0,
+                    ],
+                }
+            elif roll < 0.9:
+                yield {"cmd": "INTERACT_WORD", "data": {"uid": uid, "uname": uname, "msg_type": 1, "roomid": MOCK_ROOM_ID}}
+            elif roll < 0.97:
+                yield {
+                    "cmd": "SEND_GIFT",
+                    "data": {"uid": uid, "uname": uname, "giftName": "辣条", "num": 1, "coin_type": "silver", "total_coin": 100},
+                }
+            elif roll < 0.99:
+                yield {
+                    "cmd": "SUPER_CHAT_MESSAGE",
+                    "data": {"uid": uid, "user_info": {"uname": uname}, "message": f"模拟醒目留言 {n}", "price": 30},
+                }
+            else:
+                yield {"cmd": "WATCHED_CHANGE", "data": {"num": n, "text_small": str(n), "text_large": f"{n}人看过"}}
+
+    def _danmaku_frame(self, messages: List[Dict[str, Any]], protover: int) -> bytes:
+        raw = b"".join(
+            encode_packet(OP_MESSAGE, json.dumps(msg, ensure_ascii=False).encode(), PROTO_JSON)
+            for msg in messages
+        )
+        body = brotli.compress(raw) if protover == PROTO_BROTLI else zlib.compress(raw)
+        return encode_packet(OP_MESSAGE, body, protover)
+
+    async def _pump_danmaku(self, websocket: WebSocket, protover: int):
+        """按设定速率推送弹幕；客户端读取不及时时 send 会阻塞，积压的消息在下一批中补发"""
+        messages = self._danmaku_messages()
+        started = time.monotonic()
+        sent = 0
+        while True:
+            await asyncio.sleep(DANMAKU_BATCH_INTERVAL)
+            due = int((time.monotonic() - started) * self.config.danmaku_rate) - sent
+            count = min(due, DANMAKU_MAX_BATCH)
+            if count <= 0:
+                continue
+            batch = list(itertools.islice(messages, count))
+            await websocket.send_bytes(self._danmaku_frame(batch, protover))
+            sent += count
+            self.danmaku_sent += count
+
+    async def danmaku_socket(self, websocket: WebSocket):
+        self.calls["/sub"] += 1
+        await websocket.accept()
+        try:
+            packet = next(iter_packets(await websocket.receive_bytes()), None)
+            auth = json.loads(packet.body) if packet is not None and packet.op == OP_AUTH else {}
+            if auth.get("key") != self.danmu_token or auth.get("roomid") != MOCK_ROOM_ID:
+                await websocket.send_bytes(encode_packet(OP_AUTH_REPLY, b'{"code":-101}'))
+                await websocket.close()
+                return
+            await websocket.send_bytes(encode_packet(OP_AUTH_REPLY, b'{"code":0}'))
+
+            protover = PROTO_BROTLI if auth.get("protover") == PROTO_BROTLI and brotli is not None else PROTO_ZLIB
+            pump = asyncio.create_task(self._pump_danmaku(websocket, protover))
+            try:
+                while True:
+                    for packet in iter_packets(await websocket.receive_bytes()):
+                        if packet.op == OP_HEARTBEAT:
+                            popularity = len(self.sessions).to_bytes(4, "big")
+                            await websocket.send_bytes(encode_packet(OP_HEARTBEAT_REPLY, popularity))
+            finally:
+                pump.cancel()
+        except WebSocketDisconnect:
+            pass
+
+    # --- 管理接口 ---
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": dict(self.calls),
+            "errors": dict(self.errors),
+            "danmaku_sent": self.danmaku_sent,
+            "last_start_build": self.last_start_build,
+        }
+
+
+ROUTES = {
+    ("GET", "/x/passport-login/web/qrcode/generate"): "qrcode_generate",
+    ("GET", "/x/passport-login/web/qrcode/poll"): "qrcode_poll",
+    ("POST", "/login/exit/v2"): "logout",
+    ("GET", "/x/web-interface/nav"): "nav",
+    ("GET", "/room/v1/Room/getRoomInfoOld"): "room_info_old",
+    ("GET", "/room/v1/Room/get_info"): "room_get_info",
+    ("GET", "/room/v1/Area/getList"): "area_list",
+    ("POST", "/room/v1/Room/update"): "room_update",
+    ("POST", "/room/v1/Room/startLive"): "start_live",
+    ("POST", "/room/v1/Room/stopLive"): "stop_live",
+    ("GET", "/xlive/app-blink/v1/liveVersionInfo/getHomePageLiveVersion"): "live_version",
+    ("GET", "/xlive/web-room/v1/index/getDanmuInfo"): "danmu_info",
+}
+
+
+def create_mock_app(config: Optional[MockConfig] = None) -> FastAPI:
+    """创建模拟上游的 FastAPI 应用，状态保存在 app.state.upstream 中"""
+    upstream = MockUpstream(config)
+    app = FastAPI(title="BiliLive Utility Mock Upstream", docs_url=None, redoc_url=None)
+    app.state.upstream = upstream
+
+    def make_endpoint(name: str, path: str):
+        handler = getattr(upstream, name)
+
+        async def endpoint(request: Request):
+            upstream.calls[path] += 1
+            error = await upstream.inject(path)
+            if error is not None:
+                return error
+            return await handler(request)
+
+        endpoint.__name__ = name
+        return endpoint
+
+    for (method, path), name in ROUTES.items():
+        app.add_api_route(path, make_endpoint(name, path), methods=[method])
+    app.add_api_websocket_route("/sub", upstream.danmaku_socket)
+
+    @app.get("/__mock/stats")
+    async def mock_stats():
+        return upstream.stats()
+
+    @app.post("/__mock/reset")
+    async def mock_reset():
+        upstream.calls.clear()
+        upstream.errors.clear()
+        upstream.danmaku_sent = 0
+        return {"success": True}
+
+    @app.get("/__mock/faults")
+    async def get_faults():
+        return {
+            "default": asdict(upstream.config.default),
+            "endpoints": {path: asdict(f) for path, f in upstream.config.endpoints.items()},
+        }
+
+    @app.put("/__mock/faults")
+    async def put_faults(request: Request):
+        body = await request.json()
+        if "default" in body:
+            upstream.config.default = Fault(**body["default"])
+        if "endpoints" in body:
+            upstream.config.endpoints = {
+                path: Fault(**fault) for path, fault in body["endpoints"].items()
+            }
+        return await get_faults()
+
+    return app
+
+
+def _parse_fault(value: str) -> tuple[str, Fault]:
+    # 格式: 路径=延迟毫秒[:错误率[:状态码]]
+    path, _, spec = value.partition("=")
+    parts = spec.split(":") if spec else []
+    try:
+        fault = Fault(
+            latency_ms=float(parts[0]) if len(parts) > 0 and parts[0] else 0.0,
+            error_rate=float(parts[1]) if len(parts) > 1 else 0.0,
+            error_status=int(parts[2]) if len(parts) > 2 else 500,
+        )
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的故障配置: {value}")
+    return path, fault
+
+
+def add_fault_arguments(parser: argparse.ArgumentParser):
+    """添加故障注入相关的命令行参数，压测工具也会复用"""
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="每个请求的固定延迟")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="额外的随机延迟上限")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回错误的概率")
+    parser.add_argument("--error-status", type=int, default=500, help="错误时的 HTTP 状态码，200 表示返回业务码 -509")
+    parser.add_argument(
+        "--fault",
+        action="append",
+        type=_parse_fault,
+        default=[],
+        metavar="PATH=LATENCY[:RATE[:STATUS]]",
+        help="按接口路径覆盖故障配置，可重复指定",
+    )
+    parser.add_argument("--scan-after", type=int, default=1, help="二维码轮询多少次后自动确认登录")
+    parser.add_argument("--seed", type=int, help="随机数种子，便于复现")
+    parser.add_argument("--danmaku-rate", type=float, default=50.0, help="弹幕长连接每秒推送的消息数")
+    parser.add_argument("--danmaku-replay", help="回放的弹幕消息文件，每行一条 JSON 消息")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="本地模拟的 B 站上游接口")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    add_fault_arguments(parser)
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        default=Fault(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status),
+        endpoints=dict(args.fault),
+        scan_after=args.scan_after,
+        seed=args.seed,
+        danmaku_rate=args.danmaku_rate,
+        danmaku_replay=args.danmaku_replay,
+    )
+
+
+def main(argv=None):
+    import uvicorn
+
+    args = build_parser().parse_args(argv)
+    uvicorn.run(create_mock_app(config_from_args(args)), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+提供预压缩、常驻内存的静态资源服务。
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # 可选依赖，未安装时只提供 gzip
+    brotli = None
+
+# 只压缩文本类资源，图片等本身已经压缩过
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+# 太小的文件压缩后收益有限
+MIN_COMPRESS_SIZE = 512
+# 带版本号 (?v=<hash>) 的请求内容不会再变化，可以长期缓存
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# 其余资源每次使用前都要用 ETag 向服务端确认
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# index.html 中引用的本地资源，加载时会替换为带版本号的地址
+_LOCAL_REF = re.compile(r'(?P<attr>(?:href|src)=")(?P<path>[^":?#]+\.(?:css|js|ico|png|svg))(?=")')
+
+
+@dataclass
+class Asset:
+    path: str
+    media_type: str
+    digest: str  # 内容哈希，同时用作版本号
+    bodies: Dict[str, bytes] = field(default_factory=dict)  # 编码 -> 内容，"identity" 为原始内容
+
+    def etag(self, encoding: str) -> str:
+        # 强 ETag 需要区分不同编码的表示
+        suffix = "" if encoding == "identity" else f"-{encoding}"
+        return f'"{self.digest}{suffix}"'
+
+
+def _compress(data: bytes) -> Dict[str, bytes]:
+    bodies = {"identity": data}
+    if len(data) < MIN_COMPRESS_SIZE:
+        return bodies
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    if len(gz) < len(data):
+        bodies["gzip"] = gz
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        if len(br) < len(data):
+            bodies["br"] = br
+    return bodies
+
+
+def _parse_accept_encoding(header: str) -> List[str]:
+    """按客户端接受的编码返回可用编码，优先 br，其次 gzip"""
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    order = [enc for enc in ("br", "gzip") if enc in accepted or "*" in accepted]
+    return order + ["identity"]
+
+
+class StaticAssets:
+    """
+    启动时把静态目录一次性读入内存并预先压缩的 ASGI 应用，用于替代 StaticFiles。
+
+    - 按 Accept-Encoding 返回 br / gzip / 原始内容；
+    - 使用强 ETag，If-None-Match 命中时返回 304；
+    - index.html 中引用的本地资源会被改写为 ?v=<哈希>，带正确版本号的请求可以长期缓存。
+
+    修改静态文件后需要重启程序才会生效。
+    """
+
+    def __init__(self, directory: str | os.PathLike, index: str = "index.html"):
+        self.directory = Path(directory)
+        self.index = index
+        self.assets: Dict[str, Asset] = {}
+        self._load()
+
+    def _load(self):
+        raw: Dict[str, bytes] = {}
+        for path in sorted(self.directory.rglob("*")):
+            if path.is_file():
+                raw[path.relative_to(self.directory).as_posix()] = path.read_bytes()
+
+        digests = {name: hashlib.sha256(data).hexdigest()[:16] for name, data in raw.items()}
+        for name, data in raw.items():
+            if name.endswith(".html"):
+                data = self._version_references(name, data, digests)
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if media_type.startswith("text/") or media_type == "application/javascript":
+                media_type += "; charset=utf-8"
+            compressible = media_type.startswith(COMPRESSIBLE_TYPES)
+            self.assets[name] = Asset(
+                path=name,
+                media_type=media_type,
+                digest=hashlib.sha256(data).hexdigest()[:16],
+                bodies=_compress(data) if compressible else {"identity": data},
+            )
+
+    @staticmethod
+    def _version_references(name: str, data: bytes, digests: Dict[str, str]) -> bytes:
+        base = Path(name).parent
+
+        def replace(match: re.Match) -> str:
+            ref = (base / match.group("path")).as_posix()
+            digest = digests.get(ref)
+            if digest is None:
+                return match.group(0)
+            return f'{match.group("attr")}{match.group("path")}?v={digest}'
+
+        return _LOCAL_REF.sub(replace, data.decode("utf-8")).encode("utf-8")
+
+    def _lookup(self, path: str) -> Optional[Asset]:
+        name = path.lstrip("/")
+        if name == "" or name.endswith("/"):
+            name += self.index
+        return self.assets.get(name)
+
+    @staticmethod
+    def _headers(scope) -> Dict[str, str]:
+        return {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1000})
+            return
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await self._send(send, 405, [(b"allow", b"GET, HEAD"), (b"content-type", b"text/plain")], b"Method Not Allowed", method)
+            return
+
+        asset = self._lookup(scope["path"])
+        if asset is None:
+            await self._send(send, 404, [(b"content-type", b"text/plain")], b"Not Found", method)
+            return
+
+        headers = self._headers(scope)
+        encoding = next(
+            enc for enc in _parse_accept_encoding(headers.get("accept-encoding", "")) if enc in asset.bodies
+        )
+        etag = asset.etag(encoding)
+        query = scope.get("query_string", b"").decode("latin-1")
+        versioned = f"v={asset.digest}" in query.split("&")
+        response_headers: List[Tuple[bytes, bytes]] = [
+            (b"etag", etag.encode()),
+            (b"cache-control", (IMMUTABLE_CACHE_CONTROL if versioned else REVALIDATE_CACHE_CONTROL).encode()),
+            (b"vary", b"Accept-Encoding"),
+        ]
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None and (
+            if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+        ):
+            await self._send(send, 304, response_headers, b"", method)
+            return
+
+        body = asset.bodies[encoding]
+        response_headers.append((b"content-type", asset.media_type.encode()))
+        if encoding != "identity":
+            response_headers.append((b"content-encoding", encoding.encode()))
+        await self._send(send, 200, response_headers, body, method)
+
+    @staticmethod
+    async def _send(send, status: int, headers: List[Tuple[bytes, bytes]], body: bytes, method: str):
+        headers = headers + [(b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if method == "HEAD" else body})
@@ -4,10 +4,20 @@ import subprocess
 import re
 import hashlib
 import base64
+import functools
+from typing import Dict, Optional
 
-from Crypto.Cipher import AES
+# 容器格式：MAGIC + 版本号 + salt(16) + nonce(12) + 密文 + tag(16)
+# 旧版格式为 salt(16) + iv(16) + AES-CBC 密文，没有任何头部
+MAGIC = b"BLU"
+VERSION_GCM = 2
+_HEADER = MAGIC + bytes([VERSION_GCM])
 
+_key_cache: Dict[bytes, bytes] = {}
+_current_salt: Optional[bytes] = None
 
+
+@functools.lru_cache(maxsize=1)
 def get_machine_id() -> str:
     """
     获取跨平台硬件唯一标识
@@ -54,41 +64,91 @@ def _derive_key(machine_id: str, salt: bytes) -> bytes:
     )
 
 
+def _get_key(salt: bytes) -> bytes:
+    """
+    按 salt 缓存派生出的密钥，同一个 salt 只运行一次 PBKDF2
+    """
+    key = _key_cache.get(salt)
+    if key is None:
+        key = _derive_key(get_machine_id(), salt)
+        _key_cache[salt] = key
+    return key
+
+
+def _get_current_salt() -> bytes:
+    """
+    进程内复用同一个 salt，加密时无需重复派生密钥
+    """
+    global _current_salt
+    if _current_salt is None:
+        _current_salt = os.urandom(16)
+    return _current_salt
+
+
 def encrypt_data(plaintext: str) -> str:
     """
-    加密数据
+    加密数据 (AES-GCM)
     """
-    machine_id = get_machine_id()
-    salt = os.urandom(16)
-    key = _derive_key(machine_id, salt)
+    from Crypto.Cipher import AES
 
-    plain_bytes = plaintext.encode()
-    pad_len = 16 - len(plain_bytes) % 16
-    plain_bytes += bytes([pad_len] * pad_len)
+    salt = _get_current_salt()
+    key = _get_key(salt)
 
-    iv = os.urandom(16)
-    cipher = AES.new(key, AES.MODE_CBC, iv=iv)
-    ciphertext = cipher.encrypt(plain_bytes)
+    nonce = os.urandom(12)
+    cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+    ciphertext, tag = cipher.encrypt_and_digest(plaintext.encode())
 
-    combined = salt + iv + ciphertext
+    combined = _HEADER + salt + nonce + ciphertext + tag
     return base64.b64encode(combined).decode()
 
 
-def decrypt_data(encrypted: str) -> str:
-    """
-    解密数据
-    """
-    combined = base64.b64decode(encrypted)
+def _decrypt_gcm(combined: bytes) -> str:
+    from Crypto.Cipher import AES
+
+    body = combined[len(_HEADER):]
+    salt = body[:16]
+    nonce = body[16:28]
+    ciphertext = body[28:-16]
+    tag = body[-16:]
+
+    cipher = AES.new(_get_key(salt), AES.MODE_GCM, nonce=nonce)
+    return cipher.decrypt_and_verify(ciphertext, tag).decode()
+
+
+def _decrypt_cbc(combined: bytes) -> str:
+    from Crypto.Cipher import AES
+
     salt = combined[:16]
     iv = combined[16:32]
     ciphertext = combined[32:]
 
-    machine_id = get_machine_id()
-    key = _derive_key(machine_id, salt)
-
-    cipher = AES.new(key, AES.MODE_CBC, iv=iv)
+    cipher = AES.new(_get_key(salt), AES.MODE_CBC, iv=iv)
     plain_bytes = cipher.decrypt(ciphertext)
 
     pad_len = plain_bytes[-1]
     plain_bytes = plain_bytes[:-pad_len]
     return plain_bytes.decode()
+
+
+def decrypt_data(encrypted: str) -> str:
+    """
+    解密数据，兼容旧版 AES-CBC 格式
+    """
+    global _current_salt
+    combined = base64.b64decode(encrypted)
+    plain = None
+    if combined.startswith(_HEADER):
+        try:
+            plain = _decrypt_gcm(combined)
+            salt = combined[len(_HEADER):len(_HEADER) + 16]
+        except ValueError:
+            # 旧版数据的随机 salt 恰好以头部开头时校验会失败，交给 CBC 处理
+            pass
+    if plain is None:
+        plain = _decrypt_cbc(combined)
+        salt = combined[:16]
+
+    # 后续加密沿用已派生过密钥的 salt，保存会话时无需再次运行 PBKDF2
+    if _current_salt is None:
+        _current_salt = salt
+    return plain
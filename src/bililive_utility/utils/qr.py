@@ -1,9 +1,10 @@
-import qrcode
 import io
 import base64
 
 def generate_qr_code_image(url):
     """生成二维码图片并返回 base64 数据"""
+    import qrcode
+
     qr = qrcode.QRCode(
         version=1,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
@@ -20,5 +21,18 @@ def generate_qr_code_image(url):
     img_base64 = base64.b64encode(buffered.getvalue()).decode("utf-8")
     return img_base64
 
+def print_qr_code_terminal(url):
+    """在终端中以字符画形式输出二维码"""
+    import qrcode
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        border=2,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+    qr.print_ascii(invert=True)
+
 if __name__ == "__main__":
     print(generate_qr_code_image("https://example.com"))
\ No newline at end of file
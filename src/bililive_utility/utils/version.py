@@ -1,27 +1,48 @@
 from datetime import datetime, timezone
+from pathlib import Path
 from pydantic import BaseModel
 
+from .path import search_path
+
 BUILD_TIME = "__BUILD_TIME__"
 
-def get_git_short_hash_from_library() -> str | None:
+def _resolve_git_dir(dot_git: Path) -> Path:
+    # worktree / submodule 中的 .git 是一个写有 "gitdir: <路径>" 的文件
+    if dot_git.is_file():
+        content = dot_git.read_text(encoding="utf-8").strip()
+        if content.startswith("gitdir:"):
+            return (dot_git.parent / content[len("gitdir:"):].strip()).resolve()
+    return dot_git
+
+def get_git_short_hash() -> str | None:
     """
-    使用 GitPython 库获取当前 Git 仓库的短哈希值。
+    直接读取 .git/HEAD 获取当前提交的短哈希值，避免在启动时导入 GitPython。
 
     Returns:
         str: 短哈希值，如果失败则返回 None。
     """
     try:
-        import git
-        repo = git.Repo(search_parent_directories=True)
-        
-        head_commit = repo.head.commit
-
-        return "dev-" + head_commit.hexsha[:7] 
-    except ImportError:
-        return None
-    except git.InvalidGitRepositoryError:
-        return None
-    except Exception as e:
+        git_dir = _resolve_git_dir(search_path(Path.cwd(), ".git"))
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        if not head.startswith("ref:"):
+            sha = head
+        else:
+            ref = head[len("ref:"):].strip()
+            ref_path = git_dir / ref
+            if ref_path.is_file():
+                sha = ref_path.read_text(encoding="utf-8").strip()
+            else:
+                sha = None
+                # git gc 之后分支可能只存在于 packed-refs
+                for line in (git_dir / "packed-refs").read_text(encoding="utf-8").splitlines():
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == ref:
+                        sha = parts[0]
+                        break
+        if not sha or len(sha) < 7:
+            return None
+        return "dev-" + sha[:7]
+    except (OSError, UnicodeDecodeError):
         return None
 
 class Version(BaseModel):
@@ -32,6 +53,6 @@ class Version(BaseModel):
     build: str
 
 VERSION = Version(
-    version=get_git_short_hash_from_library() or "__version__",
+    version=get_git_short_hash() or "__version__",
     build=BUILD_TIME if BUILD_TIME != "__BUILD_TIME__" else "dev-" + str(datetime.now(timezone.utc).isoformat())
-)
\ No newline at end of file
+)
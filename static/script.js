@@ -1,6 +1,39 @@
+// 以远程模式运行时接口需要访问令牌：通过 ?token= 打开页面后，令牌保存在 sessionStorage 中并从地址栏移除
+const ACCESS_TOKEN = (() => {
+    const params = new URLSearchParams(location.search)
+    const token = params.get("token")
+    if (token) {
+        sessionStorage.setItem("bililive-token", token)
+        params.delete("token")
+        const query = params.toString()
+        history.replaceState(null, "", location.pathname + (query ? `?${query}` : "") + location.hash)
+    }
+    return sessionStorage.getItem("bililive-token")
+})()
+
+if (ACCESS_TOKEN) {
+    // 只给本程序的接口带上令牌，不发送给 GitHub 等外部地址
+    const nativeFetch = window.fetch.bind(window)
+    window.fetch = (input, init = {}) => {
+        const url = typeof input === "string" ? input : input.url
+        if (!url.startsWith("/") || url.startsWith("//")) return nativeFetch(input, init)
+        const headers = new Headers(init.headers || (typeof input === "string" ? {} : input.headers))
+        headers.set("Authorization", `Bearer ${ACCESS_TOKEN}`)
+        return nativeFetch(input, { ...init, headers })
+    }
+}
+
+// EventSource 无法自定义请求头，改用查询参数传递令牌
+function withToken(url) {
+    if (!ACCESS_TOKEN) return url
+    return `${url}${url.includes("?") ? "&" : "?"}token=${encodeURIComponent(ACCESS_TOKEN)}`
+}
+
 class BiliLiveUtility {
     constructor() {
         this.qrTimer = null
+        this.qrStream = null
+        this.liveStream = null
         this.countdownTimer = null
         this.countdownSeconds = 180
         this.isLive = false
@@ -13,8 +46,59 @@ class BiliLiveUtility {
 
     init() {
         this.bindEvents()
-        this.checkFirstVisit()
-        this.loadAreas()
+        this.bootstrap()
+    }
+
+    async bootstrap() {
+        // 一次请求获取初始化所需的全部状态，服务端并发获取各部分
+        let data
+        try {
+            const response = await fetch("/api/bootstrap")
+            if (!response.ok) throw new Error(`HTTP ${response.status}`)
+            data = await response.json().then(data => data.data)
+        } catch (error) {
+            console.error("初始化失败，改为逐项加载:", error)
+            this.checkFirstVisit()
+            this.loadAreas()
+            return
+        }
+
+        if (data.areas.data) {
+            this.setAreas(data.areas.data)
+        } else {
+            console.error("加载分区失败:", data.areas.error)
+        }
+        const room = data.room.data
+        this.setLiveState(room ? room.live_status === 1 : false)
+        this.showApplicationInfo(data.application)
+
+        if (!data.application.first_access) {
+            document.getElementById("disclaimerModal").style.display = "flex"
+        } else if (data.logged_in && data.credentials.data) {
+            this.showLoggedIn(data.credentials.data)
+            if (room) {
+                this.populateRoomData({ data: room })
+            } else {
+                console.error("获取直播间信息失败:", data.room.error)
+            }
+        } else {
+            this.showLoginPage()
+        }
+    }
+
+    setLiveState(isLive) {
+        this.isLive = isLive
+        if (this.isLive) {
+            const button = document.getElementById("liveToggle")
+            button.innerHTML = '<i class="fas fa-stop"></i> 停播'
+            button.classList.add("stop")
+        }
+    }
+
+    showApplicationInfo(application) {
+        document.getElementById("version").textContent = application.version
+        document.getElementById("meta-version").textContent = application.version
+        document.getElementById("meta-build").textContent = application.build
     }
 
     // Toast 相关方法
@@ -122,26 +206,17 @@ class BiliLiveUtility {
         // 检查是否是首次访问以及初始化
         var firstAccess = true
         const data = await (await fetch("/api/application/info")).json().then(data => data.data)
-        this.isLive = data.account.is_live || false
-        if (this.isLive) {
-            const button = document.getElementById("liveToggle")
-            button.innerHTML = '<i class="fas fa-stop"></i> 停播'
-            button.classList.add("stop")
-        }
+        this.setLiveState(data.account.is_live || false)
         if (data.application.first_access === undefined) {
         } else {
             firstAccess = data.application.first_access
         }
-        const version = data.application.version
-        const build = data.application.build
         if (!firstAccess) {
             document.getElementById("disclaimerModal").style.display = "flex"
         } else {
             this.checkLoginStatus()
         }
-        document.getElementById("version").textContent = version
-        document.getElementById("meta-version").textContent = version
-        document.getElementById("meta-build").textContent = build
+        this.showApplicationInfo(data.application)
     }
 
     async acceptDisclaimer() {
@@ -161,23 +236,26 @@ class BiliLiveUtility {
         const isLoggedIn = await (await fetch("/api/auth/check_login")).json().then(data => data.success)
 
         if (isLoggedIn) {
-            // 已登录，显示主页面
-            this.showMainPage()
-            document.getElementById("liveToggle").classList.remove("hidden")
-            // 填充直播间号和 Cookies
             const credentials = await (await fetch("/api/auth/credentials")).json().then(data => data.data)
-            const roomId = credentials.room_id || ""
-            const cookies = credentials.cookies || ""
-            document.getElementById("roomId").value = roomId
-            document.getElementById("cookies").value = cookies
-            // 检查更新
-            this.checkUpdate()
+            this.showLoggedIn(credentials)
         } else {
             // 未登录，显示登录页面
             this.showLoginPage()
         }
     }
 
+    showLoggedIn(credentials) {
+        // 已登录，显示主页面
+        this.showMainPage()
+        document.getElementById("liveToggle").classList.remove("hidden")
+        // 填充直播间号和 Cookies
+        document.getElementById("roomId").value = credentials.room_id || ""
+        document.getElementById("cookies").value = credentials.cookies || ""
+        this.subscribeLiveStatus()
+        // 检查更新
+        this.checkUpdate()
+    }
+
     showLoginPage() {
         document.getElementById("loginPage").classList.remove("hidden")
         document.getElementById("mainPage").classList.add("hidden")
@@ -247,8 +325,19 @@ class BiliLiveUtility {
     }
 
     async startQRPolling(qrKey) {
-        if (this.qrTimer) {
-            clearInterval(this.qrTimer)
+        this.stopQRPolling()
+
+        // 优先使用服务端推送，由后端统一轮询登录状态
+        if (window.EventSource) {
+            this.qrStream = new EventSource(withToken(`/api/auth/stream?qrcode_key=${encodeURIComponent(qrKey)}`))
+            this.qrStream.onmessage = (event) => {
+                const status = JSON.parse(event.data)
+                if (status.code === 0 || status.code === 86038) {
+                    this.stopQRPolling()
+                }
+                this.handleQRStatus({ data: status, message: status.message })
+            }
+            return
         }
 
         this.qrTimer = setInterval(async () => {
@@ -265,6 +354,17 @@ class BiliLiveUtility {
         }, 2000)
     }
 
+    stopQRPolling() {
+        if (this.qrStream) {
+            this.qrStream.close()
+            this.qrStream = null
+        }
+        if (this.qrTimer) {
+            clearInterval(this.qrTimer)
+            this.qrTimer = null
+        }
+    }
+
     handleQRStatus(data) {
         const statusElement = document.getElementById("qrStatus")
 
@@ -284,7 +384,7 @@ class BiliLiveUtility {
     }
 
     handleLoginSuccess(data) {
-        clearInterval(this.qrTimer)
+        this.stopQRPolling()
         clearInterval(this.countdownTimer)
 
         this.showStatus("登录成功！正在跳转...", "success")
@@ -294,30 +394,35 @@ class BiliLiveUtility {
             document.getElementById("cookies").value = data.data.cookies
             document.getElementById("roomId").value = data.data.room_id
             document.getElementById("liveToggle").classList.remove("hidden")
+            this.subscribeLiveStatus()
         }, 1500)
     }
 
     async loadAreas() {
         try {
             const areas = await (await fetch("/api/room/areas")).json().then(data => data.data)
-            // 拆解 areas 数据
-            // data 里面是每个父分区，父分区下的 list 是子分区
-            // 获取父分区的 id 和 name 并组合为 {name}(id) 的格式
-            // 再获取每个父分区下的子分区的 id 和 name 并组合为 {name}(id) 的格式
-            this.areas = areas.map(area => ({
-                id: area.id,
-                name: area.name,
-                list: area.list.map(subArea => ({
-                    id: subArea.id,
-                    name: subArea.name
-                }))
-            }))
-            this.populateParentAreas()
+            this.setAreas(areas)
         } catch (error) {
             console.error("加载分区失败:", error)
         }
     }
 
+    setAreas(areas) {
+        // 拆解 areas 数据
+        // data 里面是每个父分区，父分区下的 list 是子分区
+        // 获取父分区的 id 和 name 并组合为 {name}(id) 的格式
+        // 再获取每个父分区下的子分区的 id 和 name 并组合为 {name}(id) 的格式
+        this.areas = areas.map(area => ({
+            id: area.id,
+            name: area.name,
+            list: area.list.map(subArea => ({
+                id: subArea.id,
+                name: subArea.name
+            }))
+        }))
+        this.populateParentAreas()
+    }
+
     populateParentAreas() {
         // 填充父分区下拉框
         const areas = this.areas.filter(area => area.list && area.list.length > 0)
@@ -415,7 +520,9 @@ class BiliLiveUtility {
                 body: JSON.stringify({ title }),
             })
 
-            if (response.ok) {
+            const data = await response.json()
+
+            if (response.ok && data.success) {
                 this.showStatus("更新直播间标题成功！", "success")
                 this.showToast("直播间标题已保存", "success")
                 this.prevTitle = title
@@ -462,7 +569,9 @@ class BiliLiveUtility {
                 body: JSON.stringify({ tags }),
             })
 
-            if (response.ok) {
+            const data = await response.json()
+
+            if (response.ok && data.success) {
                 this.showStatus("更新直播间标签成功！", "success")
                 this.showToast("直播间标签已保存", "success")
                 this.prevTags = tags
@@ -507,7 +616,9 @@ class BiliLiveUtility {
                 }),
             })
 
-            if (response.ok) {
+            const data = await response.json()
+
+            if (response.ok && data.success) {
                 this.showStatus("更新直播间分区成功！", "success")
                 this.showToast("直播间分区已保存", "success")
             } else {
@@ -584,11 +695,30 @@ class BiliLiveUtility {
         }
     }
 
-    handleLiveStart(data) {
-        this.isLive = true
+    subscribeLiveStatus() {
+        // 由后端推送开播状态变化，多个窗口共享同一个上游轮询
+        if (!window.EventSource || this.liveStream) return
+        this.liveStream = new EventSource(withToken("/api/live/events"))
+        this.liveStream.onmessage = (event) => {
+            const status = JSON.parse(event.data)
+            this.setLiveButton(status.is_live)
+        }
+    }
+
+    setLiveButton(isLive) {
+        this.isLive = isLive
         const button = document.getElementById("liveToggle")
-        button.innerHTML = '<i class="fas fa-stop"></i> 停播'
-        button.classList.add("stop")
+        if (isLive) {
+            button.innerHTML = '<i class="fas fa-stop"></i> 停播'
+            button.classList.add("stop")
+        } else {
+            button.innerHTML = '<i class="fas fa-play"></i> 开播'
+            button.classList.remove("stop")
+        }
+    }
+
+    handleLiveStart(data) {
+        this.setLiveButton(true)
 
         document.getElementById("streamAddr").value = data.data.rtmp.addr
         document.getElementById("streamCode").value = data.data.rtmp.code
@@ -597,10 +727,7 @@ class BiliLiveUtility {
     }
 
     handleLiveStop() {
-        this.isLive = false
-        const button = document.getElementById("liveToggle")
-        button.innerHTML = '<i class="fas fa-play"></i> 开播'
-        button.classList.remove("stop")
+        this.setLiveButton(false)
 
         this.showStatus("停播成功！", "success")
     }
@@ -751,9 +878,10 @@ class BiliLiveUtility {
     }
 
     cleanup() {
-        if (this.qrTimer) {
-            clearInterval(this.qrTimer)
-            this.qrTimer = null
+        this.stopQRPolling()
+        if (this.liveStream) {
+            this.liveStream.close()
+            this.liveStream = null
         }
         if (this.countdownTimer) {
             clearInterval(this.countdownTimer)
@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# 在导入 bililive_utility 之前把缓存与数据目录指向临时目录，避免读写真实数据
+os.environ.setdefault("BILILIVE_HOME", tempfile.mkdtemp(prefix="bililive-test-"))
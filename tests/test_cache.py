@@ -0,0 +1,142 @@
+import asyncio
+import time
+
+import pytest
+
+from bililive_utility.bilibili.cache import SWRCache
+
+
+class Loader:
+    def __init__(self, *values):
+        self.values = list(values)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        value = self.values.pop(0)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+def age(cache: SWRCache, seconds: float):
+    cache.entry.fetched_at = time.time() - seconds
+
+
+def test_miss_then_hit():
+    async def main():
+        cache = SWRCache(ttl=10, max_stale=60)
+        loader = Loader(1, 2)
+        assert (await cache.get(loader)).value == 1
+        assert (await cache.get(loader)).value == 1
+        assert loader.calls == 1
+
+    asyncio.run(main())
+
+
+def test_stale_returns_old_value_and_refreshes_in_background():
+    async def main():
+        cache = SWRCache(ttl=10, max_stale=60)
+        loader = Loader(1, 2)
+        await cache.get(loader)
+        age(cache, 20)
+        assert (await cache.get(loader)).value == 1
+        await asyncio.sleep(0)
+        assert cache.entry.value == 2
+
+    asyncio.run(main())
+
+
+def test_max_age_waits_for_fresh_value():
+    async def main():
+        cache = SWRCache(ttl=10, max_stale=60)
+        loader = Loader(1, 2)
+        await cache.get(loader)
+        age(cache, 5)
+        assert (await cache.get(loader, max_age=1)).value == 2
+
+    asyncio.run(main())
+
+
+def test_failed_refresh_falls_back_to_old_value():
+    async def main():
+        cache = SWRCache(ttl=10, max_stale=60)
+        loader = Loader(1, RuntimeError("boom"))
+        await cache.get(loader)
+        age(cache, 120)
+        assert (await cache.get(loader)).value == 1
+
+    asyncio.run(main())
+
+
+def test_failed_refresh_without_value_raises():
+    async def main():
+        cache = SWRCache(ttl=10, max_stale=60)
+        with pytest.raises(RuntimeError):
+            await cache.get(Loader(RuntimeError("boom")))
+
+    asyncio.run(main())
+
+
+def test_concurrent_misses_share_one_refresh():
+    async def main():
+        cache = SWRCache(ttl=10, max_stale=60)
+        loader = Loader(1, 2)
+        results = await asyncio.gather(*(cache.get(loader) for _ in range(5)))
+        assert [r.value for r in results] == [1] * 5
+        assert loader.calls == 1
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("write", ["set", "invalidate"])
+def test_refresh_started_before_write_is_not_stored(write):
+    async def main():
+        cache = SWRCache(ttl=10, max_stale=60)
+        release = asyncio.Event()
+
+        async def slow_loader():
+            await release.wait()
+            return "old"
+
+        waiter = asyncio.create_task(cache.get(slow_loader))
+        await asyncio.sleep(0)
+        if write == "set":
+            cache.set("new")
+        else:
+            cache.invalidate()
+        release.set()
+        assert (await waiter).value == "old"
+        if write == "set":
+            assert cache.entry.value == "new"
+        else:
+            assert cache.entry is None
+
+    asyncio.run(main())
+
+
+def test_get_nowait_returns_current_entry_and_refreshes():
+    async def main():
+        cache = SWRCache(ttl=10, max_stale=60)
+        loader = Loader(1)
+        assert cache.get_nowait(loader) is None
+        await asyncio.sleep(0)
+        assert cache.get_nowait(loader).value == 1
+        assert loader.calls == 1
+
+    asyncio.run(main())
+
+
+def test_persists_to_disk(tmp_path):
+    async def main():
+        path = tmp_path / "cache.json"
+        cache = SWRCache(ttl=10, max_stale=60, path=path, decode=tuple)
+        cache.set([1, 2])
+        restored = SWRCache(ttl=10, max_stale=60, path=path, decode=tuple)
+        loader = Loader()
+        assert (await restored.get(loader)).value == (1, 2)
+        assert loader.calls == 0
+        restored.invalidate()
+        assert not path.exists()
+
+    asyncio.run(main())
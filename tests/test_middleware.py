@@ -0,0 +1,69 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from bililive_utility.api.middleware import BearerTokenMiddleware
+
+TOKEN = "s3cret"
+
+
+async def ok(request):
+    return PlainTextResponse("ok")
+
+
+async def echo(websocket):
+    await websocket.accept()
+    await websocket.send_text("ok")
+    await websocket.close()
+
+
+@pytest.fixture
+def client():
+    app = Starlette(routes=[Route("/", ok), Route("/script.js", ok), Route("/api/status", ok), WebSocketRoute("/ws", echo)])
+    app.add_middleware(BearerTokenMiddleware, token=TOKEN, exempt_paths={"/", "/script.js"})
+    return TestClient(app)
+
+
+def test_exempt_paths_are_public(client):
+    assert client.get("/").status_code == 200
+    assert client.get("/script.js").status_code == 200
+
+
+def test_exempt_paths_match_exactly(client):
+    assert client.get("/script.js/extra").status_code == 401
+    assert client.get("/api/status").status_code == 401
+
+
+def test_missing_or_wrong_token(client):
+    response = client.get("/api/status")
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+    assert client.get("/api/status", headers={"Authorization": "Bearer nope"}).status_code == 401
+    assert client.get("/api/status", headers={"Authorization": f"Basic {TOKEN}"}).status_code == 401
+
+
+def test_bearer_header(client):
+    assert client.get("/api/status", headers={"Authorization": f"Bearer {TOKEN}"}).status_code == 200
+    assert client.get("/api/status", headers={"Authorization": f"bearer {TOKEN}"}).status_code == 200
+
+
+def test_query_token(client):
+    assert client.get("/api/status", params={"token": TOKEN}).status_code == 200
+    assert client.get("/api/status", params={"token": "nope"}).status_code == 401
+
+
+def test_non_ascii_header_is_rejected(client):
+    headers = {"Authorization": "Bearer 令牌".encode("utf-8")}
+    assert client.get("/api/status", headers=headers).status_code == 401
+
+
+def test_websocket(client):
+    with client.websocket_connect(f"/ws?token={TOKEN}") as ws:
+        assert ws.receive_text() == "ok"
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect("/ws") as ws:
+            ws.receive_text()
+    assert exc.value.code == 1008
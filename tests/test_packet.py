@@ -0,0 +1,92 @@
+import zlib
+
+import pytest
+
+from bililive_utility.bilibili import packet
+from bililive_utility.bilibili.packet import (
+    HEADER,
+    OP_AUTH_REPLY,
+    OP_HEARTBEAT_REPLY,
+    OP_MESSAGE,
+    PROTO_BROTLI,
+    PROTO_JSON,
+    PROTO_ZLIB,
+    ProtocolError,
+    encode_packet,
+    iter_packets,
+)
+
+
+def test_round_trip_multiple_packets():
+    data = encode_packet(OP_AUTH_REPLY, b'{"code":0}') + encode_packet(OP_HEARTBEAT_REPLY, b"\x00\x00\x00\x2a")
+    packets = list(iter_packets(data))
+    assert [(p.op, p.body) for p in packets] == [(OP_AUTH_REPLY, b'{"code":0}'), (OP_HEARTBEAT_REPLY, b"\x00\x00\x00\x2a")]
+
+
+def test_header_layout():
+    data = encode_packet(OP_MESSAGE, b"abc", protover=PROTO_JSON, seq=7)
+    assert HEADER.unpack_from(data) == (HEADER.size + 3, HEADER.size, PROTO_JSON, OP_MESSAGE, 7)
+
+
+def test_zlib_batch_is_expanded():
+    inner = b"".join(encode_packet(OP_MESSAGE, f'{{"n":{i}}}'.encode(), protover=PROTO_JSON) for i in range(3))
+    data = encode_packet(OP_MESSAGE, zlib.compress(inner), protover=PROTO_ZLIB)
+    assert [p.body for p in iter_packets(data)] == [b'{"n":0}', b'{"n":1}', b'{"n":2}']
+
+
+def test_brotli_batch_is_expanded():
+    brotli = pytest.importorskip("brotli")
+    inner = encode_packet(OP_MESSAGE, b"{}", protover=PROTO_JSON)
+    data = encode_packet(OP_MESSAGE, brotli.compress(inner), protover=PROTO_BROTLI)
+    assert [p.body for p in iter_packets(data)] == [b"{}"]
+
+
+def test_nested_compression_is_rejected():
+    inner = encode_packet(OP_MESSAGE, zlib.compress(encode_packet(OP_MESSAGE, b"{}")), protover=PROTO_ZLIB)
+    data = encode_packet(OP_MESSAGE, zlib.compress(inner), protover=PROTO_ZLIB)
+    with pytest.raises(ProtocolError):
+        list(iter_packets(data))
+
+
+def test_truncated_header():
+    with pytest.raises(ProtocolError):
+        list(iter_packets(encode_packet(OP_MESSAGE, b"{}")[: HEADER.size - 1]))
+
+
+@pytest.mark.parametrize(
+    "length, header_len",
+    [
+        (HEADER.size + 10, HEADER.size),  # 包长超出数据
+        (HEADER.size - 1, HEADER.size),  # 包长小于头长
+        (HEADER.size + 2, HEADER.size - 1),  # 头长小于固定包头
+    ],
+)
+def test_invalid_lengths(length, header_len):
+    data = HEADER.pack(length, header_len, PROTO_JSON, OP_MESSAGE, 1) + b"{}"
+    with pytest.raises(ProtocolError):
+        list(iter_packets(data))
+
+
+def test_decompression_limit(monkeypatch):
+    monkeypatch.setattr(packet, "MAX_DECOMPRESSED_SIZE", 1024)
+    inner = encode_packet(OP_MESSAGE, b"x" * 4096, protover=PROTO_JSON)
+    data = encode_packet(OP_MESSAGE, zlib.compress(inner), protover=PROTO_ZLIB)
+    with pytest.raises(ProtocolError):
+        list(iter_packets(data))
+
+
+def test_brotli_decompression_limit(monkeypatch):
+    brotli = pytest.importorskip("brotli")
+    monkeypatch.setattr(packet, "MAX_DECOMPRESSED_SIZE", 1024)
+    inner = encode_packet(OP_MESSAGE, b"x" * (1 << 20), protover=PROTO_JSON)
+    data = encode_packet(OP_MESSAGE, brotli.compress(inner), protover=PROTO_BROTLI)
+    with pytest.raises(ProtocolError):
+        list(iter_packets(data))
+
+
+def test_brotli_output_at_limit_is_accepted(monkeypatch):
+    brotli = pytest.importorskip("brotli")
+    inner = encode_packet(OP_MESSAGE, b"x" * 1000, protover=PROTO_JSON)
+    monkeypatch.setattr(packet, "MAX_DECOMPRESSED_SIZE", len(inner))
+    data = encode_packet(OP_MESSAGE, brotli.compress(inner), protover=PROTO_BROTLI)
+    assert [p.body for p in iter_packets(data)] == [b"x" * 1000]
@@ -0,0 +1,75 @@
+import pytest
+
+from bililive_utility.bilibili import resilience
+from bililive_utility.bilibili.resilience import CircuitBreaker, CircuitOpenError, ResilienceConfig
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_breaker(threshold=3, recovery=30.0):
+    return CircuitBreaker("example.com", ResilienceConfig(failure_threshold=threshold, recovery_timeout=recovery))
+
+
+def test_opens_after_threshold(clock):
+    breaker = make_breaker()
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats() == {"state": "open", "failures": 3, "trips": 1, "rejected": 1}
+
+
+def test_success_resets_failures(clock):
+    breaker = make_breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.failures == 1
+
+
+def test_half_open_allows_single_trial(clock):
+    breaker = make_breaker(threshold=1)
+    breaker.record_failure()
+    clock[0] += 31
+    breaker.before_call()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_failed_trial_reopens(clock):
+    breaker = make_breaker(threshold=3)
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 31
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.trips == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_release_frees_trial(clock):
+    breaker = make_breaker(threshold=1)
+    breaker.record_failure()
+    clock[0] += 31
+    breaker.before_call()
+    breaker.release()
+    breaker.before_call()
+    assert breaker.state == "half_open"
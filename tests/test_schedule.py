@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import pytest
+
+from bililive_utility.bilibili import schedule
+from bililive_utility.bilibili.schedule import (
+    ACTION_START,
+    ACTION_STOP,
+    START_GRACE,
+    STOP_GRACE,
+    LiveScheduler,
+    ScheduleEntry,
+)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(LiveScheduler, "save", lambda self, entry: None)
+    monkeypatch.setattr(schedule.store, "delete", lambda namespace, key: None)
+    return LiveScheduler()
+
+
+def live_items(scheduler, entry_id):
+    return [item for item in scheduler._heap if item[2] == entry_id and not scheduler._is_stale(item)]
+
+
+def test_repush_leaves_one_live_item_per_kind(scheduler):
+    entry = scheduler.add(ScheduleEntry("a", "acc", ACTION_START, time.time() + 600))
+    scheduler._push(entry)
+    entry.run_at += 60
+    scheduler._push(entry)
+    assert sorted(item[5] for item in live_items(scheduler, "a")) == ["prewarm", "run"]
+
+
+def test_set_enabled_without_change_is_noop(scheduler):
+    scheduler.add(ScheduleEntry("a", "acc", ACTION_START, time.time() + 600))
+    heap = list(scheduler._heap)
+    scheduler.set_enabled("a", True)
+    assert scheduler._heap == heap
+
+
+def test_disabled_and_removed_entries_are_stale(scheduler):
+    scheduler.add(ScheduleEntry("a", "acc", ACTION_START, time.time() + 600))
+    scheduler.add(ScheduleEntry("b", "acc", ACTION_STOP, time.time() + 600))
+    scheduler.set_enabled("a", False)
+    scheduler.remove("b")
+    assert all(scheduler._is_stale(item) for item in scheduler._heap)
+
+
+@pytest.mark.parametrize(
+    "action, missed_by, runs",
+    [
+        (ACTION_START, START_GRACE - 60, True),
+        (ACTION_START, START_GRACE + 60, False),
+        (ACTION_STOP, STOP_GRACE - 60, True),
+        (ACTION_STOP, STOP_GRACE + 60, False),
+    ],
+)
+def test_catch_up_grace(scheduler, action, missed_by, runs):
+    now = time.time()
+    entry = ScheduleEntry("a", "acc", action, now - missed_by)
+    scheduler.entries["a"] = entry
+    scheduler._catch_up(now)
+    assert entry.enabled is runs
+    assert (entry.last_result is None) is runs
+
+
+def test_catch_up_skips_to_next_repeat(scheduler):
+    now = time.time()
+    entry = ScheduleEntry("a", "acc", ACTION_START, now - START_GRACE - 60, repeat="daily")
+    scheduler.entries["a"] = entry
+    scheduler._catch_up(now)
+    assert entry.enabled
+    assert now < entry.run_at <= now + 86400
+
+
+def test_due_entry_runs_once(scheduler, monkeypatch):
+    calls = []
+
+    async def prewarm(entry, run_at):
+        pass
+
+    async def execute(entry, run_at):
+        calls.append(run_at)
+        scheduler._running.pop(entry.id, None)
+
+    monkeypatch.setattr(scheduler, "_prewarm", prewarm)
+    monkeypatch.setattr(scheduler, "_execute", execute)
+
+    async def main():
+        entry = scheduler.add(ScheduleEntry("a", "acc", ACTION_START, time.time() - 1))
+        scheduler._push(entry)
+        scheduler._push(entry)
+        task = asyncio.create_task(scheduler._run())
+        for _ in range(10):
+            await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(main())
+    assert len(calls) == 1
+
+
+def test_stop_cancels_running_entries(scheduler):
+    async def main():
+        started = asyncio.Event()
+
+        async def execute():
+            started.set()
+            await asyncio.sleep(3600)
+
+        task = asyncio.create_task(execute())
+        scheduler._running["a"] = task
+        await started.wait()
+        await scheduler.stop()
+        assert task.cancelled()
+        assert not scheduler._running
+
+    asyncio.run(main())